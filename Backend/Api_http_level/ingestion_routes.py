@@ -1,26 +1,67 @@
-from flask import Blueprint, request, jsonify, g
+import os
+
+from flask import Blueprint, request, jsonify, g, current_app
 from Services.ingestion_service import IngestionService
+from Services.upload_session_service import UploadSessionService
+from Services.ingestion_job_service import IngestionJobService
+from Services.mapping_profile_service import MappingProfileService
+from Ingestion.file_parsers import is_archive, is_columnar
+from Ingestion.upload_sessions import MAX_CHUNK_BYTES, MIN_CHUNK_BYTES, UploadSessionError
+from Ingestion.validators import DEFAULT_ERROR_BUDGET
 from middleware.auth_middleware import jwt_required
+from middleware.admission_control import (
+    admission_controlled,
+    current_admission_ticket,
+    detach_admission_ticket,
+    get_admission_controller,
+)
 from app.extionsions import db
 
 
 ingestion_bp = Blueprint("ingestion", __name__, url_prefix="/ingestion")
 
 
+def _flag(name):
+    return request.values.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _error_budget():
+    """
+    max_errors request value, else the configured budget; negative = no limit.
+    """
+    value = request.values.get("max_errors")
+
+    if value in (None, ""):
+        return current_app.config.get("INGEST_ERROR_BUDGET", DEFAULT_ERROR_BUDGET)
+
+    budget = int(value)
+    return None if budget < 0 else budget
+
+
+def _job_service():
+    return IngestionJobService(
+        db,
+        spool_dir=current_app.config.get("UPLOAD_SPOOL_DIR"),
+        max_workers=current_app.config.get("INGEST_JOB_WORKERS", 4)
+    )
+
+
 # -----------------------------
-# UPLOAD DATASET (CSV / JSON)
+# UPLOAD DATASET (CSV / JSON / PARQUET / ARROW / FITS / ARCHIVE)
 # -----------------------------
 @ingestion_bp.route("/upload", methods=["POST"])
 @jwt_required
+@admission_controlled()
 def upload_dataset():
 
-    if "file" not in request.files:
+    if "file" not in request.files and "files" not in request.files:
         return jsonify({
             "status": "error",
             "message": "No file provided"
         }), 400
 
-    file = request.files["file"]
+    uploads = request.files.getlist("file") + request.files.getlist("files")
+    file = uploads[0]
     source_id = request.form.get("source_id")
 
     # user extracted from JWT middleware
@@ -32,14 +73,79 @@ def upload_dataset():
             "message": "source_id is required"
         }), 400
 
+    try:
+        source_id = int(source_id)
+    except ValueError:
+        return jsonify({
+            "status": "error",
+            "message": "source_id must be an integer"
+        }), 400
+
     if file.filename == "":
         return jsonify({
             "status": "error",
             "message": "File name missing"
         }), 400
 
+    # Async mode: spool the files, queue a job and return its id right away
+    if _flag("async"):
+        try:
+            result = _job_service().submit_upload(
+                app=current_app._get_current_object(),
+                files=[(upload.filename, upload.stream) for upload in uploads if upload.filename],
+                user_id=user_id,
+                source_id=source_id,
+                merge=_flag("merge"),
+                batch_size=current_app.config.get("INGEST_BATCH_SIZE", 5000),
+                parse_workers=current_app.config.get("INGEST_PARSE_WORKERS"),
+                max_errors=_error_budget(),
+                admission=current_admission_ticket()
+            )
+
+            # The job now holds the admission slot until it finishes
+            detach_admission_ticket()
+            return jsonify(result), 202
+
+        except Exception as e:
+            return jsonify({
+                "status": "error",
+                "message": str(e)
+            }), 500
+
+    # Multi-file posts and archives: members are parsed in a process pool
+    if len(uploads) > 1 or is_archive(file.filename):
+        service = IngestionService(db)
+
+        result = service.ingest_multi_file_upload(
+            files=[(upload.filename, upload.stream) for upload in uploads if upload.filename],
+            user_id=user_id,
+            source_id=source_id,
+            merge=_flag("merge"),
+            max_workers=current_app.config.get("INGEST_PARSE_WORKERS")
+        )
+
+        return jsonify(result), 200
+
+    # Streaming mode: parse the upload incrementally and store it in chunks.
+    # Binary columnar formats (Parquet / Arrow / FITS) always take this path.
+    stream_mode = _flag("stream") or is_columnar(file.filename)
+
     try:
 
+        if stream_mode:
+            service = IngestionService(db)
+
+            result = service.ingest_user_upload_stream(
+                stream=file.stream,
+                filename=file.filename,
+                user_id=user_id,
+                source_id=source_id,
+                batch_size=current_app.config.get("INGEST_BATCH_SIZE", 5000),
+                max_errors=_error_budget()
+            )
+
+            return jsonify(result), 200
+
         file_content = file.read().decode("utf-8")
 
         # Detect file type
@@ -55,11 +161,174 @@ def upload_dataset():
             file_type=file_type,
             filename=file.filename,
             user_id=user_id,
-            source_id=int(source_id)
+            source_id=source_id
+        )
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+# -----------------------------
+# VALIDATE UPLOAD (NOTHING IS STORED)
+# -----------------------------
+@ingestion_bp.route("/validate", methods=["POST"])
+@jwt_required
+@admission_controlled()
+def validate_upload():
+
+    file = request.files.get("file")
+
+    if file is None or file.filename == "":
+        return jsonify({
+            "status": "error",
+            "message": "No file provided"
+        }), 400
+
+    try:
+        service = IngestionService(db)
+
+        result = service.validate_upload_stream(
+            stream=file.stream,
+            filename=file.filename,
+            max_errors=_error_budget()
+        )
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+# -----------------------------
+# RESUMABLE (CHUNKED) UPLOADS
+# -----------------------------
+def _upload_session_service():
+    return UploadSessionService(
+        db,
+        spool_dir=current_app.config.get("UPLOAD_SPOOL_DIR"),
+        session_ttl_seconds=current_app.config.get("UPLOAD_SESSION_TTL_HOURS", 24) * 3600,
+        max_chunk_bytes=current_app.config.get("UPLOAD_MAX_CHUNK_BYTES", MAX_CHUNK_BYTES),
+        min_chunk_bytes=current_app.config.get("UPLOAD_MIN_CHUNK_BYTES", MIN_CHUNK_BYTES)
+    )
+
+
+def _upload_session_error(e):
+    return jsonify({
+        "status": "error",
+        "message": str(e)
+    }), e.status_code
+
+
+@ingestion_bp.route("/uploads", methods=["POST"])
+@jwt_required
+def create_upload_session():
+
+    data = request.get_json()
+
+    if not data:
+        return jsonify({
+            "status": "error",
+            "message": "JSON body required"
+        }), 400
+
+    filename = data.get("filename")
+    source_id = data.get("source_id")
+    total_size = data.get("total_size")
+
+    if not filename or not source_id:
+        return jsonify({
+            "status": "error",
+            "message": "filename and source_id are required"
+        }), 400
+
+    try:
+        result = _upload_session_service().create(
+            user_id=g.user_id,
+            filename=filename,
+            source_id=int(source_id),
+            total_size=int(total_size) if total_size is not None else None
         )
+        return jsonify(result), 201
+
+    except UploadSessionError as e:
+        return _upload_session_error(e)
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 400
+
 
+@ingestion_bp.route("/uploads/<upload_id>/chunks/<int:chunk_no>", methods=["PUT"])
+@jwt_required
+@admission_controlled(counted=False)
+def put_upload_chunk(upload_id, chunk_no):
+    try:
+        # request.stream is read block by block; the chunk is never buffered whole
+        result = _upload_session_service().put_chunk(
+            upload_id=upload_id,
+            user_id=g.user_id,
+            chunk_no=chunk_no,
+            stream=request.stream,
+            checksum=request.headers.get("X-Chunk-SHA256")
+        )
         return jsonify(result), 200
 
+    except UploadSessionError as e:
+        return _upload_session_error(e)
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@ingestion_bp.route("/uploads/<upload_id>", methods=["GET"])
+@jwt_required
+def get_upload_session(upload_id):
+    try:
+        return jsonify(_upload_session_service().status(upload_id, g.user_id)), 200
+
+    except UploadSessionError as e:
+        return _upload_session_error(e)
+
+
+@ingestion_bp.route("/uploads/<upload_id>", methods=["DELETE"])
+@jwt_required
+def abort_upload_session(upload_id):
+    try:
+        return jsonify(_upload_session_service().abort(upload_id, g.user_id)), 200
+
+    except UploadSessionError as e:
+        return _upload_session_error(e)
+
+
+@ingestion_bp.route("/uploads/<upload_id>/finalize", methods=["POST"])
+@jwt_required
+@admission_controlled()
+def finalize_upload_session(upload_id):
+    try:
+        result = _upload_session_service().finalize(
+            upload_id=upload_id,
+            user_id=g.user_id,
+            batch_size=current_app.config.get("INGEST_BATCH_SIZE", 5000),
+            max_errors=_error_budget()
+        )
+        return jsonify(result), 200
+
+    except UploadSessionError as e:
+        return _upload_session_error(e)
+
     except Exception as e:
         return jsonify({
             "status": "error",
@@ -67,16 +336,71 @@ def upload_dataset():
         }), 500
 
 
+# -----------------------------
+# UPLOAD DEDUPLICATION STATS
+# -----------------------------
+@ingestion_bp.route("/dedup/stats", methods=["GET"])
+@jwt_required
+def dedup_stats():
+    service = IngestionService(db)
+    result = service.get_dedup_stats()
+
+    if result.get("status") != "success":
+        return jsonify({
+            "status": "error",
+            "message": result.get("error")
+        }), 500
+
+    return jsonify(result), 200
+
+
 # -----------------------------
 # NORMALIZE DATASET (UPDATED)
 # -----------------------------
 @ingestion_bp.route("/normalize/<dataset_id>", methods=["POST"])
 @jwt_required
 def normalize_dataset(dataset_id):
+    """
+    Optional JSON body: {"workers": n, "chunk_size": rows}; workers=1 runs serially.
+
+    workers defaults to NORMALIZE_WORKERS (serial when unset) and may not
+    exceed it, or the CPU count when it is unset.
+    """
+    options = request.get_json(silent=True) or {}
+    configured_workers = current_app.config.get("NORMALIZE_WORKERS")
+    worker_limit = configured_workers or os.cpu_count() or 1
+
+    try:
+        max_workers = int(options.get("workers") or configured_workers or 1)
+        chunk_size = int(options.get("chunk_size") or current_app.config.get("NORMALIZE_CHUNK_SIZE", 20000))
+    except (TypeError, ValueError):
+        return jsonify({
+            "status": "error",
+            "message": "workers and chunk_size must be integers"
+        }), 400
+
+    if max_workers < 1 or chunk_size < 1:
+        return jsonify({
+            "status": "error",
+            "message": "workers and chunk_size must be positive"
+        }), 400
+
+    if max_workers > worker_limit:
+        return jsonify({
+            "status": "error",
+            "message": f"workers may not exceed {worker_limit}"
+        }), 400
+
     try:
         service = IngestionService(db)
         # Pass user_id to the service method
-        result = service.normalize_dataset(dataset_id, user_id=g.user_id)
+        result = service.normalize_dataset(
+            dataset_id,
+            user_id=g.user_id,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            parallel_min_rows=current_app.config.get("NORMALIZE_PARALLEL_MIN_ROWS", 0),
+        )
         return jsonify(result), 200
 
     except Exception as e:
@@ -86,11 +410,126 @@ def normalize_dataset(dataset_id):
         }), 500
 
 
+@ingestion_bp.route("/normalize/<dataset_id>/profile", methods=["GET"])
+@jwt_required
+def normalization_profile(dataset_id):
+    """
+    Per-stage wall time, rows per second and dropped rows by reason of the
+    dataset's normalization runs, latest first.
+    """
+    try:
+        profile = IngestionService(db).get_normalization_profile(dataset_id)
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+    if profile is None:
+        return jsonify({
+            "status": "error",
+            "message": "Dataset has not been normalized"
+        }), 404
+
+    return jsonify(dict(profile, status="success")), 200
+
+
+# -----------------------------
+# SCHEMA MAPPING PROFILES
+# -----------------------------
+def _mapping_profile_error(e):
+    if isinstance(e, PermissionError):
+        code = 403
+    elif isinstance(e, LookupError):
+        code = 404
+    else:
+        code = 400
+
+    return jsonify({
+        "status": "error",
+        "message": str(e)
+    }), code
+
+
+@ingestion_bp.route("/mapping-profiles/<int:source_id>", methods=["GET"])
+@jwt_required
+def get_mapping_profiles(source_id):
+    """
+    Source-wide and own profile of a source, plus the effective field map.
+    """
+    try:
+        return jsonify(MappingProfileService(db).get_profiles(source_id, g.user_id)), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@ingestion_bp.route("/mapping-profiles/<int:source_id>", methods=["PUT"])
+@jwt_required
+def save_mapping_profile(source_id):
+    """
+    Body: {"field_map": {raw field: canonical field}, "scope": "user" | "source"}
+    """
+    data = request.get_json(silent=True)
+
+    if not data:
+        return jsonify({
+            "status": "error",
+            "message": "JSON body required"
+        }), 400
+
+    try:
+        result = MappingProfileService(db).save_profile(
+            source_id,
+            data.get("field_map"),
+            user_id=g.user_id,
+            scope=data.get("scope", "user"),
+            is_admin=g.get("user_role") == "admin"
+        )
+        return jsonify(result), 200
+
+    except (ValueError, PermissionError) as e:
+        return _mapping_profile_error(e)
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+@ingestion_bp.route("/mapping-profiles/<int:source_id>", methods=["DELETE"])
+@jwt_required
+def delete_mapping_profile(source_id):
+    try:
+        result = MappingProfileService(db).delete_profile(
+            source_id,
+            user_id=g.user_id,
+            scope=request.args.get("scope", "user"),
+            is_admin=g.get("user_role") == "admin"
+        )
+        return jsonify(result), 200
+
+    except (ValueError, PermissionError, LookupError) as e:
+        return _mapping_profile_error(e)
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
 # -----------------------------
 # INGEST FROM EXTERNAL API
 # -----------------------------
 @ingestion_bp.route("/ingest/api", methods=["POST"])
 @jwt_required
+@admission_controlled()
 def ingest_api():
 
     data = request.get_json()
@@ -114,6 +553,18 @@ def ingest_api():
 
     try:
 
+        # Async mode: the fetch runs in the job pool, not the request thread
+        if data.get("async") or _flag("async"):
+            result = _job_service().submit_api_ingest(
+                app=current_app._get_current_object(),
+                source_id=int(source_id),
+                query=query,
+                user_id=user_id,
+                admission=current_admission_ticket()
+            )
+            detach_admission_ticket()
+            return jsonify(result), 202
+
         service = IngestionService(db)
 
         result = service.ingest_from_api(
@@ -131,6 +582,117 @@ def ingest_api():
         }), 500
 
 
+# -----------------------------
+# INCREMENTAL API REFRESH
+# -----------------------------
+@ingestion_bp.route("/ingest/api/refresh", methods=["POST"])
+@jwt_required
+@admission_controlled()
+def refresh_api():
+
+    data = request.get_json()
+
+    if not data:
+        return jsonify({
+            "status": "error",
+            "message": "JSON body required"
+        }), 400
+
+    source_id = data.get("source_id")
+    query = data.get("query")
+
+    user_id = g.user_id
+
+    if not source_id or not query:
+        return jsonify({
+            "status": "error",
+            "message": "source_id and query are required"
+        }), 400
+
+    try:
+
+        if data.get("async") or _flag("async"):
+            result = _job_service().submit_api_ingest(
+                app=current_app._get_current_object(),
+                source_id=int(source_id),
+                query=query,
+                user_id=user_id,
+                refresh=True,
+                admission=current_admission_ticket()
+            )
+            detach_admission_ticket()
+            return jsonify(result), 202
+
+        service = IngestionService(db)
+
+        result = service.refresh_from_api(
+            source_id=int(source_id),
+            query=query,
+            user_id=user_id
+        )
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+# -----------------------------
+# ADMISSION CONTROL METRICS
+# -----------------------------
+@ingestion_bp.route("/admission/metrics", methods=["GET"])
+@jwt_required
+def admission_metrics():
+    """
+    Current ingest load and queue depth; admins see every user.
+    """
+    try:
+        controller = get_admission_controller()
+        user_id = None if g.get("user_role") == "admin" else g.user_id
+
+        return jsonify(dict(controller.snapshot(user_id), status="success")), 200
+
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+# -----------------------------
+# INGESTION JOBS
+# -----------------------------
+@ingestion_bp.route("/jobs/<job_id>", methods=["GET"])
+@jwt_required
+def get_ingestion_job(job_id):
+
+    job = _job_service().get_job(job_id, g.user_id)
+
+    if job is None:
+        return jsonify({
+            "status": "error",
+            "message": "Job not found"
+        }), 404
+
+    return jsonify({
+        "status": "success",
+        "job": job
+    }), 200
+
+
+@ingestion_bp.route("/jobs", methods=["GET"])
+@jwt_required
+def list_ingestion_jobs():
+
+    return jsonify({
+        "status": "success",
+        "jobs": _job_service().list_jobs(g.user_id)
+    }), 200
+
+
 # -----------------------------
 # AVAILABLE SOURCES
 # -----------------------------
@@ -0,0 +1,332 @@
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tarfile
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from repository.bulk_loader import BulkLoader
+from Ingestion.schema_inference import TypedRowStream
+from Ingestion.deduplication import UploadDeduplicator
+from Ingestion.file_parsers import ARCHIVE_SUFFIXES, detect_file_type, is_archive, parse_member, read_spool
+
+
+# Upper bound on bytes written to disk while expanding archives
+MAX_EXTRACTED_BYTES = 10 * 1024 ** 3
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ArchiveIngestor:
+    """
+    Handles multi-file uploads: several files in one form post and/or
+    .zip / .tar.gz archives of CSV / JSON / Parquet / Arrow / FITS files.
+
+    Responsibilities:
+    - Spool every member file to a private temp directory
+    - Skip members whose bytes were already ingested (content-hash dedupe)
+    - Parse + validate members in a process pool (one member per task,
+      at most max_workers in flight); workers spool parsed rows to disk
+    - Persist each member as its own raw dataset, or all as one merged dataset
+    - Report a per-file result
+    """
+
+    def __init__(self, db, max_workers: Optional[int] = None):
+        self.db = db
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    # -------------------------------------------------------
+    # Main entry point
+    # -------------------------------------------------------
+
+    def ingest_files(
+        self,
+        files: List[Tuple[str, BinaryIO]],
+        user_id: str,
+        source_id: int,
+        merge: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        files: (filename, binary stream) pairs as received from the form post.
+        """
+
+        workdir = tempfile.mkdtemp(prefix="nexus_upload_")
+
+        try:
+            members, report = self._spool_members(files, workdir)
+
+            if not members:
+                raise ValueError("No supported data files found in upload")
+
+            # A merged dataset is new content even when every member is known
+            if not merge:
+                members = self._skip_duplicates(members, report, user_id, source_id)
+
+            parsed = self._parse_members(members, workdir)
+
+            if merge:
+                report.extend(self._store_merged(parsed, user_id, source_id))
+            else:
+                report.extend(self._store_separately(parsed, user_id, source_id))
+
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        succeeded = [entry for entry in report if entry["status"] == "success"]
+
+        return {
+            "status": "success" if succeeded else "error",
+            "files": report,
+            "files_ingested": len(succeeded),
+            "files_failed": len(report) - len(succeeded),
+            "records": sum(entry.get("records", 0) for entry in succeeded),
+        }
+
+    # -------------------------------------------------------
+    # Spooling / extraction
+    # -------------------------------------------------------
+
+    def _spool_members(
+        self,
+        files: List[Tuple[str, BinaryIO]],
+        workdir: str,
+    ) -> Tuple[List[Tuple[str, str, str]], List[Dict[str, Any]]]:
+        """
+        Returns ([(display_name, path, file_type, sha256)], [error report entries]).
+        """
+
+        members: List[Tuple[str, str, str, str]] = []
+        report: List[Dict[str, Any]] = []
+        budget = [MAX_EXTRACTED_BYTES]
+
+        for filename, stream in files:
+            try:
+                if is_archive(filename):
+                    for member_name, member_stream in self._iter_archive(filename, stream):
+                        self._add_member(member_name, member_stream, workdir, members, report, budget)
+                else:
+                    self._add_member(filename, stream, workdir, members, report, budget)
+
+            except (zipfile.BadZipFile, tarfile.TarError) as e:
+                report.append({"file": filename, "status": "error", "error": f"Invalid archive: {str(e)}"})
+
+        return members, report
+
+    def _add_member(self, name, stream, workdir, members, report, budget) -> None:
+        try:
+            file_type = detect_file_type(name)
+        except ValueError as e:
+            report.append({"file": name, "status": "error", "error": str(e)})
+            return
+
+        if file_type in ARCHIVE_SUFFIXES.values():
+            report.append({"file": name, "status": "error", "error": "Nested archives are not supported"})
+            return
+
+        # Never trust member paths: store under an index-prefixed basename
+        path = os.path.join(workdir, f"{len(members):05d}_{os.path.basename(name)}")
+        digest = hashlib.sha256()
+
+        with open(path, "wb") as target:
+            while True:
+                block = stream.read(COPY_BUFFER_SIZE)
+                if not block:
+                    break
+
+                budget[0] -= len(block)
+                if budget[0] < 0:
+                    raise ValueError("Upload expands beyond the allowed size")
+
+                digest.update(block)
+                target.write(block)
+
+        members.append((name, path, file_type, digest.hexdigest()))
+
+    def _iter_archive(self, filename: str, stream: BinaryIO) -> Iterator[Tuple[str, BinaryIO]]:
+        if detect_file_type(filename) == "ZIP":
+            with zipfile.ZipFile(stream) as archive:
+                for info in archive.infolist():
+                    if info.is_dir() or self._is_hidden(info.filename):
+                        continue
+                    with archive.open(info) as member_stream:
+                        yield info.filename, member_stream
+            return
+
+        with tarfile.open(fileobj=stream, mode="r:*") as archive:
+            for member in archive:
+                if not member.isfile() or self._is_hidden(member.name):
+                    continue
+                member_stream = archive.extractfile(member)
+                if member_stream is not None:
+                    yield member.name, member_stream
+
+    def _is_hidden(self, name: str) -> bool:
+        parts = name.replace("\\", "/").split("/")
+        return parts[0] == "__MACOSX" or parts[-1].startswith(".")
+
+    # -------------------------------------------------------
+    # Deduplication
+    # -------------------------------------------------------
+
+    def _skip_duplicates(self, members, report, user_id, source_id) -> List[Tuple[str, str, str, str]]:
+        deduplicator = UploadDeduplicator(self.db)
+        new_members = []
+
+        for member in members:
+            name, _, file_type, content_hash = member
+            existing = deduplicator.find_existing(content_hash, user_id, source_id)
+
+            if existing:
+                report.append(dict(existing, file=name, file_type=file_type))
+            else:
+                new_members.append(member)
+
+        return new_members
+
+    # -------------------------------------------------------
+    # Parallel parsing
+    # -------------------------------------------------------
+
+    def _parse_members(self, members: List[Tuple[str, str, str, str]], workdir: str) -> Iterator[Dict[str, Any]]:
+        """
+        Parse members in a process pool; results are yielded in upload order
+        as soon as each one (and those before it) is done.
+
+        Workers write parsed rows to spool files and return only a summary;
+        results carry a "rows" iterable reading the spool back. At most
+        max_workers members are in flight, and the next one is only
+        submitted once the caller asks for another result, so memory and
+        spooled disk stay bounded however many members the archive has.
+        """
+
+        if not members:
+            return
+
+        workers = min(self.max_workers, len(members))
+
+        # spawn: never fork a web worker that holds DB connections / threads
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+        queued = iter(members)
+        pending = deque()
+
+        def submit() -> bool:
+            member = next(queued, None)
+            if member is None:
+                return False
+
+            name, path, file_type, content_hash = member
+            spool_path = f"{path}.rows"
+            pending.append((name, content_hash, spool_path, executor.submit(parse_member, path, file_type, spool_path)))
+            return True
+
+        try:
+            while len(pending) < workers and submit():
+                pass
+
+            while pending:
+                name, content_hash, spool_path, future = pending.popleft()
+
+                try:
+                    result = dict(future.result(), file=name, content_hash=content_hash)
+                    result["rows"] = read_spool(result.pop("spool"))
+                except Exception as e:
+                    result = {"file": name, "status": "error", "error": str(e)}
+
+                    if os.path.exists(spool_path):
+                        os.remove(spool_path)
+
+                submit()
+                yield result
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # -------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------
+
+    def _store_separately(self, parsed, user_id, source_id) -> List[Dict[str, Any]]:
+        report = []
+
+        for result in parsed:
+            rows = result.pop("rows", None)
+
+            if result["status"] == "success":
+                try:
+                    typed_rows = TypedRowStream(rows)
+
+                    stats = BulkLoader(self.db).load_raw_dataset(
+                        user_id=user_id,
+                        source_id=source_id,
+                        rows=typed_rows,
+                        metadata=self._metadata(result["file"], result["file_type"], typed_rows.schema),
+                        content_hash=result["content_hash"],
+                    )
+                    result["dataset_id"] = stats["dataset_id"]
+
+                except Exception as e:
+                    result.update(status="error", error=str(e))
+
+            report.append(result)
+
+        return report
+
+    def _store_merged(self, parsed, user_id, source_id) -> List[Dict[str, Any]]:
+        report = []
+
+        def merged_rows():
+            merged = 0
+
+            for result in parsed:
+                rows = result.pop("rows", None)
+                report.append(result)
+
+                if result["status"] != "success":
+                    continue
+
+                for row in rows:
+                    row.setdefault("source_file", result["file"])
+                    merged += 1
+                    yield row
+
+            if merged == 0:
+                raise ValueError("No valid files to merge")
+
+        try:
+            typed_rows = TypedRowStream(merged_rows())
+
+            stats = BulkLoader(self.db).load_raw_dataset(
+                user_id=user_id,
+                source_id=source_id,
+                rows=typed_rows,
+                metadata=self._metadata("merged upload", "MERGED", typed_rows.schema),
+            )
+
+        except Exception as e:
+            for result in report:
+                if result["status"] == "success":
+                    result.update(status="error", error=str(e))
+            return report
+
+        for result in report:
+            if result["status"] == "success":
+                result["dataset_id"] = stats["dataset_id"]
+
+        return report
+
+    def _metadata(self, filename: str, file_type: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "filename": filename,
+            "file_type": file_type,
+            "uploaded_at": datetime.utcnow().isoformat(),
+            "schema": schema,
+        }
@@ -0,0 +1,278 @@
+import datetime
+import decimal
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from Ingestion.row_cleaner import clean_column_name
+from Ingestion.validators import DatasetValidationError
+
+
+# Rows per column batch handed to the loader
+DEFAULT_COLUMN_BATCH_SIZE = 50000
+
+# Filename suffix -> columnar file type
+COLUMNAR_SUFFIXES = {
+    ".parquet": "PARQUET",
+    ".pq": "PARQUET",
+    ".arrow": "ARROW",
+    ".feather": "ARROW",
+    ".ipc": "ARROW",
+    ".fits": "FITS",
+    ".fit": "FITS",
+    ".fts": "FITS",
+}
+
+COLUMNAR_TYPES = frozenset(COLUMNAR_SUFFIXES.values())
+
+
+class ColumnarReader:
+    """
+    Reads binary columnar files into typed column batches.
+
+    Supported inputs:
+    - Parquet (pyarrow, memory-mapped, read one row group batch at a time)
+    - Arrow IPC file / stream format, including Feather v2 (pyarrow, memory-mapped)
+    - FITS binary / ASCII tables (astropy, memory-mapped first table HDU)
+
+    Values come out as native Python ints / floats / strings straight from
+    the binary column buffers, so nothing is formatted to text and parsed
+    back again. NaN and null cells become None.
+    """
+
+    def __init__(self, path: str, file_type: str, batch_size: int = DEFAULT_COLUMN_BATCH_SIZE):
+        self.path = path
+        self.file_type = file_type.upper()
+        self.batch_size = batch_size
+
+        self.columns: Optional[List[str]] = None
+        self.rows_read = 0
+
+    def iter_column_batches(self) -> Iterator[Dict[str, List[Any]]]:
+        """
+        Yield {column_name: [values]} batches of at most batch_size rows.
+        """
+
+        if self.file_type == "PARQUET":
+            batches = self._iter_parquet()
+
+        elif self.file_type == "ARROW":
+            batches = self._iter_arrow_ipc()
+
+        elif self.file_type == "FITS":
+            batches = self._iter_fits()
+
+        else:
+            raise DatasetValidationError("Unsupported dataset type")
+
+        for batch in batches:
+            self.rows_read += len(next(iter(batch.values()), []))
+            yield batch
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """
+        Row view over the column batches; empty cells are left out of the row.
+        """
+
+        for batch in self.iter_column_batches():
+            names = list(batch)
+
+            for values in zip(*batch.values()):
+                row = {
+                    name: value
+                    for name, value in zip(names, values)
+                    if value is not None and value != ""
+                }
+                if row:
+                    yield row
+
+    # -------------------------------------------------------
+    # Arrow (Parquet / IPC)
+    # -------------------------------------------------------
+
+    def _iter_parquet(self) -> Iterator[Dict[str, List[Any]]]:
+        pq = _require("pyarrow.parquet", "Parquet")
+
+        try:
+            parquet_file = pq.ParquetFile(self.path, memory_map=True)
+        except Exception as e:
+            raise DatasetValidationError(f"Invalid Parquet file: {str(e)}")
+
+        for record_batch in parquet_file.iter_batches(batch_size=self.batch_size):
+            yield self._arrow_batch_columns(record_batch)
+
+    def _iter_arrow_ipc(self) -> Iterator[Dict[str, List[Any]]]:
+        pa = _require("pyarrow", "Arrow IPC")
+
+        source = pa.memory_map(self.path, "r")
+
+        try:
+            try:
+                reader = pa.ipc.open_file(source)
+                record_batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+            except pa.ArrowInvalid:
+                source.seek(0)
+                record_batches = iter(pa.ipc.open_stream(source))
+
+            for record_batch in record_batches:
+                # Re-slice large IPC batches; slicing is zero-copy
+                for offset in range(0, record_batch.num_rows, self.batch_size):
+                    yield self._arrow_batch_columns(record_batch.slice(offset, self.batch_size))
+
+        except pa.ArrowInvalid as e:
+            raise DatasetValidationError(f"Invalid Arrow IPC file: {str(e)}")
+
+        finally:
+            source.close()
+
+    def _arrow_batch_columns(self, record_batch) -> Dict[str, List[Any]]:
+        pa = _require("pyarrow", "Arrow")
+
+        if self.columns is None:
+            self.columns = [clean_column_name(name) for name in record_batch.schema.names]
+            if not self.columns:
+                raise DatasetValidationError("Table has no columns")
+
+        batch = {}
+
+        for name, column in zip(self.columns, record_batch.columns):
+            values = column.to_pylist()
+            converter = _arrow_converter(pa, column.type)
+            batch[name] = [converter(value) for value in values] if converter else values
+
+        return batch
+
+    # -------------------------------------------------------
+    # FITS
+    # -------------------------------------------------------
+
+    def _iter_fits(self) -> Iterator[Dict[str, List[Any]]]:
+        fits = _require("astropy.io.fits", "FITS")
+
+        try:
+            hdul = fits.open(self.path, memmap=True)
+        except Exception as e:
+            raise DatasetValidationError(f"Invalid FITS file: {str(e)}")
+
+        try:
+            table = next(
+                (
+                    hdu for hdu in hdul
+                    if isinstance(hdu, (fits.BinTableHDU, fits.TableHDU)) and hdu.data is not None
+                ),
+                None,
+            )
+
+            if table is None:
+                raise DatasetValidationError("FITS file has no table extension")
+
+            data = table.data
+            names = list(data.columns.names)
+            self.columns = [clean_column_name(name) for name in names]
+
+            for start in range(0, len(data), self.batch_size):
+                # Slicing a memmapped FITS_rec only touches these rows' pages
+                rows = data[start:start + self.batch_size]
+                batch = {}
+
+                for name, column in zip(self.columns, names):
+                    field = rows.field(column)
+                    converter = _numpy_converter(field)
+                    values = field.tolist()
+                    batch[name] = [converter(value) for value in values] if converter else values
+
+                yield batch
+
+        finally:
+            hdul.close()
+
+
+# -------------------------------------------------------
+# Helpers
+# -------------------------------------------------------
+
+def columnar_file_type(filename: str) -> Optional[str]:
+    """
+    Return PARQUET, ARROW or FITS for a columnar filename, else None.
+    """
+
+    filename = filename.lower()
+
+    for suffix, file_type in COLUMNAR_SUFFIXES.items():
+        if filename.endswith(suffix):
+            return file_type
+
+    return None
+
+
+def _require(module: str, label: str):
+    try:
+        return __import__(module, fromlist=["_"])
+    except ImportError:
+        package = "astropy" if module.startswith("astropy") else "pyarrow"
+        raise DatasetValidationError(f"{label} uploads require the '{package}' package")
+
+
+def _clean_float(value):
+    if value is None or math.isnan(value):
+        return None
+    return value
+
+
+def _clean_scalar(value):
+    """
+    Fallback for values JSON cannot store directly.
+    """
+
+    if value is None:
+        return None
+
+    if isinstance(value, float):
+        return _clean_float(value)
+
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace").strip()
+
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+
+    if isinstance(value, list):
+        return [_clean_scalar(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _clean_scalar(item) for key, item in value.items()}
+
+    return value
+
+
+def _arrow_converter(pa, arrow_type) -> Optional[Callable[[Any], Any]]:
+    """
+    Per-column converter, or None when to_pylist() values are already JSON-safe.
+    """
+
+    if pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type) or pa.types.is_string(arrow_type):
+        return None
+
+    if pa.types.is_large_string(arrow_type):
+        return None
+
+    if pa.types.is_floating(arrow_type):
+        return _clean_float
+
+    return _clean_scalar
+
+
+def _numpy_converter(field) -> Optional[Callable[[Any], Any]]:
+    # Vector (multi-dimensional) cells fall through to the generic converter
+    if field.ndim == 1 and field.dtype.kind in ("i", "u", "b", "U"):
+        return None
+
+    if field.ndim == 1 and field.dtype.kind == "f":
+        return _clean_float
+
+    return _clean_scalar
@@ -0,0 +1,115 @@
+import hashlib
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from repository.raw_repo import RawDatasetRepository
+from repository.normalized_repo import NormalizedDatasetRepository
+
+
+# Bytes hashed per read
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class HashingReader:
+    """
+    Pass-through binary stream that sha256-hashes every byte read from it,
+    for uploads that cannot be rewound and hashed up front.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self._digest.update(data)
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        data = self.stream.readline(size)
+        self._digest.update(data)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        for line in self.stream:
+            self._digest.update(line)
+            yield line
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def hash_stream(stream: BinaryIO) -> Optional[str]:
+    """
+    sha256 of a seekable stream's remaining bytes; the stream is rewound to
+    where it was. Returns None when the stream cannot be rewound.
+    """
+
+    try:
+        if not stream.seekable():
+            return None
+        start = stream.tell()
+    except (AttributeError, OSError):
+        return None
+
+    digest = hashlib.sha256()
+
+    while True:
+        block = stream.read(HASH_BLOCK_SIZE)
+        if not block:
+            break
+        digest.update(block)
+
+    stream.seek(start)
+    return digest.hexdigest()
+
+
+def hash_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class UploadDeduplicator:
+    """
+    Content-addressed lookup of raw datasets.
+
+    A repeat upload of the same bytes by the same user for the same source
+    is answered with the existing raw dataset and its normalized versions;
+    nothing is stored or re-normalized. Other users (or sources) always get
+    a dataset of their own: it is listed, mapped and deleted as theirs.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.raw_repo = RawDatasetRepository(db)
+        self.normalized_repo = NormalizedDatasetRepository(db)
+
+    def find_existing(self, content_hash: Optional[str], user_id: str, source_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Return the ingestion result for the user's earlier upload of these
+        bytes to this source, counting the hit, or None when it is new.
+        """
+
+        if not content_hash:
+            return None
+
+        dataset = self.raw_repo.find_by_content_hash(content_hash, user_id, source_id)
+
+        if dataset is None:
+            return None
+
+        self.raw_repo.record_dedup_hit(dataset.id)
+
+        return {
+            "status": "success",
+            "dataset_id": dataset.id,
+            "records": dataset.row_count,
+            "deduplicated": True,
+            "content_hash": content_hash,
+            "normalized_datasets": [
+                {
+                    "normalized_dataset_id": str(normalized.id),
+                    "normalization_version": normalized.normalization_version,
+                    "normalized_at": normalized.normalized_at.isoformat() if normalized.normalized_at else None,
+                }
+                for normalized in self.normalized_repo.get_by_raw_dataset(dataset.id)
+            ],
+        }
@@ -0,0 +1,157 @@
+import os
+import pickle
+import time
+from typing import Any, Dict, Iterator, List
+
+from Ingestion.stream_reader import StreamingRowReader, iter_batches
+from Ingestion.columnar_readers import ColumnarReader, COLUMNAR_TYPES, columnar_file_type
+from Ingestion.row_cleaner import RowCleaner
+from Ingestion.validators import DatasetValidationError
+
+
+# Suffixes of archives accepted by the multi-file upload path
+ARCHIVE_SUFFIXES = {
+    ".zip": "ZIP",
+    ".tar.gz": "TAR",
+    ".tgz": "TAR",
+    ".tar": "TAR",
+}
+
+# Cleaned rows per batch in a parse_member spool file
+SPOOL_BATCH_SIZE = 5000
+
+
+def detect_file_type(filename: str) -> str:
+    """
+    Map a filename to CSV, JSON, PARQUET, ARROW, FITS, ZIP or TAR.
+    """
+
+    filename = filename.lower()
+
+    columnar_type = columnar_file_type(filename)
+    if columnar_type:
+        return columnar_type
+
+    if filename.endswith(".csv"):
+        return "CSV"
+
+    if filename.endswith((".json", ".ndjson", ".jsonl")):
+        return "JSON"
+
+    for suffix, archive_type in ARCHIVE_SUFFIXES.items():
+        if filename.endswith(suffix):
+            return archive_type
+
+    raise ValueError(
+        "File must be CSV, JSON, Parquet, Arrow IPC, FITS or a .zip / .tar.gz archive"
+    )
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(tuple(ARCHIVE_SUFFIXES))
+
+
+def is_columnar(filename: str) -> bool:
+    return columnar_file_type(filename) is not None
+
+
+# -------------------------------------------------------
+# Row cleaning
+# -------------------------------------------------------
+
+# Compiled once per header set and reused for every row (see RowCleaner)
+_csv_cleaner = RowCleaner(strip_values=True)
+_json_cleaner = RowCleaner()
+
+
+def clean_csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+
+    return _csv_cleaner.clean(row)
+
+
+def clean_json_row(item: Dict[str, Any]) -> Dict[str, Any]:
+
+    return _json_cleaner.clean(item)
+
+
+# -------------------------------------------------------
+# File parsing (safe to run in worker processes)
+# -------------------------------------------------------
+
+def parse_file(path: str, file_type: str) -> List[Dict[str, Any]]:
+    """
+    Parse and validate a CSV / JSON / columnar file on disk into cleaned rows.
+    """
+
+    rows = list(iter_file_rows(path, file_type))
+
+    if not rows:
+        raise DatasetValidationError(f"{file_type} dataset is empty")
+
+    return rows
+
+
+def iter_file_rows(path: str, file_type: str) -> Iterator[Dict[str, Any]]:
+    """
+    Cleaned rows of a CSV / JSON / columnar file on disk, one at a time.
+    """
+
+    if file_type in COLUMNAR_TYPES:
+        # Typed column batches: names are cleaned and empty cells dropped by the reader
+        yield from ColumnarReader(path, file_type)
+        return
+
+    clean_row = clean_csv_row if file_type == "CSV" else clean_json_row
+
+    with open(path, "rb") as stream:
+        for row in StreamingRowReader(stream, file_type):
+            cleaned = clean_row(row)
+            if cleaned:
+                yield cleaned
+
+
+def parse_member(path: str, file_type: str, spool_path: str, batch_size: int = SPOOL_BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Process-pool task: parse one spooled member file into a spool of
+    cleaned row batches at spool_path (see read_spool). Only a summary goes
+    back to the parent, and the worker holds one batch at a time.
+    """
+
+    started = time.perf_counter()
+    records = 0
+
+    with open(spool_path, "wb") as spool:
+        for batch in iter_batches(iter_file_rows(path, file_type), batch_size):
+            pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+            records += len(batch)
+
+    if records == 0:
+        raise DatasetValidationError(f"{file_type} dataset is empty")
+
+    return {
+        "status": "success",
+        "file_type": file_type,
+        "records": records,
+        "spool": spool_path,
+        "parse_seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def read_spool(spool_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Rows written by parse_member, one batch in memory at a time. The spool
+    file is removed once it has been read.
+    """
+
+    try:
+        with open(spool_path, "rb") as spool:
+            while True:
+                try:
+                    batch = pickle.load(spool)
+                except EOFError:
+                    return
+
+                yield from batch
+    finally:
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
@@ -0,0 +1,84 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+# Distinct header sets remembered per cleaner before the cache is reset
+MAX_PLANS = 1024
+
+# (source key, output key) pairs, in row order
+Plan = Tuple[Tuple[Any, str], ...]
+
+
+def clean_column_name(name: Any) -> str:
+    return str(name).strip().lower().replace(" ", "_")
+
+
+class RowCleaner:
+    """
+    Cleans row keys and drops empty (None / "") values.
+
+    The key work (strip / lower / space -> underscore, the optional
+    canonical rename and the keep filter) is compiled once per distinct
+    header set into a plan; each row is then rebuilt in a single pass over
+    that plan. Rows from one CSV / API page / catalog share a header set,
+    so the string work runs once per file instead of once per cell.
+    """
+
+    def __init__(
+        self,
+        rename: Optional[Dict[str, str]] = None,
+        keep: Optional[Iterable[str]] = None,
+        strip_values: bool = False,
+    ):
+        self.rename = rename or {}
+        self.keep = frozenset(keep) if keep is not None else None
+        self.strip_values = strip_values
+
+        self._plans: Dict[tuple, Plan] = {}
+
+    def clean(self, row: Dict[Any, Any]) -> Dict[str, Any]:
+        keys = tuple(row)
+        plan = self._plans.get(keys)
+
+        if plan is None:
+            plan = self._compile(keys)
+
+        if self.strip_values:
+            return {
+                target: value.strip() if isinstance(value, str) else value
+                for source, target in plan
+                if (value := row[source]) is not None and value != ""
+            }
+
+        return {
+            target: value
+            for source, target in plan
+            if (value := row[source]) is not None and value != ""
+        }
+
+    __call__ = clean
+
+    def plan(self, keys: Iterable[Any]) -> Plan:
+        keys = tuple(keys)
+        return self._plans.get(keys) or self._compile(keys)
+
+    def _compile(self, keys: tuple) -> Plan:
+        plan = []
+
+        for key in keys:
+            # csv.DictReader files surplus cells under the None key
+            if key is None:
+                continue
+
+            target = clean_column_name(key)
+            target = self.rename.get(target, target)
+
+            if self.keep is not None and target not in self.keep:
+                continue
+
+            plan.append((key, target))
+
+        if len(self._plans) >= MAX_PLANS:
+            self._plans.clear()
+
+        self._plans[keys] = tuple(plan)
+        return self._plans[keys]
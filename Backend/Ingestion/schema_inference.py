@@ -0,0 +1,228 @@
+import re
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+# Rows sampled from the head of a dataset to infer column types
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Leading zeros are kept as strings (catalog ids, zip-style codes)
+_INT = re.compile(r"^[+-]?(0|[1-9]\d*)$")
+_FLOAT = re.compile(r"^[+-]?((0|[1-9]\d*)(\.\d*)?|\.\d+)([eE][+-]?\d+)?$")
+_TIMESTAMP = re.compile(
+    r"^\d{4}-\d{2}-\d{2}"
+    r"([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?)?$"
+)
+_BOOLEANS = {"true": True, "false": False}
+_NAN = {"nan", "+nan", "-nan"}
+
+
+class SchemaInferrer:
+    """
+    Infers a column type per column from a sample of rows.
+
+    Types: int, float, bool, timestamp, string.
+    A column mixing int and float is float; any other mix is string.
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.sample_size = sample_size
+
+    def infer(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        seen: Dict[str, set] = {}
+        present: Dict[str, int] = {}
+
+        for row in rows:
+            for key, value in row.items():
+                if value is None or value == "":
+                    continue
+
+                seen.setdefault(key, set()).add(_value_type(value))
+                present[key] = present.get(key, 0) + 1
+
+        columns = {
+            key: {
+                "type": _merge_types(types),
+                "nullable": present[key] < len(rows),
+                "coercion_failures": 0,
+            }
+            for key, types in seen.items()
+        }
+
+        return {
+            "sampled_rows": len(rows),
+            "columns": columns,
+            "inferred_at": datetime.utcnow().isoformat(),
+        }
+
+
+class TypedRowStream:
+    """
+    Wraps a row iterable: samples its head, infers the schema, then yields
+    every row with values coerced to the inferred column types.
+
+    Values that do not fit their column type are kept unchanged and counted
+    in schema["columns"][name]["coercion_failures"] as rows are consumed.
+    Columns first seen after the sample are passed through untouched.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]], sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self._rows = iter(rows)
+        self._sample = list(islice(self._rows, sample_size))
+
+        self.schema = SchemaInferrer(sample_size).infer(self._sample)
+        self._coercers = {
+            name: _COERCERS[column["type"]]
+            for name, column in self.schema["columns"].items()
+            if _COERCERS.get(column["type"])
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self._sample:
+            yield self.coerce_row(row)
+
+        self._sample = []
+
+        for row in self._rows:
+            yield self.coerce_row(row)
+
+    def coerce_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        coerced = {}
+
+        for key, value in row.items():
+            coercer = self._coercers.get(key)
+
+            if coercer is not None and value != "":
+                try:
+                    value = coercer(value)
+                except (TypeError, ValueError):
+                    self.schema["columns"][key]["coercion_failures"] += 1
+
+            if value is not None:
+                coerced[key] = value
+
+        return coerced
+
+
+def column_types(schema: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    {column: type} view of a stored schema; empty when no schema was recorded.
+    """
+
+    if not schema:
+        return {}
+
+    return {name: column["type"] for name, column in schema.get("columns", {}).items()}
+
+
+# -------------------------------------------------------
+# Type detection
+# -------------------------------------------------------
+
+def _value_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+
+    if isinstance(value, int):
+        return "int"
+
+    if isinstance(value, float):
+        return "float"
+
+    if not isinstance(value, str):
+        return "string"
+
+    text = value.strip()
+    lowered = text.lower()
+
+    if _INT.match(text):
+        return "int"
+
+    if _FLOAT.match(text) or lowered in _NAN:
+        return "float"
+
+    if lowered in _BOOLEANS:
+        return "bool"
+
+    if _TIMESTAMP.match(text):
+        return "timestamp"
+
+    return "string"
+
+
+def _merge_types(types: set) -> str:
+    if len(types) == 1:
+        return next(iter(types))
+
+    if types <= {"int", "float"}:
+        return "float"
+
+    return "string"
+
+
+# -------------------------------------------------------
+# Coercion (raise ValueError / TypeError when a value does not fit)
+# -------------------------------------------------------
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise TypeError("bool is not an int")
+
+    if isinstance(value, int):
+        return value
+
+    if isinstance(value, str) and _INT.match(value.strip()):
+        return int(value)
+
+    raise ValueError(value)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        raise TypeError("bool is not a float")
+
+    if isinstance(value, float):
+        return None if value != value else value
+
+    if isinstance(value, int):
+        return float(value)
+
+    if isinstance(value, str):
+        text = value.strip()
+
+        # NaN cannot be stored in JSON: treat it as a missing value
+        if text.lower() in _NAN:
+            return None
+
+        if _FLOAT.match(text):
+            return float(text)
+
+    raise ValueError(value)
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    if isinstance(value, str) and value.strip().lower() in _BOOLEANS:
+        return _BOOLEANS[value.strip().lower()]
+
+    raise ValueError(value)
+
+
+def _to_timestamp(value: Any) -> str:
+    # JSON has no datetime type: timestamps are stored as canonical ISO-8601
+    if isinstance(value, str) and _TIMESTAMP.match(value.strip()):
+        return datetime.fromisoformat(value.strip().replace("Z", "+00:00")).isoformat()
+
+    raise ValueError(value)
+
+
+_COERCERS: Dict[str, Optional[Callable[[Any], Any]]] = {
+    "int": _to_int,
+    "float": _to_float,
+    "bool": _to_bool,
+    "timestamp": _to_timestamp,
+    "string": None,
+}
@@ -0,0 +1,386 @@
+import codecs
+import csv
+import json
+import re
+from itertools import chain, islice
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from Ingestion.validators import DatasetValidationError
+
+
+# Rows persisted per batch when streaming an upload into storage
+DEFAULT_BATCH_SIZE = 5000
+
+# Bytes pulled from the upload stream per read
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Characters a single JSON value (one row) may buffer before the parse is aborted
+MAX_VALUE_SIZE = 16 * 1024 * 1024
+
+# A decode error this close to the end of the buffer may just be a value cut off by the block edge
+_TRUNCATION_MARGIN = 64
+
+_NON_WHITESPACE = re.compile(r"\S")
+
+
+class StreamingRowReader:
+    """
+    Parses rows out of a binary upload stream incrementally.
+
+    Supported inputs:
+    - CSV (header row + records)
+    - JSON array of objects
+    - JSON object envelope with a "data" array
+    - NDJSON / concatenated JSON objects
+
+    Only one read block plus the row currently being parsed is held
+    in memory, regardless of the file size; a JSON value larger than
+    max_value_size characters fails the parse.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        file_type: str,
+        encoding: str = "utf-8-sig",
+        block_size: int = READ_BLOCK_SIZE,
+        max_value_size: int = MAX_VALUE_SIZE,
+    ):
+        self.stream = stream
+        self.file_type = file_type.upper()
+        self.encoding = encoding
+        self.block_size = block_size
+        self.max_value_size = max_value_size
+
+        self.fieldnames: Optional[List[str]] = None
+        self.rows_read = 0
+        self._csv_reader = None
+
+        # Called with a message for JSON elements that are not objects;
+        # when unset such an element fails the whole parse
+        self.on_invalid: Optional[Callable[[str], None]] = None
+
+        self._bytes_read = 0
+        self._line_offset = 0
+        self._scanner: Optional["_JsonValueScanner"] = None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+
+        if self.file_type == "CSV":
+            return self._iter_csv()
+
+        if self.file_type == "JSON":
+            return self._iter_json()
+
+        raise DatasetValidationError("Unsupported dataset type")
+
+    def iter_batches(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        return iter_batches(self, batch_size)
+
+    def location(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (line, byte offset) of the row last yielded, for error reports.
+        CSV rows report the line they end on.
+        """
+
+        if self._scanner is not None:
+            return self._scanner.location()
+
+        if self._csv_reader is not None:
+            return self._csv_reader.line_num, self._line_offset
+
+        return None, None
+
+    # -------------------------------------------------------
+    # Decoding
+    # -------------------------------------------------------
+
+    def _iter_text_lines(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+
+        for raw_line in self.stream:
+            self._line_offset = self._bytes_read
+            self._bytes_read += len(raw_line)
+            yield decoder.decode(raw_line)
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def _iter_text_blocks(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+
+        while True:
+            block = self.stream.read(self.block_size)
+            if not block:
+                break
+            yield decoder.decode(block)
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    # -------------------------------------------------------
+    # CSV
+    # -------------------------------------------------------
+
+    def _iter_csv(self) -> Iterator[Dict[str, Any]]:
+        reader = csv.DictReader(self._iter_text_lines())
+        self._csv_reader = reader
+
+        try:
+            for row in reader:
+                self.fieldnames = reader.fieldnames
+                self.rows_read += 1
+                yield row
+
+        except csv.Error as e:
+            raise DatasetValidationError(
+                f"CSV parsing failed at line {reader.line_num} (byte {self._line_offset}): {str(e)}"
+            )
+
+        self.fieldnames = reader.fieldnames
+
+        if not self.fieldnames:
+            raise DatasetValidationError("CSV has no headers")
+
+    # -------------------------------------------------------
+    # JSON / NDJSON
+    # -------------------------------------------------------
+
+    def _iter_json(self) -> Iterator[Dict[str, Any]]:
+        scanner = _JsonValueScanner(self._iter_text_blocks(), self.encoding, self.max_value_size)
+        self._scanner = scanner
+
+        try:
+            first = scanner.peek()
+
+            if first == "[":
+                elements = scanner.iter_array()
+            elif first == "{":
+                # The envelope's "data" array is streamed; later values are NDJSON rows
+                elements = chain(self._iter_envelope(scanner), self._iter_values(scanner))
+            else:
+                elements = self._iter_values(scanner)
+
+            for element in elements:
+                if not isinstance(element, dict):
+                    message = f"Row {self.rows_read} must be an object"
+
+                    if self.on_invalid is None:
+                        line, offset = scanner.location()
+                        raise DatasetValidationError(f"{message} (line {line}, byte {offset})")
+
+                    self.rows_read += 1
+                    self.on_invalid(message)
+                    continue
+
+                self.rows_read += 1
+                yield element
+
+            if first == "[" and scanner.peek() is not None:
+                raise DatasetValidationError("Unexpected data after JSON array")
+
+        except json.JSONDecodeError as e:
+            line, offset = scanner.location(e.pos)
+            raise DatasetValidationError(
+                f"Invalid JSON format near row {self.rows_read} (line {line}, byte {offset}): {e.msg}"
+            )
+
+    @staticmethod
+    def _iter_envelope(scanner: "_JsonValueScanner") -> Iterator[Any]:
+        """
+        Rows of the object at the scanner: the elements of its "data" array,
+        one at a time, or the object itself when it has no such array.
+        """
+        members: Dict[str, Any] = {}
+        enveloped = False
+
+        for key in scanner.iter_members():
+            if key == "data" and scanner.peek() == "[":
+                enveloped = True
+                yield from scanner.iter_array()
+            else:
+                members[key] = scanner.value()
+
+        if not enveloped:
+            yield members
+
+    @staticmethod
+    def _iter_values(scanner: "_JsonValueScanner") -> Iterator[Any]:
+        # {"data": [...]} envelopes, same as the in-memory parser
+        for value in scanner.iter_values():
+            if isinstance(value, dict) and isinstance(value.get("data"), list):
+                yield from value["data"]
+            elif isinstance(value, list):
+                yield from value
+            else:
+                yield value
+
+
+class _JsonValueScanner:
+    """
+    Decodes consecutive JSON values from a stream of text blocks.
+    """
+
+    def __init__(self, blocks: Iterator[str], encoding: str = "utf-8", max_value_size: int = MAX_VALUE_SIZE):
+        self._blocks = blocks
+        self._max_value_size = max_value_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+        # Byte offsets are measured without the BOM
+        self._encoding = "utf-8" if encoding.lower().replace("_", "-") == "utf-8-sig" else encoding
+
+        # Lines / bytes of text already dropped from the buffer, and where
+        # the last decoded value started in it
+        self._dropped_lines = 0
+        self._dropped_bytes = 0
+        self._value_start = 0
+
+    def _fill(self) -> bool:
+        block = next(self._blocks, None)
+
+        if block is None:
+            self._eof = True
+            return False
+
+        dropped = self._buffer[:self._pos]
+        self._dropped_lines += dropped.count("\n")
+        self._dropped_bytes += len(dropped.encode(self._encoding, errors="replace"))
+        self._value_start = max(self._value_start - self._pos, 0)
+
+        self._buffer = self._buffer[self._pos:] + block
+        self._pos = 0
+        return True
+
+    def location(self, pos: Optional[int] = None) -> Tuple[int, int]:
+        """
+        (1-based line, byte offset) of a buffer position, by default the
+        start of the last decoded value. Only computed for error reports.
+        """
+        if pos is None:
+            pos = self._value_start
+
+        prefix = self._buffer[:pos]
+
+        return (
+            self._dropped_lines + prefix.count("\n") + 1,
+            self._dropped_bytes + len(prefix.encode(self._encoding, errors="replace")),
+        )
+
+    def peek(self) -> Optional[str]:
+        """
+        Return the next non-whitespace character, or None at end of input.
+        """
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+
+            if match:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+
+            self._pos = len(self._buffer)
+
+            if not self._fill():
+                return None
+
+    def value(self) -> Any:
+        self.peek()
+
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+
+                # A value ending exactly at the buffer edge may be truncated
+                # (e.g. a number split across blocks), so read on first.
+                if end < len(self._buffer) or self._eof:
+                    self._value_start = self._pos
+                    self._pos = end
+                    return value
+
+            except json.JSONDecodeError as e:
+                # Malformed well before the end of the buffer: more input cannot fix it
+                cut_off = e.pos >= len(self._buffer) - _TRUNCATION_MARGIN or e.msg.startswith("Unterminated string")
+
+                if self._eof or not cut_off:
+                    raise
+
+            if len(self._buffer) - self._pos > self._max_value_size:
+                line, offset = self.location(self._pos)
+                raise DatasetValidationError(
+                    f"JSON value exceeds {self._max_value_size} characters (line {line}, byte {offset})"
+                )
+
+            self._fill()
+
+    def iter_values(self) -> Iterator[Any]:
+        while self.peek() is not None:
+            yield self.value()
+
+    def iter_members(self) -> Iterator[str]:
+        """
+        Keys of the object at the current position. After each key the
+        scanner sits on its value, which the caller consumes (value() or
+        iter_array()) before asking for the next key.
+        """
+        self._pos += 1  # consume "{"
+
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key = self.value()
+
+            if not isinstance(key, str) or self.peek() != ":":
+                raise DatasetValidationError("Malformed JSON object")
+
+            self._pos += 1
+            yield key
+
+            separator = self.peek()
+            self._pos += 1
+
+            if separator == "}":
+                return
+
+            if separator != ",":
+                raise DatasetValidationError("Malformed JSON object")
+
+    def iter_array(self) -> Iterator[Any]:
+        self._pos += 1  # consume "["
+
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            separator = self.peek()
+            self._pos += 1
+
+            if separator == "]":
+                return
+
+            if separator != ",":
+                raise DatasetValidationError("Malformed JSON array")
+
+
+def iter_batches(rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Group an iterable of rows into lists of at most batch_size rows.
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    iterator = iter(rows)
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
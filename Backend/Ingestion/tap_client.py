@@ -0,0 +1,291 @@
+import re
+import time
+import xml.etree.ElementTree as ElementTree
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import requests
+
+from Ingestion.stream_reader import StreamingRowReader
+from Ingestion.validators import DatasetValidationError
+
+
+# Seconds between UWS phase polls (doubles up to the maximum)
+POLL_INTERVAL = 0.5
+MAX_POLL_INTERVAL = 10.0
+
+# Give up (and abort the job) after this long
+MAX_WAIT_SECONDS = 3600
+
+REQUEST_TIMEOUT = 30
+
+RESULT_FORMATS = ("csv", "votable")
+
+# Plain or schema-qualified ADQL identifiers (gaiadr3.gaia_source, ra, phot_g_mean_mag)
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+_FINAL_PHASES = {"COMPLETED", "ERROR", "ABORTED"}
+
+
+class TapQueryError(Exception):
+    """
+    Raised when a TAP job fails, is aborted or does not finish in time.
+    """
+
+
+def build_adql(
+    table: str,
+    columns: Optional[Sequence[str]] = None,
+    cone: Optional[Dict[str, Any]] = None,
+    where: Optional[str] = None,
+    limit: Optional[int] = None,
+    ra_column: str = "ra",
+    dec_column: str = "dec",
+) -> str:
+    """
+    Build an ADQL query; only the requested columns are selected so the
+    server never sends columns that would be thrown away.
+
+    cone: {"ra": deg, "dec": deg, "radius": deg}
+    """
+
+    for identifier in [table, ra_column, dec_column, *(columns or [])]:
+        if not _IDENTIFIER.match(str(identifier)):
+            raise ValueError(f"Invalid ADQL identifier: {identifier}")
+
+    top = f"TOP {int(limit)} " if limit else ""
+    projection = ", ".join(columns) if columns else "*"
+
+    conditions = []
+
+    if cone:
+        try:
+            ra, dec, radius = (float(cone[key]) for key in ("ra", "dec", "radius"))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("cone requires numeric ra, dec and radius")
+
+        conditions.append(
+            f"1 = CONTAINS(POINT('ICRS', {ra_column}, {dec_column}), "
+            f"CIRCLE('ICRS', {ra!r}, {dec!r}, {radius!r}))"
+        )
+
+    if where:
+        conditions.append(f"({where})")
+
+    adql = f"SELECT {top}{projection} FROM {table}"
+
+    if conditions:
+        adql += " WHERE " + " AND ".join(conditions)
+
+    return adql
+
+
+class TapClient:
+    """
+    IVOA TAP client using the asynchronous (UWS) interface.
+
+    A query is posted to {base_url}/async, the job's phase is polled until
+    it finishes, and the result document is streamed and parsed row by row
+    (CSV or TABLEDATA VOTable), so result size is not bounded by memory.
+    The job is deleted on the server once its rows have been read.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        session: Optional[requests.Session] = None,
+        poll_interval: float = POLL_INTERVAL,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+
+    def query(self, adql: str, result_format: str = "csv") -> Iterator[Dict[str, Any]]:
+        """
+        Run an ADQL query and yield result rows as {column: value} dicts.
+        """
+
+        job_url = self.submit(adql, result_format)
+
+        try:
+            self.wait(job_url)
+            yield from self.iter_results(job_url, result_format)
+
+        finally:
+            self.delete(job_url)
+
+    # -------------------------------------------------------
+    # UWS job lifecycle
+    # -------------------------------------------------------
+
+    def submit(self, adql: str, result_format: str = "csv") -> str:
+        """
+        Create and start an async job. Returns the job URL.
+        """
+
+        if result_format not in RESULT_FORMATS:
+            raise ValueError(f"Unsupported TAP result format: {result_format}")
+
+        response = self.session.post(
+            f"{self.base_url}/async",
+            data={
+                "REQUEST": "doQuery",
+                "LANG": "ADQL",
+                "FORMAT": result_format,
+                "QUERY": adql,
+                "PHASE": "RUN",
+            },
+            allow_redirects=False,
+            timeout=REQUEST_TIMEOUT,
+        )
+
+        if response.status_code not in (200, 201, 303):
+            raise TapQueryError(f"TAP job submission failed ({response.status_code}): {response.text[:500]}")
+
+        job_url = response.headers.get("Location")
+
+        if not job_url:
+            raise TapQueryError("TAP server did not return a job location")
+
+        if job_url.startswith("/"):
+            job_url = requests.compat.urljoin(self.base_url + "/", job_url)
+
+        # Servers ignoring PHASE=RUN on creation leave the job PENDING
+        if self.phase(job_url) == "PENDING":
+            self._post(f"{job_url}/phase", {"PHASE": "RUN"})
+
+        return job_url
+
+    def phase(self, job_url: str) -> str:
+        response = self.session.get(f"{job_url}/phase", timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.text.strip().upper()
+
+    def wait(self, job_url: str) -> None:
+        """
+        Poll the job until it completes; raise TapQueryError otherwise.
+        """
+
+        deadline = time.monotonic() + self.max_wait
+        interval = self.poll_interval
+
+        while True:
+            phase = self.phase(job_url)
+
+            if phase in _FINAL_PHASES:
+                break
+
+            if time.monotonic() >= deadline:
+                self._post(f"{job_url}/phase", {"PHASE": "ABORT"})
+                raise TapQueryError("TAP query did not finish in time")
+
+            time.sleep(interval)
+            interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+        if phase == "ERROR":
+            raise TapQueryError(f"TAP query failed: {self._error_summary(job_url)}")
+
+        if phase == "ABORTED":
+            raise TapQueryError("TAP query was aborted")
+
+    def delete(self, job_url: str) -> None:
+        try:
+            self.session.delete(job_url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            pass
+
+    def _post(self, url: str, data: Dict[str, str]) -> None:
+        response = self.session.post(url, data=data, allow_redirects=False, timeout=REQUEST_TIMEOUT)
+        if response.status_code >= 400:
+            raise TapQueryError(f"TAP request failed ({response.status_code}): {url}")
+
+    def _error_summary(self, job_url: str) -> str:
+        try:
+            response = self.session.get(f"{job_url}/error", timeout=REQUEST_TIMEOUT)
+            return _votable_error(response.text) or response.text.strip()[:500] or "unknown error"
+        except requests.RequestException:
+            return "unknown error"
+
+    # -------------------------------------------------------
+    # Streamed results
+    # -------------------------------------------------------
+
+    def iter_results(self, job_url: str, result_format: str = "csv") -> Iterator[Dict[str, Any]]:
+        response = self.session.get(f"{job_url}/results/result", stream=True, timeout=REQUEST_TIMEOUT)
+
+        try:
+            response.raise_for_status()
+
+            # Undo any transfer compression while streaming
+            response.raw.decode_content = True
+
+            if result_format == "csv":
+                yield from StreamingRowReader(response.raw, "CSV")
+            else:
+                yield from iter_votable_rows(response.raw)
+
+        finally:
+            response.close()
+
+
+def iter_votable_rows(stream) -> Iterator[Dict[str, Any]]:
+    """
+    Stream rows out of a TABLEDATA-serialized VOTable.
+
+    Each <TR> is released as soon as it has been read; BINARY / FITS
+    serializations are rejected.
+    """
+
+    fields: List[str] = []
+    row: List[Optional[str]] = []
+    tabledata = None
+
+    try:
+        for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+            tag = _local_name(element.tag)
+
+            if event == "start":
+                if tag == "TR":
+                    row = []
+                elif tag == "TABLEDATA":
+                    tabledata = element
+                elif tag in ("BINARY", "BINARY2", "FITS"):
+                    raise DatasetValidationError("Only TABLEDATA VOTable results are supported")
+                continue
+
+            if tag == "FIELD":
+                fields.append(element.get("name") or element.get("ID") or f"col{len(fields)}")
+
+            elif tag == "TD":
+                row.append(element.text)
+
+            elif tag == "TR":
+                yield {name: value for name, value in zip(fields, row)}
+
+                # Drop finished rows from the tree
+                if tabledata is not None:
+                    tabledata.clear()
+
+    except ElementTree.ParseError as e:
+        raise DatasetValidationError(f"Invalid VOTable: {str(e)}")
+
+
+def _votable_error(text: str) -> Optional[str]:
+    """
+    Text of <INFO name="QUERY_STATUS" value="ERROR"> in an error document.
+    """
+    try:
+        root = ElementTree.fromstring(text)
+    except ElementTree.ParseError:
+        return None
+
+    for element in root.iter():
+        if _local_name(element.tag) == "INFO" and element.get("value") == "ERROR":
+            return (element.text or "").strip() or None
+
+    return None
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
@@ -0,0 +1,292 @@
+import hashlib
+import json
+import math
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional
+
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Defaults, overridden by UPLOAD_MAX_CHUNK_BYTES / UPLOAD_MIN_CHUNK_BYTES in app config
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+MIN_CHUNK_BYTES = 1024 * 1024
+
+_UPLOAD_ID = re.compile(r"^[0-9a-f]{32}$")
+_CHUNK_FILE = re.compile(r"^(\d+)\.part$")
+
+
+class UploadSessionError(Exception):
+    """
+    Raised for invalid resumable-upload operations.
+    """
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UploadSessionStore:
+    """
+    Disk-backed resumable upload sessions.
+
+    Layout under the spool directory:
+        <upload_id>/manifest.json      session info (written once at creation)
+        <upload_id>/chunks/<n>.part    verified chunk payloads
+        <upload_id>/assembled          concatenated file, built on finalize
+
+    Chunk state is derived from the files on disk, so chunks may be
+    uploaded in any order, retried, and received by different workers.
+    The session directory's mtime is its last activity: chunk writes and
+    finalize touch it, and purge_expired() goes by it.
+
+    A chunk may hold at most max_chunk_bytes. When the session declared its
+    total_size, chunks other than the last must hold at least
+    min_chunk_bytes, so chunk numbers stop at ceil(total_size /
+    min_chunk_bytes), and the chunks together may not exceed total_size.
+    """
+
+    def __init__(self, root: str, max_chunk_bytes: int = MAX_CHUNK_BYTES, min_chunk_bytes: int = MIN_CHUNK_BYTES):
+        self.root = root
+        self.max_chunk_bytes = max_chunk_bytes
+        self.min_chunk_bytes = min_chunk_bytes
+        os.makedirs(self.root, exist_ok=True)
+
+    # -------------------------------------------------------
+    # Session lifecycle
+    # -------------------------------------------------------
+
+    def create(
+        self,
+        user_id: str,
+        filename: str,
+        source_id: int,
+        total_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+
+        if total_size is not None and total_size < 0:
+            raise UploadSessionError("total_size must be non-negative")
+
+        upload_id = uuid.uuid4().hex
+        session_dir = self._session_dir(upload_id)
+        os.makedirs(os.path.join(session_dir, "chunks"))
+
+        manifest = {
+            "upload_id": upload_id,
+            "user_id": user_id,
+            "filename": filename,
+            "source_id": source_id,
+            "total_size": total_size,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+        with open(os.path.join(session_dir, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+
+        return manifest
+
+    def get_manifest(self, upload_id: str, user_id: str) -> Dict[str, Any]:
+        path = os.path.join(self._session_dir(upload_id), "manifest.json")
+
+        if not os.path.exists(path):
+            raise UploadSessionError("Upload session not found", 404)
+
+        with open(path) as f:
+            manifest = json.load(f)
+
+        if manifest["user_id"] != user_id:
+            raise UploadSessionError("Upload session belongs to another user", 403)
+
+        return manifest
+
+    def discard(self, upload_id: str) -> None:
+        shutil.rmtree(self._session_dir(upload_id), ignore_errors=True)
+
+    def purge_expired(self, max_age_seconds: int) -> int:
+        """
+        Remove sessions idle for more than max_age_seconds. Returns how
+        many were removed.
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+
+            if _UPLOAD_ID.match(name) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+
+        return removed
+
+    # -------------------------------------------------------
+    # Chunks
+    # -------------------------------------------------------
+
+    def write_chunk(
+        self,
+        upload_id: str,
+        user_id: str,
+        chunk_no: int,
+        stream: BinaryIO,
+        checksum: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Spool one chunk to disk, verifying its sha256 before it becomes visible.
+
+        The transfer is cut off (413) as soon as the chunk outgrows
+        max_chunk_bytes or the bytes the declared total_size leaves for it.
+        """
+        manifest = self.get_manifest(upload_id, user_id)
+        total_size = manifest["total_size"]
+
+        if chunk_no < 0:
+            raise UploadSessionError("Chunk number must be non-negative")
+
+        if not checksum:
+            raise UploadSessionError("X-Chunk-SHA256 header is required")
+
+        limit = self.max_chunk_bytes
+
+        if total_size is not None:
+            max_chunks = max(1, math.ceil(total_size / self.min_chunk_bytes))
+
+            if chunk_no >= max_chunks:
+                raise UploadSessionError(
+                    f"Chunk {chunk_no} is out of range: a {total_size}-byte upload has at most {max_chunks} chunks"
+                )
+
+            # A retried chunk replaces its earlier copy
+            received = sum(size for other, size in self._list_chunks(upload_id) if other != chunk_no)
+            limit = min(limit, total_size - received)
+
+        # Active before the (possibly long) transfer, so a purge cannot race it
+        self._touch(upload_id)
+
+        chunk_dir = os.path.join(self._session_dir(upload_id), "chunks")
+        final_path = os.path.join(chunk_dir, f"{chunk_no}.part")
+        temp_path = f"{final_path}.{uuid.uuid4().hex}.tmp"
+
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(temp_path, "wb") as target:
+                while True:
+                    block = stream.read(READ_BLOCK_SIZE)
+                    if not block:
+                        break
+                    size += len(block)
+
+                    if size > limit:
+                        if size > self.max_chunk_bytes:
+                            raise UploadSessionError(f"Chunk exceeds {self.max_chunk_bytes} bytes", 413)
+                        raise UploadSessionError(f"Chunk exceeds the declared total_size of {total_size} bytes", 413)
+
+                    digest.update(block)
+                    target.write(block)
+
+            if digest.hexdigest() != checksum.strip().lower():
+                raise UploadSessionError(f"Checksum mismatch for chunk {chunk_no}")
+
+            # Atomic: a chunk is either fully present and verified, or absent
+            os.replace(temp_path, final_path)
+
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+            self._touch(upload_id)
+
+        return {"chunk_no": chunk_no, "size": size, "sha256": digest.hexdigest()}
+
+    def status(self, upload_id: str, user_id: str) -> Dict[str, Any]:
+        manifest = self.get_manifest(upload_id, user_id)
+        chunks = self._list_chunks(upload_id)
+
+        # Offset = bytes covered by the contiguous run of chunks from 0
+        offset = 0
+        next_chunk = 0
+        for chunk_no, size in chunks:
+            if chunk_no != next_chunk:
+                break
+            offset += size
+            next_chunk += 1
+
+        return {
+            "upload_id": upload_id,
+            "filename": manifest["filename"],
+            "total_size": manifest["total_size"],
+            "received_chunks": [chunk_no for chunk_no, _ in chunks],
+            "bytes_received": sum(size for _, size in chunks),
+            "offset": offset,
+            "next_chunk": next_chunk,
+        }
+
+    # -------------------------------------------------------
+    # Finalize
+    # -------------------------------------------------------
+
+    def assemble(self, upload_id: str, user_id: str) -> str:
+        """
+        Concatenate chunks 0..n into one file on disk and return its path.
+        """
+        manifest = self.get_manifest(upload_id, user_id)
+        chunks = self._list_chunks(upload_id)
+
+        if not chunks:
+            raise UploadSessionError("No chunks uploaded")
+
+        missing = [
+            expected for expected, (chunk_no, _) in enumerate(chunks)
+            if expected != chunk_no
+        ]
+        if missing:
+            raise UploadSessionError(f"Missing chunk {missing[0]}")
+
+        total = sum(size for _, size in chunks)
+        if manifest["total_size"] is not None and total != manifest["total_size"]:
+            raise UploadSessionError(
+                f"Received {total} bytes, expected {manifest['total_size']}"
+            )
+
+        self._touch(upload_id)
+
+        session_dir = self._session_dir(upload_id)
+        assembled_path = os.path.join(session_dir, "assembled")
+
+        with open(assembled_path, "wb") as target:
+            for chunk_no, _ in chunks:
+                with open(os.path.join(session_dir, "chunks", f"{chunk_no}.part"), "rb") as part:
+                    shutil.copyfileobj(part, target, READ_BLOCK_SIZE)
+
+        return assembled_path
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+
+    def _session_dir(self, upload_id: str) -> str:
+        if not _UPLOAD_ID.match(upload_id or ""):
+            raise UploadSessionError("Invalid upload id", 404)
+
+        return os.path.join(self.root, upload_id)
+
+    def _touch(self, upload_id: str) -> None:
+        # Chunk writes only change chunks/, so the session directory is marked explicitly
+        os.utime(self._session_dir(upload_id))
+
+    def _list_chunks(self, upload_id: str) -> List[tuple]:
+        chunk_dir = os.path.join(self._session_dir(upload_id), "chunks")
+        chunks = []
+
+        for name in os.listdir(chunk_dir):
+            match = _CHUNK_FILE.match(name)
+            if match:
+                chunks.append((int(match.group(1)), os.path.getsize(os.path.join(chunk_dir, name))))
+
+        return sorted(chunks)
@@ -1,15 +1,31 @@
 import csv
 import json
 import io
-from typing import Dict, Any, List, Union
+import os
+import shutil
+import tempfile
+from typing import Dict, Any, Callable, List, Optional, Union, BinaryIO
 from datetime import datetime
 
 from repository.raw_repo import RawDatasetRepository
-from Ingestion.validators import validate_dataset_schema
+from repository.bulk_loader import BulkLoader
+from Ingestion.validators import (
+    validate_dataset_schema,
+    DatasetValidationError,
+    ErrorBudgetExceeded,
+    StreamingValidator,
+    DEFAULT_ERROR_BUDGET,
+)
+from Ingestion.stream_reader import StreamingRowReader, DEFAULT_BATCH_SIZE
+from Ingestion.file_parsers import detect_file_type, clean_csv_row, clean_json_row
+from Ingestion.columnar_readers import ColumnarReader, COLUMNAR_TYPES
+from Ingestion.schema_inference import TypedRowStream
+from Ingestion.deduplication import UploadDeduplicator, HashingReader, hash_stream
 
 class UserUploadIngestor:
     """
-    Handles ingestion of user-uploaded files (CSV / JSON).
+    Handles ingestion of user-uploaded files (CSV / JSON, and via the
+    streaming entry point Parquet / Arrow IPC / FITS).
 
     Responsibilities:
     - Detect file type
@@ -21,6 +37,7 @@ class UserUploadIngestor:
     def __init__(self, db):
         self.db = db
         self.raw_repo = RawDatasetRepository(db)
+        self.deduplicator = UploadDeduplicator(db)
 
     # -------------------------------------------------------
     # Main entry point
@@ -64,21 +81,224 @@ class UserUploadIngestor:
             "records": len(parsed_data),
         }
 
+    # -------------------------------------------------------
+    # Streaming entry point
+    # -------------------------------------------------------
+
+    def ingest_stream(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        user_id: str,
+        source_id: int,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+        max_errors: Optional[int] = DEFAULT_ERROR_BUDGET,
+    ) -> Dict[str, Any]:
+        """
+        Parse an upload stream row by row and bulk-load it in fixed-size
+        chunks within one transaction, so memory stays bounded by batch_size.
+
+        CSV / JSON rows are validated in the same pass: bad rows are skipped
+        and reported, and the load is aborted (and rolled back) once more
+        than max_errors rows are bad.
+
+        Uploads are content-addressed: bytes the user already ingested for
+        this source are answered with that dataset instead of being stored
+        again.
+
+        progress, if given, is called with the number of rows stored so far.
+        """
+
+        file_type = self._detect_file_type(filename)
+
+        # Seekable streams are hashed up front so duplicates are never parsed
+        content_hash = hash_stream(stream)
+
+        existing = self.deduplicator.find_existing(content_hash, user_id, source_id)
+        if existing:
+            return existing
+
+        if content_hash is None:
+            hashing_stream = HashingReader(stream)
+            result = self._ingest_new(hashing_stream, filename, file_type, user_id, source_id, batch_size, None, progress, max_errors)
+
+            # Recorded after the load, so later repeats of these bytes are caught
+            self.raw_repo.set_content_hash(result["dataset_id"], hashing_stream.hexdigest())
+            return dict(result, content_hash=hashing_stream.hexdigest())
+
+        return self._ingest_new(stream, filename, file_type, user_id, source_id, batch_size, content_hash, progress, max_errors)
+
+    def _ingest_new(self, stream, filename, file_type, user_id, source_id, batch_size, content_hash, progress, max_errors=DEFAULT_ERROR_BUDGET) -> Dict[str, Any]:
+
+        if file_type in COLUMNAR_TYPES:
+            return self._ingest_columnar(stream, filename, file_type, user_id, source_id, batch_size, content_hash, progress)
+
+        validator = StreamingValidator(StreamingRowReader(stream, file_type), max_errors)
+
+        clean_row = self._clean_csv_row if file_type == "CSV" else self._clean_json_row
+
+        def cleaned_rows():
+            count = 0
+
+            for row in validator:
+                cleaned = clean_row(row)
+                if cleaned:
+                    count += 1
+                    yield cleaned
+
+            # Raised inside the load so the whole transaction rolls back
+            if count == 0:
+                raise DatasetValidationError(f"{file_type} dataset is empty")
+
+        return self._bulk_load(
+            cleaned_rows(), filename, file_type, user_id, source_id, batch_size, content_hash, progress,
+            validation=validator.report,
+        )
+
+    # -------------------------------------------------------
+    # Validation only
+    # -------------------------------------------------------
+
+    def validate_stream(self, stream: BinaryIO, filename: str, max_errors: Optional[int] = DEFAULT_ERROR_BUDGET) -> Dict[str, Any]:
+        """
+        Run streaming validation over a CSV / JSON upload without storing it.
+        Returns the validation report; it is marked aborted when the error
+        budget ran out.
+        """
+
+        file_type = self._detect_file_type(filename)
+
+        if file_type not in ("CSV", "JSON"):
+            raise DatasetValidationError("Streaming validation supports CSV and JSON uploads")
+
+        validator = StreamingValidator(StreamingRowReader(stream, file_type), max_errors)
+
+        try:
+            for _ in validator:
+                pass
+
+        except ErrorBudgetExceeded as e:
+            return dict(e.report, status="error", error=str(e))
+
+        return dict(validator.report, status="success")
+
+    # -------------------------------------------------------
+    # Columnar formats (Parquet / Arrow IPC / FITS)
+    # -------------------------------------------------------
+
+    def _ingest_columnar(
+        self,
+        stream: BinaryIO,
+        filename: str,
+        file_type: str,
+        user_id: str,
+        source_id: int,
+        batch_size: int,
+        content_hash: Optional[str],
+        progress: Optional[Callable[[int], None]],
+    ) -> Dict[str, Any]:
+        """
+        Columnar readers memory-map a file, so the upload is spooled to disk
+        first unless the stream is already backed by a file on disk.
+        """
+
+        path = getattr(stream, "name", None)
+
+        if isinstance(path, str) and os.path.isfile(path):
+            return self._load_columnar(path, filename, file_type, user_id, source_id, batch_size, content_hash, progress)
+
+        spool_dir = tempfile.mkdtemp(prefix="nexus_columnar_")
+
+        try:
+            path = os.path.join(spool_dir, "upload")
+
+            with open(path, "wb") as target:
+                shutil.copyfileobj(stream, target, 1024 * 1024)
+
+            return self._load_columnar(path, filename, file_type, user_id, source_id, batch_size, content_hash, progress)
+
+        finally:
+            shutil.rmtree(spool_dir, ignore_errors=True)
+
+    def _load_columnar(self, path, filename, file_type, user_id, source_id, batch_size, content_hash, progress) -> Dict[str, Any]:
+
+        reader = ColumnarReader(path, file_type, batch_size=batch_size)
+
+        def typed_rows():
+            count = 0
+
+            for row in reader:
+                count += 1
+                yield row
+
+            if count == 0:
+                raise DatasetValidationError(f"{file_type} dataset is empty")
+
+        return self._bulk_load(typed_rows(), filename, file_type, user_id, source_id, batch_size, content_hash, progress)
+
+    def _bulk_load(self, rows, filename, file_type, user_id, source_id, batch_size, content_hash, progress=None, validation=None) -> Dict[str, Any]:
+
+        # Infer column types from the head of the upload and store typed values
+        typed_rows = TypedRowStream(rows)
+
+        metadata = {
+            "filename": filename,
+            "file_type": file_type,
+            "uploaded_at": datetime.utcnow().isoformat(),
+            "storage_layout": "chunked",
+            "schema": typed_rows.schema,
+        }
+
+        # Filled in while the rows stream; complete by the time metadata is written
+        if validation is not None:
+            metadata["validation"] = validation
+
+        stats = BulkLoader(self.db, chunk_size=batch_size, progress=progress).load_raw_dataset(
+            user_id=user_id,
+            source_id=source_id,
+            rows=typed_rows,
+            metadata=metadata,
+            content_hash=content_hash,
+        )
+
+        result = {
+            "status": "success",
+            "dataset_id": stats["dataset_id"],
+            "records": stats["rows"],
+            "deduplicated": False,
+            "content_hash": content_hash,
+            "load": {
+                "method": stats["method"],
+                "seconds": stats["seconds"],
+                "rows_per_sec": stats["rows_per_sec"],
+            },
+        }
+
+        if validation is not None:
+            result["validation"] = validation
+
+        return result
+
     # -------------------------------------------------------
     # File type detection
     # -------------------------------------------------------
 
     def _detect_file_type(self, filename: str) -> str:
 
-        filename = filename.lower()
+        return detect_file_type(filename)
+
+    # -------------------------------------------------------
+    # Row cleaning
+    # -------------------------------------------------------
+
+    def _clean_csv_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
 
-        if filename.endswith(".csv"):
-            return "CSV"
+        return clean_csv_row(row)
 
-        if filename.endswith(".json"):
-            return "JSON"
+    def _clean_json_row(self, item: Dict[str, Any]) -> Dict[str, Any]:
 
-        raise ValueError("File must be CSV or JSON")
+        return clean_json_row(item)
 
     # -------------------------------------------------------
     # CSV Parsing
@@ -92,19 +312,7 @@ class UserUploadIngestor:
 
         for row in reader:
 
-            cleaned_row = {}
-
-            for key, value in row.items():
-
-                if key is None:
-                    continue
-
-                clean_key = key.strip().lower().replace(" ", "_")
-
-                if value is None or value == "":
-                    continue
-
-                cleaned_row[clean_key] = value.strip()
+            cleaned_row = self._clean_csv_row(row)
 
             if cleaned_row:
                 rows.append(cleaned_row)
@@ -137,16 +345,7 @@ class UserUploadIngestor:
             if not isinstance(item, dict):
                 continue
 
-            cleaned = {}
-
-            for key, value in item.items():
-
-                clean_key = key.strip().lower().replace(" ", "_")
-
-                if value is None or value == "":
-                    continue
-
-                cleaned[clean_key] = value
+            cleaned = self._clean_json_row(item)
 
             if cleaned:
                 cleaned_rows.append(cleaned)
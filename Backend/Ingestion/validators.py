@@ -1,6 +1,16 @@
 import csv
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+
+
+# Bad rows tolerated by streaming validation before the upload is aborted
+DEFAULT_ERROR_BUDGET = 1000
+
+# Row errors kept (with offsets) in a validation report
+MAX_REPORTED_ERRORS = 50
+
+# Distinct column sets tracked for the column-consistency report
+MAX_TRACKED_SHAPES = 100
 
 
 class DatasetValidationError(Exception):
@@ -10,6 +20,17 @@ class DatasetValidationError(Exception):
     pass
 
 
+class ErrorBudgetExceeded(DatasetValidationError):
+    """
+    Raised when a streamed dataset has more bad rows than its error budget.
+    The validation report up to that point is attached.
+    """
+
+    def __init__(self, message: str, report: Dict[str, Any]):
+        super().__init__(message)
+        self.report = report
+
+
 class DatasetValidator:
     """
     Flexible validator for CSV and JSON datasets.
@@ -68,6 +89,133 @@ class DatasetValidator:
             raise DatasetValidationError(f"JSON validation failed: {str(e)}")
 
 
+class StreamingValidator:
+    """
+    Validates rows while a StreamingRowReader parses them, in the same pass.
+
+    Bad rows (CSV rows whose cell count differs from the header, JSON
+    elements that are not objects) are skipped and recorded with their line
+    and byte offset. Once more than max_errors rows are bad the parse is
+    aborted with ErrorBudgetExceeded, so a malformed file is rejected after
+    reading only as far as its first max_errors + 1 bad rows.
+    max_errors=None never aborts.
+
+    self.report is updated as rows stream past and completed when the
+    reader is exhausted: row counts, the columns seen and how consistently
+    rows carry them.
+    """
+
+    def __init__(self, reader, max_errors: Optional[int] = DEFAULT_ERROR_BUDGET):
+        self.reader = reader
+        self.max_errors = max_errors
+
+        self._shapes: Dict[tuple, int] = {}
+        self._untracked_rows = 0
+
+        self.report: Dict[str, Any] = {
+            "file_type": reader.file_type,
+            "rows_read": 0,
+            "valid_rows": 0,
+            "invalid_rows": 0,
+            "error_budget": max_errors,
+            "aborted": False,
+            "errors": [],
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        report = self.report
+        shapes = self._shapes
+        csv_mode = self.reader.file_type == "CSV"
+
+        self.reader.on_invalid = self._invalid_element
+
+        for row in self.reader:
+            report["rows_read"] += 1
+
+            if csv_mode:
+                fieldnames = self.reader.fieldnames
+
+                # DictReader files surplus cells under None and pads short rows with None
+                if None in row:
+                    self._invalid(f"Row has {len(fieldnames) + len(row[None])} cells, header has {len(fieldnames)}")
+                    continue
+
+                if fieldnames and row[fieldnames[-1]] is None:
+                    cells = sum(1 for value in row.values() if value is not None)
+                    self._invalid(f"Row has {cells} cells, header has {len(fieldnames)}")
+                    continue
+
+            elif not row:
+                self._invalid("Row is an empty object")
+                continue
+
+            keys = tuple(row)
+
+            if keys in shapes:
+                shapes[keys] += 1
+            elif len(shapes) < MAX_TRACKED_SHAPES:
+                shapes[keys] = 1
+            else:
+                self._untracked_rows += 1
+
+            report["valid_rows"] += 1
+            yield row
+
+        self._finish()
+
+    def _invalid_element(self, message: str) -> None:
+        # JSON elements that are not objects are reported by the reader itself
+        self.report["rows_read"] += 1
+        self._invalid(message)
+
+    def _invalid(self, message: str) -> None:
+        report = self.report
+        report["invalid_rows"] += 1
+
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            line, offset = self.reader.location()
+            report["errors"].append({
+                "row": report["rows_read"] - 1,
+                "line": line,
+                "byte_offset": offset,
+                "message": message,
+            })
+
+        if self.max_errors is not None and report["invalid_rows"] > self.max_errors:
+            report["aborted"] = True
+            self._finish()
+
+            first = report["errors"][0]
+            raise ErrorBudgetExceeded(
+                f"Validation aborted after {report['invalid_rows']} bad rows "
+                f"(error budget {self.max_errors}); first at line {first['line']}, "
+                f"byte {first['byte_offset']}: {first['message']}",
+                report,
+            )
+
+    def _finish(self) -> None:
+        """
+        Fill in the column report from the row shapes counted so far.
+        """
+        presence: Dict[str, int] = {}
+
+        for keys, rows in self._shapes.items():
+            for key in keys:
+                presence[key] = presence.get(key, 0) + rows
+
+        valid_rows = self.report["valid_rows"]
+
+        self.report["columns"] = list(presence)
+        self.report["column_consistency"] = {
+            "consistent": len(self._shapes) <= 1 and not self._untracked_rows,
+            "distinct_column_sets": len(self._shapes),
+            "untracked_rows": self._untracked_rows,
+            "partial_columns": {
+                key: rows for key, rows in presence.items() if rows < valid_rows
+            },
+        }
+
+
 def validate_dataset_schema(file_content: str, file_type: str):
     """
     Entry point for dataset validation.
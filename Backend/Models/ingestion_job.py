@@ -0,0 +1,82 @@
+import uuid
+from datetime import datetime
+from app.extionsions import db
+
+
+class IngestionJob(db.Model):
+    """
+    A background ingestion run (upload or external API import).
+
+    status: queued -> running -> succeeded | failed
+    """
+
+    __tablename__ = "ingestion_jobs"
+
+    id = db.Column(
+        db.UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    user_id = db.Column(
+        db.String(100),
+        nullable=False,
+        index=True
+    )
+
+    # "upload" or "api"
+    kind = db.Column(
+        db.String(20),
+        nullable=False
+    )
+
+    status = db.Column(
+        db.String(20),
+        nullable=False,
+        default="queued"
+    )
+
+    # Submitted parameters (filenames, source_id, query, ...)
+    params = db.Column(
+        db.JSON,
+        nullable=True
+    )
+
+    rows_processed = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+
+    result = db.Column(
+        db.JSON,
+        nullable=True
+    )
+
+    error = db.Column(
+        db.Text,
+        nullable=True
+    )
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    started_at = db.Column(db.DateTime, nullable=True)
+
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "job_id": str(self.id),
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "rows_processed": self.rows_processed,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __repr__(self):
+        return f"<IngestionJob(id={self.id}, kind={self.kind}, status={self.status})>"
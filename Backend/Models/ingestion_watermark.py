@@ -0,0 +1,48 @@
+from datetime import datetime
+from app.extionsions import db
+
+
+class IngestionWatermark(db.Model):
+    """
+    High-water mark of an external API query, so refreshes fetch only
+    items newer than the last import and append them to the same dataset.
+    """
+
+    __tablename__ = "ingestion_watermarks"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    user_id = db.Column(db.String(100), nullable=False)
+
+    source_id = db.Column(db.Integer, nullable=False)
+
+    query = db.Column(db.Text, nullable=False)
+
+    # Dataset that refreshes append to
+    raw_dataset_id = db.Column(
+        db.Integer,
+        db.ForeignKey("raw_datasets.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Newest item marker seen so far (e.g. date_created, ISO-8601 UTC)
+    high_water = db.Column(db.String(64), nullable=True)
+
+    # Ids of the items exactly at high_water, to skip them on the next refresh
+    boundary_ids = db.Column(db.JSON, nullable=True)
+
+    refresh_count = db.Column(db.Integer, nullable=False, default=0)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "source_id", "query", name="uq_watermark_query"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<IngestionWatermark(source_id={self.source_id}, query={self.query!r}, "
+            f"high_water={self.high_water})>"
+        )
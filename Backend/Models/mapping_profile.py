@@ -0,0 +1,46 @@
+from datetime import datetime
+from app.extionsions import db
+
+
+class MappingProfile(db.Model):
+    """
+    Raw -> canonical field mappings of one source, layered over
+    SchemaMapper.FIELD_MAP. A profile with a user_id applies to that user's
+    datasets only and takes precedence over the source-wide profile.
+    """
+
+    __tablename__ = "mapping_profiles"
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    source_id = db.Column(db.Integer, nullable=False, index=True)
+
+    # NULL: applies to every user of the source
+    user_id = db.Column(db.String(100), nullable=True)
+
+    # {raw field name: canonical field name}
+    field_map = db.Column(db.JSON, nullable=False)
+
+    revision = db.Column(db.Integer, nullable=False, default=1)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.UniqueConstraint("source_id", "user_id", name="uq_mapping_profile_scope"),
+    )
+
+    def to_dict(self):
+        return {
+            "source_id": self.source_id,
+            "user_id": self.user_id,
+            "scope": "user" if self.user_id else "source",
+            "field_map": self.field_map,
+            "revision": self.revision,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<MappingProfile(source_id={self.source_id}, user_id={self.user_id}, revision={self.revision})>"
@@ -23,11 +23,39 @@ class NormalizedDataset(db.Model):
         nullable=False
     )
 
+    # "inline" rows live in standardized_payload; "chunked" rows live in
+    # normalized_dataset_chunks
+    storage_layout = db.Column(
+        db.String(20),
+        nullable=False,
+        default="inline"
+    )
+
+    row_count = db.Column(
+        db.Integer,
+        nullable=True
+    )
+
     normalization_version = db.Column(
         db.String(20),
         nullable=True
     )
 
+    # chunks_digest of the raw chunk checksums the rows were built from;
+    # with normalization_version and mapping_hash, the key for reusing a
+    # normalization
+    input_hash = db.Column(
+        db.String(64),
+        nullable=True,
+        index=True
+    )
+
+    # mapping_digest of the mapping profile used (NULL: built-in mapping)
+    mapping_hash = db.Column(
+        db.String(64),
+        nullable=True
+    )
+
     normalized_at = db.Column(
         db.TIMESTAMP,
         server_default=db.func.now()
@@ -0,0 +1,54 @@
+from app.extionsions import db
+
+
+class NormalizedDatasetChunk(db.Model):
+    """
+    A fixed-size batch of normalized rows belonging to a normalized dataset.
+    """
+
+    __tablename__ = "normalized_dataset_chunks"
+
+    normalized_dataset_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("normalized_datasets.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    chunk_no = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+
+    row_count = db.Column(
+        db.Integer,
+        nullable=False
+    )
+
+    rows = db.Column(
+        db.JSON,
+        nullable=False
+    )
+
+    checksum = db.Column(
+        db.String(64),
+        nullable=True
+    )
+
+    # Checksum of the raw chunk with the same chunk_no these rows came from
+    # (NULL for datasets not chunked along their raw dataset)
+    source_checksum = db.Column(
+        db.String(64),
+        nullable=True
+    )
+
+    # Fingerprint of the raw row behind each normalized row, in row order
+    fingerprints = db.Column(
+        db.JSON,
+        nullable=True
+    )
+
+    def __repr__(self):
+        return (
+            f"<NormalizedDatasetChunk(normalized_dataset_id={self.normalized_dataset_id}, "
+            f"chunk_no={self.chunk_no}, rows={self.row_count})>"
+        )
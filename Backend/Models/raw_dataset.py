@@ -13,6 +13,17 @@ class RawDataset(db.Model):
 
     data = db.Column(db.JSON, nullable=False)
 
+    # "inline" rows live in `data`; "chunked" rows live in raw_dataset_chunks
+    storage_layout = db.Column(db.String(20), nullable=False, default="inline")
+
+    row_count = db.Column(db.Integer, nullable=True)
+
+    # sha256 of the uploaded bytes; cleared when rows are edited or appended
+    content_hash = db.Column(db.String(64), nullable=True, index=True)
+
+    # Repeat uploads of the same bytes answered with this dataset
+    dedup_hits = db.Column(db.Integer, nullable=False, default=0)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    updated_at = db.Column(db.DateTime, nullable=True)
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,42 @@
+from app.extionsions import db
+
+
+class RawDatasetChunk(db.Model):
+    """
+    A fixed-size batch of rows belonging to a chunked raw dataset.
+    """
+
+    __tablename__ = "raw_dataset_chunks"
+
+    raw_dataset_id = db.Column(
+        db.Integer,
+        db.ForeignKey("raw_datasets.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    chunk_no = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+
+    row_count = db.Column(
+        db.Integer,
+        nullable=False
+    )
+
+    rows = db.Column(
+        db.JSON,
+        nullable=False
+    )
+
+    # sha256 of the chunk's rows, used to skip rewriting unchanged chunks
+    checksum = db.Column(
+        db.String(64),
+        nullable=True
+    )
+
+    def __repr__(self):
+        return (
+            f"<RawDatasetChunk(raw_dataset_id={self.raw_dataset_id}, "
+            f"chunk_no={self.chunk_no}, rows={self.row_count})>"
+        )
@@ -0,0 +1,337 @@
+from itertools import repeat
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+
+from Normalization_Engine.coordinate_converter import (
+    COORDINATE_FIELDS,
+    COORDINATE_FLAGS_FIELD,
+    HOUR_ANGLE_FIELDS,
+    SOURCE_COORDINATES,
+    CoordinateConverter,
+)
+from Normalization_Engine.schema_mapper import SchemaMapper
+from Normalization_Engine.unit_converter import UnitConverter
+
+
+# Fields written by the unit stage
+_UNIT_FIELDS = {"value", "unit"}
+
+
+class ColumnarNormalizer:
+    """
+    Column-at-a-time equivalent of the per-record path
+    (SchemaMapper -> UnitConverter -> CoordinateConverter -> core fields).
+
+    - Key cleaning / mapping is resolved once per distinct raw key of the
+      batch, then each needed output column is gathered in one pass.
+    - Unit conversion runs as one NumPy operation per source unit, using
+      the registry's cached (scale, offset) factors.
+    - Coordinates are converted as whole columns, one frame transform per
+      input frame.
+    - Stages whose outputs are not kept are skipped.
+
+    Output rows are equal to the per-record path's, record for record.
+    """
+
+    def __init__(
+        self,
+        core_fields: Iterable[str],
+        schema_mapper: Optional[SchemaMapper] = None,
+        coordinate_converter: Optional[CoordinateConverter] = None,
+    ):
+        self.core_fields = list(core_fields)
+        self.schema_mapper = schema_mapper or SchemaMapper()
+        self.coordinate_converter = coordinate_converter or CoordinateConverter()
+
+        # Canonical keys always exist after mapping (None when absent)
+        self._canonical: Set[str] = set(SchemaMapper.CANONICAL_SCHEMA)
+
+        wanted = set(self.core_fields)
+        self._convert_unit_fields = bool(wanted & _UNIT_FIELDS)
+        self._convert_coordinate_fields = bool(wanted & COORDINATE_FIELDS)
+
+        # Mapped columns the stages read, gathered up front by gather()
+        read = [name for name in self.core_fields if name not in COORDINATE_FIELDS]
+        if self._convert_coordinate_fields:
+            read += [key for lon_key, lat_key, _ in SOURCE_COORDINATES for key in (lon_key, lat_key)]
+        self._read_fields = list(dict.fromkeys(read))
+
+    def normalize(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        batch = self.gather(records)
+        self.convert_units(batch)
+        self.convert_coordinates(batch)
+        return self.project(batch)
+
+    # -------------------------------------------------------
+    # STAGES (gather -> units -> coordinates -> project)
+    # -------------------------------------------------------
+
+    def gather(self, records: List[Dict[str, Any]]) -> "ColumnBatch":
+        """
+        Mapping stage: map raw keys and gather every column later stages read.
+        """
+
+        # The per-record path drops anything that is not a record
+        records = [record for record in records if isinstance(record, dict)]
+        columns = _ColumnGatherer(records, self.schema_mapper)
+
+        if records:
+            for name in self._read_fields:
+                columns.get(name)
+
+        return ColumnBatch(columns)
+
+    def convert_units(self, batch: "ColumnBatch") -> "ColumnBatch":
+        if self._convert_unit_fields and batch.count:
+            columns = batch.columns
+            batch.output["value"], batch.output["unit"] = self._convert_units(columns.get("value"), columns.get("unit"))
+        return batch
+
+    def convert_coordinates(self, batch: "ColumnBatch") -> "ColumnBatch":
+        if self._convert_coordinate_fields and batch.count:
+            batch.output.update(self._convert_coordinates(batch.columns))
+        return batch
+
+    def project(self, batch: "ColumnBatch") -> List[Dict[str, Any]]:
+        """
+        Projection stage: build the output rows from the core-field columns.
+        """
+
+        columns, output = batch.columns, batch.output
+
+        if not batch.count:
+            return []
+
+        names, cols, sparse = [], [], []
+
+        for name in self.core_fields:
+            column = output[name] if name in output else columns.get(name)
+
+            # Canonical keys are always present, even when None
+            always = name in self._canonical
+
+            if column is None:
+                if not always:
+                    continue
+                column = [None] * columns.count
+
+            elif not always and None in column:
+                sparse.append((name, column))
+
+            names.append(name)
+            cols.append(column)
+
+        if not names:
+            return [{} for _ in range(batch.count)]
+
+        # Build every row in C (dict over zip), then drop the missing cells
+        rows = list(map(dict, map(zip, repeat(names), zip(*cols))))
+
+        for name, column in sparse:
+            for row, value in zip(rows, column):
+                if value is None:
+                    del row[name]
+
+        return rows
+
+    # -------------------------------------------------------
+    # UNITS
+    # -------------------------------------------------------
+
+    def _convert_units(self, values: Optional[List[Any]], units: Optional[List[Any]]):
+        if values is None or units is None:
+            return values, units
+
+        values, units = list(values), list(units)
+        registry = UnitConverter.registry
+
+        # Row indices per source unit with a value to convert
+        groups: Dict[str, List[int]] = {}
+        for index, (value, unit) in enumerate(zip(values, units)):
+            if value is None or unit is None:
+                continue
+
+            unit = unit if type(unit) is str else str(unit)
+            groups.setdefault(unit, []).append(index)
+
+        for unit, indices in groups.items():
+            target = registry.standard_unit(unit)
+
+            if target is None:
+                continue
+
+            conversion = registry.conversion(unit, target)
+
+            numbers, converted_indices = _to_float_array([values[i] for i in indices], indices)
+
+            if not converted_indices:
+                continue
+
+            for index, converted in zip(converted_indices, conversion.apply(numbers).tolist()):
+                values[index] = converted
+                units[index] = target
+
+        return values, units
+
+    # -------------------------------------------------------
+    # COORDINATES
+    # -------------------------------------------------------
+
+    def _convert_coordinates(self, columns: "_ColumnGatherer") -> Dict[str, List[Any]]:
+        count = columns.count
+        output: Dict[str, List[Any]] = {name: [None] * count for name in COORDINATE_FIELDS}
+
+        flags = output[COORDINATE_FLAGS_FIELD]
+        parser = self.coordinate_converter.parser
+
+        # Rows still without coordinates; each takes the first complete input pair
+        pending = np.ones(count, dtype=bool)
+
+        for lon_key, lat_key, frame in SOURCE_COORDINATES:
+            lon_column, lat_column = columns.get(lon_key), columns.get(lat_key)
+
+            if lon_column is None and lat_column is None:
+                continue
+
+            lon, lon_given = _parse_coordinates(parser, lon_column, count, lon_key in HOUR_ANGLE_FIELDS, lon_key)
+            lat, lat_given = _parse_coordinates(parser, lat_column, count, False, lat_key)
+
+            # Given but unusable (NaN compares False)
+            lon_bad = pending & lon_given & ~np.isfinite(lon)
+            lat_bad = pending & lat_given & ~(np.abs(lat) <= 90.0)
+
+            for key, bad in ((lon_key, lon_bad), (lat_key, lat_bad)):
+                for index in np.flatnonzero(bad).tolist():
+                    flags[index] = key if flags[index] is None else flags[index] + "," + key
+
+            rows = pending & np.isfinite(lon) & (np.abs(lat) <= 90.0)
+
+            if not rows.any():
+                continue
+
+            pending &= ~rows
+            indices = np.flatnonzero(rows).tolist()
+
+            converted = self.coordinate_converter.convert_arrays(lon[rows], lat[rows], frame)
+
+            for name, values in converted.items():
+                column = output[name]
+                for index, value in zip(indices, values):
+                    column[index] = value
+
+            if not pending.any():
+                break
+
+        return output
+
+
+class ColumnBatch:
+    """
+    One batch between stages: its gathered columns and the columns the
+    conversion stages produced.
+    """
+
+    def __init__(self, columns: "_ColumnGatherer"):
+        self.columns = columns
+        self.output: Dict[str, List[Any]] = {}
+
+    @property
+    def count(self) -> int:
+        return self.columns.count
+
+
+class _ColumnGatherer:
+    """
+    Lazily gathers mapped columns from row dicts; None marks a missing or
+    empty cell. Raw keys are mapped through the SchemaMapper's cleaner once.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], schema_mapper: SchemaMapper):
+        self.records = records
+        self.count = len(records)
+
+        keys: Set[Any] = set().union(*records)
+
+        self._sources: Dict[str, List[Any]] = {}
+        for source, target in schema_mapper.row_cleaner.plan(keys):
+            self._sources.setdefault(target, []).append(source)
+
+        self._cache: Dict[str, Optional[List[Any]]] = {}
+
+    def get(self, name: str) -> Optional[List[Any]]:
+        """
+        Column of mapped field name, or None when no record has it.
+        """
+        if name not in self._cache:
+            self._cache[name] = self._gather(name)
+        return self._cache[name]
+
+    def _gather(self, name: str) -> Optional[List[Any]]:
+        sources = self._sources.get(name)
+
+        if not sources:
+            return None
+
+        if len(sources) == 1:
+            source = sources[0]
+            column = [record.get(source) for record in self.records]
+
+            if "" in column:
+                column = [None if value == "" else value for value in column]
+
+            return column
+
+        # Several raw keys map here: as in the row path, the last non-empty one in row order wins
+        wanted = set(sources)
+        column = []
+
+        for record in self.records:
+            found = None
+            for key, value in record.items():
+                if key in wanted and value is not None and value != "":
+                    found = value
+            column.append(found)
+
+        return column
+
+
+# -------------------------------------------------------
+# Helpers
+# -------------------------------------------------------
+
+def _to_float_array(values: List[Any], indices: List[int]):
+    """
+    float() of each value as an array, plus the indices that converted;
+    values float() rejects are left out (the row path leaves them as is).
+    """
+
+    try:
+        array = np.array(values, dtype=np.float64)
+        if array.shape == (len(values),):
+            return array, indices
+    except Exception:
+        pass
+
+    numbers, kept = [], []
+
+    for value, index in zip(values, indices):
+        try:
+            numbers.append(float(value))
+            kept.append(index)
+        except Exception:
+            continue
+
+    return np.array(numbers, dtype=np.float64), kept
+
+
+def _parse_coordinates(parser, column: Optional[List[Any]], count: int, hours: bool, key: str):
+    """
+    (degrees, given) arrays of a coordinate column; an absent column is
+    all NaN and not given.
+    """
+
+    if column is None:
+        return np.full(count, np.nan), np.zeros(count, dtype=bool)
+
+    return parser.parse_column(column, hours, key)
@@ -1,62 +1,115 @@
-from typing import Dict, Any
 import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from Normalization_Engine.coordinate_parser import CoordinateParser
+from Normalization_Engine.frames import ECLIPTIC, EQUATORIAL, FRAMES, GALACTIC, transform_many
+
+
+# Input (longitude, latitude, frame) key pairs, in order of preference
+SOURCE_COORDINATES = (
+    ("ra", "dec", EQUATORIAL),
+    ("l", "b", GALACTIC),
+    ("glon", "glat", GALACTIC),
+    ("elon", "elat", ECLIPTIC),
+    ("longitude", "latitude", EQUATORIAL),
+)
+
+# Output (longitude, latitude) fields per frame
+FRAME_FIELDS = {
+    EQUATORIAL: ("ra_deg", "dec_deg"),
+    GALACTIC: ("gal_l", "gal_b"),
+    ECLIPTIC: ("ecl_lon", "ecl_lat"),
+}
+
+# Input keys whose unitless sexagesimal values are hours
+HOUR_ANGLE_FIELDS = frozenset({"ra"})
+
+# Comma-separated input keys holding values that could not be used
+COORDINATE_FLAGS_FIELD = "coordinate_flags"
+
+COORDINATE_FIELDS = frozenset(
+    [name for pair in FRAME_FIELDS.values() for name in pair] + [COORDINATE_FLAGS_FIELD]
+)
 
 
 class CoordinateConverter:
     """
     Converts spatial coordinates into a unified reference system.
 
-    Supported inputs:
-    - Latitude / Longitude
+    Supported inputs (first complete pair wins), as numbers, decimal or
+    sexagesimal strings:
     - Right Ascension (RA) / Declination (Dec)
+    - Galactic l / b (or glon / glat)
+    - Ecliptic elon / elat
+    - Longitude / Latitude, taken as equatorial
 
     Output format:
-    - Normalized equatorial coordinates (ra_deg, dec_deg)
+    - Equatorial J2000 (ra_deg, dec_deg), galactic (gal_l, gal_b) and
+      ecliptic J2000 (ecl_lon, ecl_lat), in degrees. Records without
+      usable coordinates get none of these fields.
+    - coordinate_flags: input keys whose values could not be parsed or
+      are out of range, instead of silently zeroing them.
+
+    equinox: Julian epoch equatorial inputs refer to (None: J2000).
     """
 
+    def __init__(self, equinox: Optional[float] = None):
+        self.equinox = equinox
+        self.parser = CoordinateParser()
+
     def convert_coordinates(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """
         Detect coordinate format and normalize it.
         """
 
-        # Case 1: Already RA / Dec
-        if "ra" in record and "dec" in record:
-            record["ra_deg"] = self._to_float(record["ra"])
-            record["dec_deg"] = self._to_float(record["dec"])
-            return record
+        flags = []
+
+        for lon_key, lat_key, frame in SOURCE_COORDINATES:
+            lon = self.parser.parse_value(record.get(lon_key), lon_key in HOUR_ANGLE_FIELDS, lon_key)
+            lat = self.parser.parse_value(record.get(lat_key), False, lat_key)
+
+            # Given but unusable (NaN compares False)
+            lon_bad = lon is not None and not math.isfinite(lon)
+            lat_bad = lat is not None and not abs(lat) <= 90.0
 
-        # Case 2: Latitude / Longitude
-        if "latitude" in record and "longitude" in record:
-            ra, dec = self._latlon_to_equatorial(
-                record["latitude"],
-                record["longitude"]
-            )
+            if lon_bad:
+                flags.append(lon_key)
+            if lat_bad:
+                flags.append(lat_key)
 
-            record["ra_deg"] = ra
-            record["dec_deg"] = dec
+            if lon is None or lat is None or lon_bad or lat_bad:
+                continue
+
+            converted = self.convert_arrays(np.array([lon]), np.array([lat]), frame)
+            record.update((name, column[0]) for name, column in converted.items())
+            break
+
+        if flags:
+            record[COORDINATE_FLAGS_FIELD] = ",".join(flags)
 
         return record
 
-    def _latlon_to_equatorial(self, lat: Any, lon: Any):
+    def convert_arrays(self, lon: np.ndarray, lat: np.ndarray, frame: str) -> Dict[str, list]:
         """
-        Convert lat/lon to equatorial approximation.
+        Every output field for arrays of coordinates given in frame.
         """
 
-        lat = self._to_float(lat)
-        lon = self._to_float(lon)
+        # The source frame's own fields keep the input values as given
+        keep_input = frame != EQUATORIAL or self.equinox is None
+        targets = [target for target in FRAMES if target != frame or not keep_input]
 
-        # simple placeholder conversion
-        ra = (lon % 360)
-        dec = lat
+        output = {}
 
-        return ra, dec
+        for target, (out_lon, out_lat) in transform_many(lon, lat, frame, targets, self.equinox).items():
+            lon_field, lat_field = FRAME_FIELDS[target]
+            output[lon_field] = out_lon.tolist()
+            output[lat_field] = out_lat.tolist()
 
-    def _to_float(self, value: Any) -> float:
-        """
-        Safely convert value to float.
-        """
+        if keep_input:
+            lon_field, lat_field = FRAME_FIELDS[frame]
+            output[lon_field] = np.mod(lon, 360.0).tolist()
+            output[lat_field] = lat.tolist()
 
-        try:
-            return float(value)
-        except Exception:
-            return 0.0
\ No newline at end of file
+        return output
@@ -0,0 +1,205 @@
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+import numpy as np
+
+
+# Columns whose format is remembered before the cache is reset
+MAX_CACHED_COLUMNS = 256
+
+_NUMBER = r"(\d+(?:\.\d*)?|\.\d+)"
+
+# name -> (pattern, unit); unit None means hours for RA columns, degrees otherwise
+PATTERNS: Dict[str, Tuple[Pattern, Optional[str]]] = {
+    # 12h34m56.7s, 12h34.5m, 12.5h
+    "hms": (re.compile(
+        rf"([+-]?)\s*{_NUMBER}\s*h(?:\s*{_NUMBER}\s*m(?:\s*{_NUMBER}\s*s?)?)?",
+        re.IGNORECASE,
+    ), "hours"),
+    # +12d34m56s, 12°34′56″, -12deg 34' 56", 12.5d
+    "dms": (re.compile(
+        rf"([+-]?)\s*{_NUMBER}\s*(?:deg|d|°)(?:\s*{_NUMBER}\s*(?:m|'|′)(?:\s*{_NUMBER}\s*(?:s|\"|″|'')?)?)?",
+        re.IGNORECASE,
+    ), "degrees"),
+    # +12:34:56.7, 12:34
+    "colon": (re.compile(rf"([+-]?)\s*{_NUMBER}:{_NUMBER}(?::{_NUMBER})?"), None),
+    # 12 34 56.7, -12 34
+    "space": (re.compile(rf"([+-]?){_NUMBER}\s+{_NUMBER}(?:\s+{_NUMBER})?"), None),
+}
+
+# Every format, in default trial order
+FORMATS = ["decimal", *PATTERNS]
+
+# Trial order once a column's format is known
+_TRIAL_ORDER = {name: [name] + [other for other in FORMATS if other != name] for name in FORMATS}
+
+# Unicode minus signs seen in catalog exports
+_MINUS = str.maketrans({"−": "-", "–": "-"})
+_MINUS_SIGNS = ("−", "–")
+
+
+class CoordinateParser:
+    """
+    Parses coordinate values given as numbers, decimal strings or
+    sexagesimal strings (h/m/s, d/m/s, colon or space separated).
+
+    Sexagesimal values without an explicit unit are hours in RA columns
+    and degrees elsewhere. The format found in a column is remembered and
+    tried first for its other values; mixed columns still parse value by
+    value. Values that cannot be parsed come back as NaN so callers can
+    flag them; missing values are None (or NaN and not present in
+    parse_column).
+    """
+
+    def __init__(self):
+        self._formats: Dict[Tuple[Any, bool], str] = {}
+
+    def parse_value(self, value: Any, hours: bool = False, column: Any = None) -> Optional[float]:
+        """
+        Degrees for one value; None when missing, NaN when unparseable.
+        """
+
+        if type(value) is float:
+            return value
+        if value is None:
+            return None
+
+        if isinstance(value, str):
+            text = value.strip()
+            if not text:
+                return None
+
+            parts = self._parse_text(text, hours, column)
+            if parts is None:
+                return float("nan")
+
+            sign, d, m, s, scale = parts
+            return sign * (d + m / 60.0 + s / 3600.0) * scale
+
+        try:
+            return float(value)
+        except Exception:
+            return float("nan")
+
+    def parse_column(self, values: List[Any], hours: bool = False, column: Any = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (degrees, present) arrays for a column: missing values are NaN and
+        not present, unparseable ones are NaN and present.
+        """
+
+        count = len(values)
+
+        # Vectorized pass: numbers and decimal strings
+        try:
+            numbers = np.array(values, dtype=np.float64)
+            if numbers.shape == (count,):
+                if None in values:
+                    return numbers, np.fromiter((value is not None for value in values), dtype=bool, count=count)
+                return numbers, np.ones(count, dtype=bool)
+        except Exception:
+            pass
+
+        present = np.ones(count, dtype=bool)
+        numbers = np.full(count, np.nan)
+
+        parse_text = self._parse_text
+
+        # Parsed string parts, combined in one vectorized pass below
+        indices, parts = [], []
+
+        for index, value in enumerate(values):
+
+            if type(value) is float:
+                numbers[index] = value
+                continue
+            if value is None:
+                present[index] = False
+                continue
+
+            if not isinstance(value, str):
+                try:
+                    numbers[index] = float(value)
+                except Exception:
+                    pass
+                continue
+
+            text = value.strip()
+            if not text:
+                present[index] = False
+                continue
+
+            parsed = parse_text(text, hours, column)
+            if parsed is None:
+                continue
+
+            indices.append(index)
+            parts.append(parsed)
+
+        if indices:
+            sign, d, m, s, scale = np.array(parts).T
+
+            # Same operations, in the same order, as parse_value
+            numbers[indices] = sign * (d + m / 60.0 + s / 3600.0) * scale
+
+        return numbers, present
+
+    # -------------------------------------------------------
+    # INTERNALS
+    # -------------------------------------------------------
+
+    def _parse_text(self, text: str, hours: bool, column: Any) -> Optional[Tuple[float, float, float, float, float]]:
+        """
+        (sign, degrees, minutes, seconds, scale) of a non-empty string, or
+        None when no format matches.
+        """
+
+        key = (column, hours)
+        cached = self._formats.get(key)
+
+        if _MINUS_SIGNS[0] in text or _MINUS_SIGNS[1] in text:
+            text = text.translate(_MINUS)
+
+        # The column's last format first; formats never overlap, so order only affects speed
+        names = _TRIAL_ORDER[cached] if cached else FORMATS
+
+        for name in names:
+
+            if name == "decimal":
+                # Plain decimal strings (NumPy missed them only because the column is mixed)
+                try:
+                    number = float(text)
+                except ValueError:
+                    continue
+
+                if name != cached:
+                    self._remember(key, name)
+                return 1.0, number, 0.0, 0.0, 1.0
+
+            pattern, unit = PATTERNS[name]
+            match = pattern.fullmatch(text)
+
+            if match is None:
+                continue
+
+            sign, d, m, s = match.groups()
+            d = float(d)
+            m = float(m) if m else 0.0
+            s = float(s) if s else 0.0
+
+            in_hours = unit == "hours" or (unit is None and hours)
+
+            # Minutes and seconds stay below 60, hours below 24
+            if m >= 60.0 or s >= 60.0 or (in_hours and d >= 24.0):
+                return None
+
+            if name != cached:
+                self._remember(key, name)
+            return (-1.0 if sign == "-" else 1.0), d, m, s, (15.0 if in_hours else 1.0)
+
+        return None
+
+    def _remember(self, key: Tuple[Any, bool], name: str) -> None:
+        if len(self._formats) >= MAX_CACHED_COLUMNS:
+            self._formats.clear()
+
+        self._formats[key] = name
@@ -0,0 +1,131 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+
+# Supported celestial frames
+EQUATORIAL = "equatorial"   # ICRS / mean equator and equinox of J2000
+GALACTIC = "galactic"       # IAU 1958 galactic system, Hipparcos pole
+ECLIPTIC = "ecliptic"       # mean ecliptic and equinox of J2000
+
+FRAMES = (EQUATORIAL, GALACTIC, ECLIPTIC)
+
+J2000 = 2000.0
+
+# Galactic north pole and longitude of the celestial pole, ICRS (Hipparcos, ESA 1997)
+_NGP_RA = 192.85948
+_NGP_DEC = 27.12825
+_NCP_L = 122.93192
+
+# Mean obliquity of the ecliptic at J2000 (IAU 2006), arcseconds
+_OBLIQUITY_J2000 = 84381.406
+
+
+def _rotation(angle_deg: float, axis: str) -> np.ndarray:
+    """
+    Rotation of the coordinate axes by angle about x, y or z.
+    """
+
+    c, s = np.cos(np.radians(angle_deg)), np.sin(np.radians(angle_deg))
+
+    if axis == "x":
+        return np.array([[1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c]])
+    if axis == "y":
+        return np.array([[c, 0.0, -s], [0.0, 1.0, 0.0], [s, 0.0, c]])
+    return np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+# Equatorial (J2000) -> frame, as unit-vector rotations
+_FROM_EQUATORIAL = {
+    EQUATORIAL: np.identity(3),
+    GALACTIC: _rotation(180.0 - _NCP_L, "z") @ _rotation(90.0 - _NGP_DEC, "y") @ _rotation(_NGP_RA, "z"),
+    ECLIPTIC: _rotation(_OBLIQUITY_J2000 / 3600.0, "x"),
+}
+
+
+@lru_cache(maxsize=64)
+def precession_matrix(equinox: float) -> np.ndarray:
+    """
+    IAU 1976 precession from the mean equator / equinox of J2000 to that
+    of the given Julian epoch.
+    """
+
+    t = (float(equinox) - J2000) / 100.0
+
+    zeta = (2306.2181 + (0.30188 + 0.017998 * t) * t) * t
+    z = (2306.2181 + (1.09468 + 0.018203 * t) * t) * t
+    theta = (2004.3109 - (0.42665 + 0.041833 * t) * t) * t
+
+    return _rotation(-z / 3600.0, "z") @ _rotation(theta / 3600.0, "y") @ _rotation(-zeta / 3600.0, "z")
+
+
+@lru_cache(maxsize=256)
+def frame_matrix(source: str, target: str, equinox: Optional[float] = None) -> np.ndarray:
+    """
+    Rotation taking source-frame unit vectors to the target frame.
+
+    equinox: Julian epoch of the mean equator / equinox that equatorial
+    source coordinates refer to (None: J2000); they are precessed to J2000.
+    The ~20 mas frame bias between ICRS and J2000 is neglected.
+    """
+
+    for frame in (source, target):
+        if frame not in _FROM_EQUATORIAL:
+            raise ValueError(f"Unsupported frame: {frame}")
+
+    to_source = _FROM_EQUATORIAL[source]
+
+    if source == EQUATORIAL and equinox is not None and float(equinox) != J2000:
+        to_source = precession_matrix(float(equinox))
+
+    matrix = _FROM_EQUATORIAL[target] @ to_source.T
+    matrix.flags.writeable = False
+    return matrix
+
+
+def transform_many(
+    lon: Any,
+    lat: Any,
+    source: str,
+    targets: Iterable[str],
+    equinox: Optional[float] = None,
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Convert longitude / latitude arrays (degrees) from source into each
+    target frame; the unit vectors are computed once for all targets.
+    Longitudes come back in [0, 360).
+    """
+
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+
+    cos_lat = np.cos(lat)
+    x, y, z = cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)
+
+    results = {}
+
+    for target in targets:
+        m = frame_matrix(source, target, equinox)
+
+        # Written out per element (not a matmul), so results never depend on the array length
+        tx = m[0, 0] * x + m[0, 1] * y + m[0, 2] * z
+        ty = m[1, 0] * x + m[1, 1] * y + m[1, 2] * z
+        tz = m[2, 0] * x + m[2, 1] * y + m[2, 2] * z
+
+        out_lon = np.degrees(np.arctan2(ty, tx))
+        out_lon += np.where(out_lon < 0.0, 360.0, 0.0)
+
+        # A tiny negative angle rounds up to exactly 360 after the shift
+        out_lon = np.where(out_lon >= 360.0, 0.0, out_lon)
+
+        results[target] = out_lon, np.degrees(np.arctan2(tz, np.hypot(tx, ty)))
+
+    return results
+
+
+def transform(lon: Any, lat: Any, source: str, target: str, equinox: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert longitude / latitude arrays (degrees) from source to target frame.
+    """
+    return transform_many(lon, lat, source, (target,), equinox)[target]
@@ -1,11 +1,18 @@
-from typing import Dict, Any, List, Set
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Set, Tuple
 
-from Normalization_Engine.schema_mapper import SchemaMapper
+from Normalization_Engine.schema_mapper import SchemaMapper, mapping_digest
 from Normalization_Engine.unit_converter import UnitConverter
 from Normalization_Engine.coordinate_converter import CoordinateConverter
+from Normalization_Engine.columnar_normalizer import ColumnarNormalizer
+from Normalization_Engine.parallel_normalizer import DEFAULT_CHUNK_SIZE as PARALLEL_CHUNK_SIZE, ParallelNormalizer
+from Normalization_Engine.stages import StageCounter, sink, source, stage
 
 from repository.raw_repo import RawDatasetRepository
 from repository.normalized_repo import NormalizedDatasetRepository
+from repository.mapping_profile_repo import MappingProfileRepository
+from repository.chunking import row_fingerprints, rows_checksum
 
 
 class NormalizationPipeline:
@@ -19,6 +26,9 @@ class NormalizationPipeline:
     4. Persist normalized dataset
     """
 
+    # Bump whenever normalized output changes; stored on every normalized dataset
+    NORMALIZATION_VERSION = "1.3"
+
     # Core fields that should be kept in the final normalized data
     CORE_FIELDS: Set[str] = {
         "exoplanet_id",
@@ -32,6 +42,13 @@ class NormalizationPipeline:
         "habitability_index",
         "discovery_method",
         "atmosphere_type",
+        "ra_deg",
+        "dec_deg",
+        "gal_l",
+        "gal_b",
+        "ecl_lon",
+        "ecl_lat",
+        "coordinate_flags",
     }
 
     def __init__(self, db):
@@ -39,42 +56,104 @@ class NormalizationPipeline:
 
         self.raw_repo = RawDatasetRepository(db)
         self.normalized_repo = NormalizedDatasetRepository(db)
+        self.mapping_repo = MappingProfileRepository(db)
 
         self.schema_mapper = SchemaMapper()
         self.unit_converter = UnitConverter()
         self.coordinate_converter = CoordinateConverter()
 
+        # Whole-batch (NumPy) equivalent of the three steps above
+        self.columnar_normalizer = ColumnarNormalizer(self.CORE_FIELDS, self.schema_mapper, self.coordinate_converter)
+
     # -------------------------------------------------------
     # MAIN PIPELINE
     # -------------------------------------------------------
 
-    def run(self, dataset_id: int) -> Dict[str, Any]:
+    def run(
+        self,
+        dataset_id: int,
+        metadata: Optional[Dict[str, Any]] = None,
+        max_workers: int = 1,
+        chunk_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        max_workers > 1 normalizes chunks of chunk_size raw rows in a process
+        pool; the output is the same as the serial run's, in the same order.
+
+        The output is chunked along the raw dataset, with the fingerprint of
+        each row's raw row, so renormalize() can later patch it in place.
+        timing["stages"] reports each stage's throughput and timing["dropped"]
+        the rows left out, by reason; both are also stored as the "profile"
+        of the metadata.
+        """
         try:
             raw_dataset = self.raw_repo.get_raw_dataset(dataset_id)
 
             if not raw_dataset:
                 raise ValueError("Raw dataset not found")
 
-            raw_data = raw_dataset.data
-
-            if not isinstance(raw_data, list):
-                raise ValueError("Raw dataset format invalid")
+            field_map = self.resolve_mapping(raw_dataset)
 
-            normalized_data = self._normalize_records(raw_data)
+            # Stream stored chunks instead of loading the whole dataset
+            timing: Dict[str, Any] = {}
 
-            # You can set a version string here, e.g., "1.0"
-            normalization_version = "1.0"
-
-            normalized_dataset_id = self.normalized_repo.save_normalized_dataset(
+            stats = self.normalized_repo.save_normalized_chunks(
                 raw_dataset_id=dataset_id,
-                data=normalized_data,
-                normalization_version=normalization_version,  # optional
+                chunks=self._iter_normalized_chunks(dataset_id, 0, max_workers, chunk_size, timing, field_map),
+                normalization_version=self.NORMALIZATION_VERSION,
+                # timing is complete once every chunk is written, before the metadata row is
+                metadata=dict(metadata or {}, profile=timing),
+                mapping_hash=mapping_digest(field_map),
             )
 
             return {
                 "status": "success",
-                "normalized_dataset_id": normalized_dataset_id,
-                "records": len(normalized_data),
+                "normalized_dataset_id": stats["normalized_dataset_id"],
+                "records": stats["rows"],
+                "timing": timing,
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+            }
+
+    def append(
+        self,
+        dataset_id: int,
+        normalized_dataset,
+        first_chunk_no: int,
+        max_workers: int = 1,
+        chunk_size: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Normalize only the raw chunks from first_chunk_no on and append them
+        to an existing normalized dataset of the same raw dataset.
+        """
+        try:
+            field_map = self.resolve_mapping(self.raw_repo.get_raw_dataset(dataset_id))
+
+            timing: Dict[str, Any] = {}
+            chunks = self._iter_normalized_chunks(dataset_id, first_chunk_no, max_workers, chunk_size, timing, field_map)
+
+            if self.normalized_repo.get_source_checksums(normalized_dataset) is not None:
+                # Keep the chunks aligned with the raw dataset's
+                before = normalized_dataset.row_count or 0
+                self.normalized_repo.replace_source_chunks(
+                    normalized_dataset, chunks, metadata=dict(metadata or {}, profile=timing)
+                )
+                appended = (normalized_dataset.row_count or 0) - before
+            else:
+                normalized_data = [row for _, rows, _, _ in chunks for row in rows]
+                appended = self.normalized_repo.append_rows(normalized_dataset, normalized_data)
+
+            return {
+                "status": "success",
+                "normalized_dataset_id": str(normalized_dataset.id),
+                "records": appended,
+                "timing": timing,
             }
 
         except Exception as e:
@@ -83,16 +162,319 @@ class NormalizationPipeline:
                 "error": str(e),
             }
 
+    def renormalize(self, dataset_id: int, normalized_dataset, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Patch a normalized dataset (written by run()) in place after its raw
+        rows were replaced.
+
+        Only raw chunks whose checksum changed are read. Their rows are
+        fingerprinted; rows whose fingerprint was already normalized (also
+        rows that just moved to another chunk) are reused, the rest are
+        normalized, and chunks for deleted raw chunks are dropped. The
+        result equals a full run().
+        """
+        started = time.perf_counter()
+
+        try:
+            sources = self.normalized_repo.get_source_checksums(normalized_dataset)
+
+            if sources is None:
+                raise ValueError("Normalized dataset has no row fingerprints")
+
+            raw_checksums = self.raw_repo.get_chunk_checksums(dataset_id)
+            field_map = self.resolve_mapping(self.raw_repo.get_raw_dataset(dataset_id))
+
+            changed = sorted(chunk_no for chunk_no, checksum in raw_checksums.items() if sources.get(chunk_no) != checksum)
+            removed = sorted(chunk_no for chunk_no in sources if chunk_no not in raw_checksums)
+
+            # Earlier output of every chunk being replaced, by raw-row fingerprint
+            previous: Dict[str, Dict[str, Any]] = {}
+
+            for rows, fingerprints in self.normalized_repo.get_source_chunks(
+                normalized_dataset, [chunk_no for chunk_no in changed + removed if chunk_no in sources]
+            ):
+                previous.update(zip(fingerprints, rows))
+
+            counts = {"rows_reused": 0, "rows_normalized": 0}
+            timing: Dict[str, Any] = {"mode": "incremental", "dropped": {}}
+
+            def patched_chunks():
+                for chunk_no in changed:
+                    raw_rows = self.raw_repo.get_chunk_rows(dataset_id, chunk_no)
+                    fingerprints = row_fingerprints(raw_rows)
+
+                    new_rows = [row for row, fingerprint in zip(raw_rows, fingerprints) if fingerprint not in previous]
+                    normalized, new_fingerprints = self._normalize_with_fingerprints(new_rows, field_map, timing["dropped"])
+                    fresh = dict(zip(new_fingerprints, normalized))
+
+                    counts["rows_reused"] += len(raw_rows) - len(new_rows)
+                    counts["rows_normalized"] += len(new_rows)
+
+                    # Rows that normalize to nothing are in neither map and stay dropped
+                    rows, kept = [], []
+                    for fingerprint in fingerprints:
+                        if fingerprint in previous:
+                            rows.append(previous[fingerprint])
+                        elif fingerprint in fresh:
+                            rows.append(fresh[fingerprint])
+                        else:
+                            continue
+                        kept.append(fingerprint)
+
+                    yield chunk_no, rows, kept, raw_checksums[chunk_no]
+
+                timing.update(
+                    counts,
+                    rows_dropped=sum(timing["dropped"].values()),
+                    wall_seconds=round(time.perf_counter() - started, 4),
+                )
+
+            if changed or removed:
+                self.normalized_repo.replace_source_chunks(
+                    normalized_dataset, patched_chunks(), changed + removed,
+                    # timing is complete once every chunk is written, before the metadata row is
+                    metadata=dict(metadata or {}, profile=timing),
+                )
+
+            return {
+                "status": "success",
+                "normalized_dataset_id": str(normalized_dataset.id),
+                "records": normalized_dataset.row_count or 0,
+                "timing": timing,
+                "incremental": dict(
+                    counts,
+                    chunks_checked=len(raw_checksums),
+                    chunks_rewritten=len(changed),
+                    chunks_removed=len(removed),
+                ),
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+            }
+
+    def resolve_mapping(self, raw_dataset) -> Optional[Dict[str, str]]:
+        """
+        Mapping profile entries for a raw dataset's source and owner, or None
+        for the built-in mapping.
+        """
+        if raw_dataset is None:
+            return None
+
+        return self.mapping_repo.resolve(raw_dataset.source_id, raw_dataset.user_id)
+
+    def _iter_normalized_chunks(
+        self,
+        dataset_id: int,
+        first_chunk_no: int,
+        max_workers: int,
+        chunk_size: Optional[int],
+        timing: Dict[str, Any],
+        field_map: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Yield (chunk_no, normalized rows, raw-row fingerprints, raw chunk
+        checksum) per raw chunk from first_chunk_no on, in chunk order.
+
+        Raw chunks flow through generator stages (read -> fingerprint ->
+        map -> units -> coordinates -> project, or read -> process pool)
+        into the caller's writer, one chunk at a time, so memory follows
+        the chunk size rather than the dataset size. Fills timing, with
+        per-stage throughput under "stages", as it goes.
+        """
+        started = time.perf_counter()
+        max_workers = max(int(max_workers or 1), 1)
+
+        checksums = self.raw_repo.get_chunk_checksums(dataset_id)
+
+        # Rows left out, by reason (exception type, or not_a_record)
+        dropped: Dict[str, int] = {}
+
+        read = StageCounter("read")
+        write = StageCounter("write")
+
+        def raw_chunks():
+            for chunk_no, rows in self.raw_repo.iter_chunks(dataset_id, first_chunk_no):
+
+                if not isinstance(rows, list):
+                    raise ValueError("Raw dataset format invalid")
+
+                # Inline datasets get the checksum their chunks will have once converted
+                yield _ChunkBatch(chunk_no, checksums.get(chunk_no) or rows_checksum(rows), rows)
+
+        batches = source(read, raw_chunks(), _batch_records)
+
+        if max_workers == 1:
+            timing["mode"] = "serial"
+            counters, normalized = self._normalization_stages(batches, field_map, dropped)
+            chunks = ((batch.chunk_no, batch.rows, batch.fingerprints, batch.checksum) for batch in normalized)
+        else:
+            normalizer = ParallelNormalizer(max_workers, chunk_size or PARALLEL_CHUNK_SIZE, field_map)
+            timing.update(
+                mode="parallel",
+                workers=max_workers,
+                chunk_size=normalizer.rows_per_task,
+                tasks=normalizer.timings,
+            )
+
+            sources: deque = deque()
+
+            def raw_rows():
+                for batch in batches:
+                    sources.append((batch.chunk_no, batch.checksum))
+                    yield batch.records
+
+            def parallel_chunks():
+                for normalized, fingerprints in normalizer.normalize(raw_rows()):
+                    chunk_no, checksum = sources.popleft()
+                    yield chunk_no, normalized, fingerprints, checksum
+
+            chunks = parallel_chunks()
+
+        yield from sink(write, chunks, lambda chunk: len(chunk[1]))
+
+        if max_workers > 1:
+            # Worker-side seconds, summed over tasks
+            normalize = StageCounter("normalize")
+            for task in normalizer.timings:
+                normalize.add(task["rows_in"], task["rows_out"], task["normalize_seconds"])
+                _add_counts(dropped, task["dropped"])
+            counters = [normalize]
+
+        timing["stages"] = [counter.to_dict() for counter in [read, *counters, write]]
+        timing["dropped"] = dropped
+        timing["rows_dropped"] = sum(dropped.values())
+        timing["wall_seconds"] = round(time.perf_counter() - started, 4)
+
+    def _normalization_stages(self, batches, field_map: Optional[Dict[str, str]] = None, dropped: Optional[Dict[str, int]] = None):
+        """
+        Chain the serial normalization stages over a stream of _ChunkBatch.
+        Returns (stage counters, stream of batches with rows set).
+
+        A batch whose columnar stage fails is normalized record by record
+        instead (same output) and passes through the remaining stages.
+        """
+        normalizer = self.columnar_normalizer
+
+        if field_map:
+            normalizer = ColumnarNormalizer(self.CORE_FIELDS, SchemaMapper.for_field_map(field_map), self.coordinate_converter)
+
+        def fingerprint(batch: _ChunkBatch) -> _ChunkBatch:
+            batch.records = _records(batch.records, dropped)
+            batch.fingerprints = row_fingerprints(batch.records)
+            return batch
+
+        def columnar(step):
+            def run(batch: _ChunkBatch) -> _ChunkBatch:
+                if batch.rows is None:
+                    try:
+                        step(batch)
+                    except Exception:
+                        batch.rows, batch.fingerprints = self._normalize_records_rowwise_with_fingerprints(
+                            batch.records, batch.fingerprints, field_map, dropped
+                        )
+                return batch
+            return run
+
+        def gather(batch: _ChunkBatch) -> None:
+            batch.columns = normalizer.gather(batch.records)
+
+        def convert_units(batch: _ChunkBatch) -> None:
+            normalizer.convert_units(batch.columns)
+
+        def convert_coordinates(batch: _ChunkBatch) -> None:
+            normalizer.convert_coordinates(batch.columns)
+
+        def project(batch: _ChunkBatch) -> None:
+            batch.rows = normalizer.project(batch.columns)
+
+        def release(batch: _ChunkBatch) -> _ChunkBatch:
+            # Raw rows and columns are not needed past projection
+            batch.records = batch.columns = None
+            return batch
+
+        steps = [
+            ("fingerprint", fingerprint),
+            ("map", columnar(gather)),
+            ("units", columnar(convert_units)),
+            ("coordinates", columnar(convert_coordinates)),
+        ]
+
+        counters = []
+
+        for name, step in steps:
+            counter = StageCounter(name)
+            counters.append(counter)
+            batches = stage(counter, batches, step, _batch_records)
+
+        counter = StageCounter("project")
+        counters.append(counter)
+
+        project_step = columnar(project)
+        batches = stage(counter, batches, lambda batch: release(project_step(batch)), _batch_records, _batch_rows)
+
+        return counters, batches
+
     # -------------------------------------------------------
     # RECORD NORMALIZATION
     # -------------------------------------------------------
 
-    def _normalize_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _normalize_with_fingerprints(
+        self,
+        rows: List[Any],
+        field_map: Optional[Dict[str, str]] = None,
+        dropped: Optional[Dict[str, int]] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Normalized rows plus the fingerprint of the raw row behind each one.
+        Rows left out are counted into dropped, by reason.
+        """
+        records = _records(rows, dropped)
+        fingerprints = row_fingerprints(records)
+
+        columnar_normalizer = self.columnar_normalizer
+
+        if field_map:
+            columnar_normalizer = ColumnarNormalizer(self.CORE_FIELDS, SchemaMapper.for_field_map(field_map), self.coordinate_converter)
+
+        try:
+            return columnar_normalizer.normalize(records), fingerprints
+        except Exception:
+            # Same output, one record at a time, pairing up the records that survive
+            return self._normalize_records_rowwise_with_fingerprints(records, fingerprints, field_map, dropped)
+
+    def _normalize_records_rowwise_with_fingerprints(
+        self,
+        records: List[Dict[str, Any]],
+        fingerprints: List[str],
+        field_map: Optional[Dict[str, str]] = None,
+        dropped: Optional[Dict[str, int]] = None,
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Per-record path, keeping the fingerprint of every record that survives.
+        """
+        pairs = [
+            (result[0], fingerprint)
+            for record, fingerprint in zip(records, fingerprints)
+            if (result := self._normalize_records_rowwise([record], field_map, dropped))
+        ]
+
+        return [row for row, _ in pairs], [fingerprint for _, fingerprint in pairs]
+
+    def _normalize_records_rowwise(
+        self,
+        records: List[Dict[str, Any]],
+        field_map: Optional[Dict[str, str]] = None,
+        dropped: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        schema_mapper = SchemaMapper.for_field_map(field_map) if field_map else self.schema_mapper
         normalized_records = []
 
         for record in records:
             try:
-                mapped = self.schema_mapper.map_schema(record)
+                mapped = schema_mapper.map_schema(record)
                 converted_units = self.unit_converter.convert_units(mapped)
                 converted_coordinates = self.coordinate_converter.convert_coordinates(
                     converted_units
@@ -104,7 +486,51 @@ class NormalizationPipeline:
                     if key in converted_coordinates
                 }
                 normalized_records.append(cleaned_record)
-            except Exception:
+            except Exception as e:
+                if dropped is not None:
+                    reason = type(e).__name__
+                    dropped[reason] = dropped.get(reason, 0) + 1
                 continue
 
-        return normalized_records
\ No newline at end of file
+        return normalized_records
+
+
+class _ChunkBatch:
+    """
+    One raw chunk moving through the serial normalization stages.
+    """
+
+    __slots__ = ("chunk_no", "checksum", "records", "fingerprints", "columns", "rows")
+
+    def __init__(self, chunk_no: int, checksum: str, records: List[Any]):
+        self.chunk_no = chunk_no
+        self.checksum = checksum
+        self.records = records
+        self.fingerprints: List[str] = []
+        self.columns = None
+        self.rows: Optional[List[Dict[str, Any]]] = None
+
+
+def _batch_records(batch: _ChunkBatch) -> int:
+    return len(batch.records) if batch.records is not None else 0
+
+
+def _batch_rows(batch: _ChunkBatch) -> int:
+    return len(batch.rows or [])
+
+
+def _records(rows: List[Any], dropped: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """
+    The rows that are records (dicts); the others are counted as not_a_record.
+    """
+    records = [row for row in rows if isinstance(row, dict)]
+
+    if dropped is not None and len(records) != len(rows):
+        dropped["not_a_record"] = dropped.get("not_a_record", 0) + len(rows) - len(records)
+
+    return records
+
+
+def _add_counts(total: Dict[str, int], counts: Dict[str, int]) -> None:
+    for reason, count in counts.items():
+        total[reason] = total.get(reason, 0) + count
@@ -0,0 +1,125 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Rows per task handed to a worker process
+DEFAULT_CHUNK_SIZE = 20000
+
+# Chunks submitted ahead of the one being collected, per worker
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Record normalizer of this worker process, built on first use
+_worker_pipeline = None
+
+
+class ParallelNormalizer:
+    """
+    Normalizes batches of raw rows in a process pool.
+
+    Consecutive batches are grouped into tasks of about rows_per_task rows,
+    submitted in order with a bounded number in flight, and the results
+    are yielded per batch in submission order, so the output equals the
+    serial pipeline's row for row. Per-task timings are collected in
+    self.timings.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        rows_per_task: int = DEFAULT_CHUNK_SIZE,
+        field_map: Optional[Dict[str, str]] = None,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rows_per_task = max(int(rows_per_task or DEFAULT_CHUNK_SIZE), 1)
+
+        # Mapping profile entries, sent along with every task
+        self.field_map = field_map
+        self.timings: List[Dict[str, Any]] = []
+
+    def normalize(self, batches: Iterable[List[Any]]) -> Iterator[Tuple[List[Dict[str, Any]], List[str]]]:
+        """
+        Yield (normalized rows, raw-row fingerprints) for each batch.
+        """
+
+        # spawn: never fork a web worker that holds DB connections / threads
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+        max_in_flight = self.max_workers * CHUNKS_IN_FLIGHT_PER_WORKER
+        pending = []
+        task: List[List[Any]] = []
+        task_rows = 0
+        first_row = 0
+
+        def submit():
+            pending.append((len(pending) + len(self.timings), first_row, task_rows, time.perf_counter(), executor.submit(_normalize_chunks, task, self.field_map)))
+
+        try:
+            for batch in batches:
+
+                if not isinstance(batch, list):
+                    raise ValueError("Raw dataset format invalid")
+
+                task.append(batch)
+                task_rows += len(batch)
+
+                if task_rows >= self.rows_per_task:
+                    submit()
+                    first_row += task_rows
+                    task, task_rows = [], 0
+
+                    if len(pending) >= max_in_flight:
+                        yield from self._collect(*pending.pop(0))
+
+            if task:
+                submit()
+
+            while pending:
+                yield from self._collect(*pending.pop(0))
+
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _collect(self, index: int, first_row: int, rows_in: int, submitted: float, future):
+        results, dropped, seconds = future.result()
+
+        self.timings.append({
+            "task": index,
+            "first_row": first_row,
+            "rows_in": rows_in,
+            "rows_out": sum(len(normalized) for normalized, _ in results),
+            "normalize_seconds": round(seconds, 4),
+            "wall_seconds": round(time.perf_counter() - submitted, 4),
+            "dropped": dropped,
+        })
+
+        return results
+
+
+def _normalize_chunks(
+    batches: List[List[Any]],
+    field_map: Optional[Dict[str, str]] = None,
+) -> Tuple[List[Tuple[List[Dict[str, Any]], List[str]]], Dict[str, int], float]:
+    """
+    Worker: normalize batches exactly as the serial pipeline does, counting
+    dropped rows by reason.
+    """
+    global _worker_pipeline
+
+    started = time.perf_counter()
+
+    if _worker_pipeline is None:
+        from Normalization_Engine.normalization_pipeline import NormalizationPipeline
+
+        # Record normalization never touches the database
+        _worker_pipeline = NormalizationPipeline(db=None)
+
+    dropped: Dict[str, int] = {}
+    results = [_worker_pipeline._normalize_with_fingerprints(batch, field_map, dropped) for batch in batches]
+
+    return results, dropped, time.perf_counter() - started
@@ -1,4 +1,25 @@
-from typing import Dict, Any
+import hashlib
+import json
+from typing import Dict, Any, Optional
+
+from Ingestion.row_cleaner import RowCleaner, clean_column_name
+
+
+# Compiled mappers kept for distinct mapping profiles before the cache is reset
+MAX_COMPILED_MAPPERS = 64
+
+_compiled: Dict[str, "SchemaMapper"] = {}
+
+
+def mapping_digest(field_map: Optional[Dict[str, str]]) -> Optional[str]:
+    """
+    Stable hash of a profile's field map; None for the built-in mapping.
+    """
+    if not field_map:
+        return None
+
+    payload = json.dumps(field_map, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class SchemaMapper:
@@ -48,26 +69,44 @@ class SchemaMapper:
         "content": "content",
     }
 
-    def map_schema(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def __init__(self, field_map: Optional[Dict[str, str]] = None):
         """
-        Convert arbitrary field names into canonical schema.
+        field_map: mapping profile entries, added to / overriding FIELD_MAP.
         """
+        self.field_map = dict(self.FIELD_MAP)
+
+        for raw_name, canonical_name in (field_map or {}).items():
+            self.field_map[clean_column_name(raw_name)] = canonical_name
 
-        normalized: Dict[str, Any] = {}
+        # Cleaned + mapped key names are compiled once per header set
+        self.row_cleaner = RowCleaner(rename=self.field_map)
 
-        for key, value in record.items():
+        # Every canonical key, absent (None) until a record fills it
+        self._template = dict.fromkeys(self.CANONICAL_SCHEMA)
 
-            if value is None or value == "":
-                continue
+    @classmethod
+    def for_field_map(cls, field_map: Optional[Dict[str, str]]) -> "SchemaMapper":
+        """
+        Shared mapper of a mapping profile, so its compiled header plans are
+        reused across batches and requests.
+        """
+        key = mapping_digest(field_map) or ""
+        mapper = _compiled.get(key)
 
-            clean_key = key.strip().lower().replace(" ", "_")
+        if mapper is None:
+            if len(_compiled) >= MAX_COMPILED_MAPPERS:
+                _compiled.clear()
+            mapper = _compiled.setdefault(key, cls(field_map))
 
-            mapped_key = self.FIELD_MAP.get(clean_key, clean_key)
+        return mapper
 
-            normalized[mapped_key] = value
+    def map_schema(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert arbitrary field names into canonical schema.
+        """
 
-        # Ensure all canonical keys exist
-        for key in self.CANONICAL_SCHEMA:
-            normalized.setdefault(key, None)
+        # Canonical keys that the record does not fill stay None
+        normalized: Dict[str, Any] = self._template.copy()
+        normalized.update(self.row_cleaner.clean(record))
 
-        return normalized
\ No newline at end of file
+        return normalized
@@ -0,0 +1,91 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+
+class StageCounter:
+    """
+    Throughput of one streaming stage: batches, rows in / out and the
+    seconds spent in the stage itself (upstream stages not included).
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.seconds = 0.0
+
+    def add(self, rows_in: int, rows_out: int, seconds: float) -> None:
+        self.batches += 1
+        self.rows_in += rows_in
+        self.rows_out += rows_out
+        self.seconds += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.name,
+            "batches": self.batches,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "seconds": round(self.seconds, 4),
+            "rows_per_second": round(self.rows_in / self.seconds) if self.seconds > 0 else None,
+        }
+
+
+def stage(
+    counter: StageCounter,
+    batches: Iterable[Any],
+    transform: Callable[[Any], Any],
+    rows_in: Callable[[Any], int] = len,
+    rows_out: Optional[Callable[[Any], int]] = None,
+) -> Iterator[Any]:
+    """
+    Lazily apply transform to each batch. Being a generator, the stage
+    holds one batch at a time and only pulls the next one on demand.
+    """
+
+    rows_out = rows_out or rows_in
+
+    for batch in batches:
+        started = time.perf_counter()
+        size = rows_in(batch)
+
+        result = transform(batch)
+
+        counter.add(size, rows_out(result), time.perf_counter() - started)
+        yield result
+
+
+def source(counter: StageCounter, batches: Iterable[Any], rows: Callable[[Any], int] = len) -> Iterator[Any]:
+    """
+    Time how long producing each batch takes (e.g. reading from the database).
+    """
+
+    iterator = iter(batches)
+
+    while True:
+        started = time.perf_counter()
+
+        try:
+            batch = next(iterator)
+        except StopIteration:
+            return
+
+        size = rows(batch)
+        counter.add(size, size, time.perf_counter() - started)
+        yield batch
+
+
+def sink(counter: StageCounter, batches: Iterable[Any], rows: Callable[[Any], int] = len) -> Iterator[Any]:
+    """
+    Hand batches to a consumer (e.g. a writer), timing how long the
+    consumer works on each before asking for the next.
+    """
+
+    for batch in batches:
+        size = rows(batch)
+        started = time.perf_counter()
+
+        yield batch
+
+        counter.add(size, size, time.perf_counter() - started)
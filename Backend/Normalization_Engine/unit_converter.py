@@ -1,34 +1,18 @@
 from typing import Dict, Any
 
+from Normalization_Engine.unit_registry import DEFAULT_REGISTRY, UnitRegistry
+
 
 class UnitConverter:
     """
     Converts measurement units into a standardized unit system.
     """
 
-    # Standard unit targets
-    STANDARD_UNITS = {
-        "temperature": "K",   # Kelvin
-        "distance": "AU",     # Astronomical Unit
-        "velocity": "m/s",
-    }
-
-    # Conversion rules
-    CONVERSIONS = {
-        # Temperature
-        ("C", "K"): lambda v: v + 273.15,
-        ("F", "K"): lambda v: (v - 32) * 5 / 9 + 273.15,
-        ("K", "K"): lambda v: v,
+    # Units, dimensions and composed conversion factors
+    registry: UnitRegistry = DEFAULT_REGISTRY
 
-        # Distance
-        ("km", "AU"): lambda v: v / 149597870.7,
-        ("m", "AU"): lambda v: v / 149597870700,
-        ("AU", "AU"): lambda v: v,
-
-        # Velocity
-        ("km/s", "m/s"): lambda v: v * 1000,
-        ("m/s", "m/s"): lambda v: v,
-    }
+    # Standard unit per dimension, e.g. "temperature" -> "K"
+    STANDARD_UNITS = DEFAULT_REGISTRY.standard_units
 
     def convert_units(self, record: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -41,35 +25,23 @@ class UnitConverter:
         if value is None or unit is None:
             return record
 
-        unit = str(unit)
-
-        # Determine conversion category
-        target_unit = None
-
-        if unit in ["C", "F", "K"]:
-            target_unit = "K"
-
-        elif unit in ["km", "m", "AU"]:
-            target_unit = "AU"
-
-        elif unit in ["km/s", "m/s"]:
-            target_unit = "m/s"
+        # Determine the standard unit of the unit's dimension
+        target_unit = self.registry.standard_unit(unit)
 
         if not target_unit:
             return record
 
-        conversion_key = (unit, target_unit)
-
-        if conversion_key in self.CONVERSIONS:
+        conversion = self.registry.conversion(unit, target_unit)
 
-            try:
+        try:
+            # Values typed at ingest are already numeric
+            if not isinstance(value, float):
                 value = float(value)
-                converted_value = self.CONVERSIONS[conversion_key](value)
 
-                record["value"] = converted_value
-                record["unit"] = target_unit
+            record["value"] = conversion.apply(value)
+            record["unit"] = target_unit
 
-            except Exception:
-                pass
+        except Exception:
+            pass
 
-        return record
\ No newline at end of file
+        return record
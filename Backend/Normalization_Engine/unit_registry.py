@@ -0,0 +1,252 @@
+from collections import deque
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+class Conversion(NamedTuple):
+    """
+    Affine conversion: target = value * scale + offset.
+    """
+
+    scale: float
+    offset: float = 0.0
+
+    def then(self, other: "Conversion") -> "Conversion":
+        """
+        This conversion followed by other, collapsed into one.
+        """
+        return Conversion(self.scale * other.scale, self.offset * other.scale + other.offset)
+
+    def inverse(self) -> "Conversion":
+        return Conversion(1.0 / self.scale, -self.offset / self.scale)
+
+    def apply(self, values: Any) -> Any:
+        """
+        Convert a float or a whole NumPy column in one step.
+        """
+        if self.offset:
+            return values * self.scale + self.offset
+        if self.scale != 1.0:
+            return values * self.scale
+        return values
+
+
+class UnitRegistry:
+    """
+    Units grouped by dimension, linked by affine conversions.
+
+    Only direct relations are declared (km -> m, pc -> m, yr -> d, ...);
+    any other conversion within a dimension is found as a path through
+    that graph and collapsed into a single cached (scale, offset) pair.
+    Each dimension has a standard unit that normalized values use.
+    """
+
+    def __init__(self):
+        self._dimensions: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+        self._standard: Dict[str, str] = {}
+        self._edges: Dict[str, Dict[str, Conversion]] = {}
+        self._cache: Dict[Tuple[str, str], Optional[Conversion]] = {}
+
+    # -------------------------------------------------------
+    # DEFINITION
+    # -------------------------------------------------------
+
+    def define(self, symbol: str, dimension: str, aliases: Iterable[str] = (), standard: bool = False) -> None:
+        self._dimensions[symbol] = dimension
+        self._edges.setdefault(symbol, {})
+
+        for alias in aliases:
+            self._aliases[alias] = symbol
+
+        if standard:
+            self._standard[dimension] = symbol
+
+        self._cache.clear()
+
+    def relate(self, source: str, target: str, scale: float, offset: float = 0.0) -> None:
+        """
+        Declare 1 source = scale target (+ offset), in both directions.
+        """
+
+        if self._dimensions[source] != self._dimensions[target]:
+            raise ValueError(f"Cannot relate {source} and {target}: different dimensions")
+
+        conversion = Conversion(float(scale), float(offset))
+
+        self._edges[source][target] = conversion
+        self._edges[target][source] = conversion.inverse()
+        self._cache.clear()
+
+    # -------------------------------------------------------
+    # LOOKUP
+    # -------------------------------------------------------
+
+    def resolve(self, unit: Any) -> Optional[str]:
+        """
+        Registered symbol for a unit string or alias, or None.
+        """
+        unit = unit if type(unit) is str else str(unit)
+
+        if unit in self._dimensions:
+            return unit
+        return self._aliases.get(unit)
+
+    def dimension(self, unit: Any) -> Optional[str]:
+        symbol = self.resolve(unit)
+        return self._dimensions.get(symbol) if symbol else None
+
+    def standard_unit(self, unit: Any) -> Optional[str]:
+        """
+        Standard unit of the unit's dimension, or None for unknown units.
+        """
+        dimension = self.dimension(unit)
+        return self._standard.get(dimension) if dimension else None
+
+    @property
+    def standard_units(self) -> Dict[str, str]:
+        return dict(self._standard)
+
+    def conversion(self, source: Any, target: Any) -> Optional[Conversion]:
+        """
+        Composed conversion between two units, or None when there is no path.
+        """
+
+        source, target = self.resolve(source), self.resolve(target)
+
+        if source is None or target is None:
+            return None
+
+        key = (source, target)
+
+        if key not in self._cache:
+            self._cache[key] = self._compose(source, target)
+
+        return self._cache[key]
+
+    def convert(self, values: Any, source: Any, target: Any) -> Any:
+        conversion = self.conversion(source, target)
+
+        if conversion is None:
+            raise ValueError(f"No conversion from {source} to {target}")
+
+        return conversion.apply(values)
+
+    def _compose(self, source: str, target: str) -> Optional[Conversion]:
+        # Breadth-first, so the shortest chain of declared relations is used
+        if self._dimensions[source] != self._dimensions[target]:
+            return None
+
+        paths: Dict[str, Conversion] = {source: Conversion(1.0)}
+        queue = deque([source])
+
+        while queue:
+            unit = queue.popleft()
+
+            if unit == target:
+                return paths[unit]
+
+            for neighbour, step in self._edges[unit].items():
+                if neighbour not in paths:
+                    paths[neighbour] = paths[unit].then(step)
+                    queue.append(neighbour)
+
+        return None
+
+
+# -------------------------------------------------------
+# Default astronomy registry
+# -------------------------------------------------------
+
+def _build_default_registry() -> UnitRegistry:
+    registry = UnitRegistry()
+
+    units: List[Tuple[str, str, Tuple[str, ...], bool]] = [
+        # Temperature
+        ("K", "temperature", ("kelvin",), True),
+        ("C", "temperature", ("°C", "degC", "celsius"), False),
+        ("F", "temperature", ("°F", "degF", "fahrenheit"), False),
+
+        # Length
+        ("AU", "length", ("au", "astronomical_unit"), True),
+        ("m", "length", ("meter", "metre"), False),
+        ("km", "length", ("kilometer", "kilometre"), False),
+        ("pc", "length", ("parsec",), False),
+        ("kpc", "length", (), False),
+        ("Mpc", "length", (), False),
+        ("ly", "length", ("lyr", "light_year"), False),
+        ("R_earth", "length", ("Rearth", "R_Earth", "R_E"), False),
+        ("R_jup", "length", ("Rjup", "R_Jup", "R_J"), False),
+        ("R_sun", "length", ("Rsun", "R_Sun"), False),
+
+        # Velocity
+        ("m/s", "velocity", ("m s-1",), True),
+        ("km/s", "velocity", ("km s-1",), False),
+
+        # Mass
+        ("kg", "mass", (), True),
+        ("M_earth", "mass", ("Mearth", "M_Earth", "M_E"), False),
+        ("M_jup", "mass", ("Mjup", "M_Jup", "M_J"), False),
+        ("M_sun", "mass", ("Msun", "M_Sun"), False),
+
+        # Time
+        ("d", "time", ("day", "days"), True),
+        ("s", "time", ("sec", "seconds"), False),
+        ("h", "time", ("hr", "hour", "hours"), False),
+        ("yr", "time", ("year", "years"), False),
+
+        # Spectral flux density
+        ("Jy", "spectral_flux_density", (), True),
+        ("mJy", "spectral_flux_density", (), False),
+        ("uJy", "spectral_flux_density", ("µJy", "μJy"), False),
+
+        # Energy
+        ("eV", "energy", (), True),
+        ("keV", "energy", (), False),
+        ("MeV", "energy", (), False),
+        ("J", "energy", ("joule",), False),
+    ]
+
+    for symbol, dimension, aliases, standard in units:
+        registry.define(symbol, dimension, aliases, standard=standard)
+
+    # Temperature
+    registry.relate("C", "K", 1.0, 273.15)
+    registry.relate("F", "C", 5 / 9, -32 * 5 / 9)
+
+    # Length (IAU 2012 / 2015 nominal values)
+    registry.relate("AU", "m", 149597870700.0)
+    registry.relate("km", "m", 1000.0)
+    registry.relate("pc", "m", 3.0856775814913673e16)
+    registry.relate("kpc", "pc", 1e3)
+    registry.relate("Mpc", "pc", 1e6)
+    registry.relate("ly", "m", 9460730472580800.0)
+    registry.relate("R_earth", "m", 6.3781e6)
+    registry.relate("R_jup", "m", 7.1492e7)
+    registry.relate("R_sun", "m", 6.957e8)
+
+    # Velocity
+    registry.relate("km/s", "m/s", 1000.0)
+
+    # Mass
+    registry.relate("M_earth", "kg", 5.9722e24)
+    registry.relate("M_jup", "kg", 1.89813e27)
+    registry.relate("M_sun", "kg", 1.98847e30)
+
+    # Time (Julian year)
+    registry.relate("d", "s", 86400.0)
+    registry.relate("h", "s", 3600.0)
+    registry.relate("yr", "d", 365.25)
+
+    # Spectral flux density
+    registry.relate("mJy", "Jy", 1e-3)
+    registry.relate("uJy", "Jy", 1e-6)
+
+    # Energy
+    registry.relate("keV", "eV", 1e3)
+    registry.relate("MeV", "eV", 1e6)
+    registry.relate("eV", "J", 1.602176634e-19)
+
+    return registry
+
+
+DEFAULT_REGISTRY = _build_default_registry()
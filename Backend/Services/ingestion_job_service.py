@@ -0,0 +1,247 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from Ingestion.file_parsers import is_archive
+from Ingestion.validators import DEFAULT_ERROR_BUDGET
+from repository.job_repo import IngestionJobRepository
+from Services.ingestion_service import IngestionService
+
+logger = logging.getLogger(__name__)
+
+
+# Minimum seconds between progress writes for one job
+PROGRESS_INTERVAL = 1.0
+
+# Process-wide worker pool shared by every request
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# Live row counts of jobs running in this process (job_id -> rows)
+_live_progress: Dict[str, int] = {}
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="ingestion-job",
+            )
+        return _executor
+
+
+class IngestionJobService:
+    """
+    Runs ingestion in a local worker pool so web workers return immediately.
+
+    Submitting spools the request's files to disk, records a queued job
+    and hands the work to the pool; each job runs in its own app context
+    (and therefore its own DB session).
+    """
+
+    def __init__(self, db, spool_dir: str, max_workers: int = 4):
+        self.db = db
+        self.job_repo = IngestionJobRepository(db)
+        self.spool_dir = spool_dir
+        self.max_workers = max_workers
+
+    # -------------------------------------------------------
+    # SUBMIT
+    # -------------------------------------------------------
+
+    def submit_upload(
+        self,
+        app,
+        files: List[Tuple[str, BinaryIO]],
+        user_id: str,
+        source_id: int,
+        merge: bool = False,
+        batch_size: int = 5000,
+        parse_workers: Optional[int] = None,
+        max_errors: Optional[int] = DEFAULT_ERROR_BUDGET,
+        admission=None,
+    ) -> Dict[str, Any]:
+
+        job_dir = os.path.join(self.spool_dir, "jobs", uuid.uuid4().hex)
+
+        try:
+            spooled = self._spool_files(files, job_dir)
+
+            job = self.job_repo.create_job(
+                user_id=user_id,
+                kind="upload",
+                params={
+                    "files": [filename for filename, _ in spooled],
+                    "source_id": source_id,
+                    "merge": merge,
+                },
+            )
+
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        def work(progress):
+            service = IngestionService(self.db)
+
+            if len(spooled) == 1 and not is_archive(spooled[0][0]):
+                filename, path = spooled[0]
+                with open(path, "rb") as stream:
+                    return service.ingest_user_upload_stream(
+                        stream=stream,
+                        filename=filename,
+                        user_id=user_id,
+                        source_id=source_id,
+                        batch_size=batch_size,
+                        progress=progress,
+                        max_errors=max_errors,
+                    )
+
+            streams = [(filename, open(path, "rb")) for filename, path in spooled]
+            try:
+                return service.ingest_multi_file_upload(
+                    files=streams,
+                    user_id=user_id,
+                    source_id=source_id,
+                    merge=merge,
+                    max_workers=parse_workers,
+                )
+            finally:
+                for _, stream in streams:
+                    stream.close()
+
+        return self._submit(app, job, work, cleanup_dir=job_dir, admission=admission)
+
+    def submit_api_ingest(self, app, source_id: int, query: str, user_id: str, refresh: bool = False, admission=None) -> Dict[str, Any]:
+
+        job = self.job_repo.create_job(
+            user_id=user_id,
+            kind="api_refresh" if refresh else "api",
+            params={"source_id": source_id, "query": query},
+        )
+
+        def work(progress):
+            service = IngestionService(self.db)
+            ingest = service.refresh_from_api if refresh else service.ingest_from_api
+
+            return ingest(
+                source_id=source_id,
+                query=query,
+                user_id=user_id,
+                progress=progress,
+            )
+
+        return self._submit(app, job, work, admission=admission)
+
+    # -------------------------------------------------------
+    # STATUS
+    # -------------------------------------------------------
+
+    def get_job(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            job_uuid = uuid.UUID(str(job_id))
+        except ValueError:
+            return None
+
+        job = self.job_repo.get_job(job_uuid)
+
+        if job is None or job.user_id != user_id:
+            return None
+
+        status = job.to_dict()
+
+        # Prefer the live count when the job runs in this process
+        live = _live_progress.get(status["job_id"])
+        if live is not None and job.status == "running":
+            status["rows_processed"] = max(live, status["rows_processed"] or 0)
+
+        return status
+
+    def list_jobs(self, user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in self.job_repo.get_user_jobs(user_id, limit)]
+
+    # -------------------------------------------------------
+    # EXECUTION
+    # -------------------------------------------------------
+
+    def _submit(self, app, job, work: Callable, cleanup_dir: Optional[str] = None, admission=None) -> Dict[str, Any]:
+        """
+        admission: ticket from the admission controller, held until the job ends.
+        """
+        job_id = job.id
+
+        _get_executor(self.max_workers).submit(self._run, app, job_id, work, cleanup_dir, admission)
+
+        return {
+            "status": "accepted",
+            "job_id": str(job_id),
+            "job_status": job.status,
+        }
+
+    def _run(self, app, job_id, work: Callable, cleanup_dir: Optional[str], admission=None) -> None:
+        key = str(job_id)
+        last_write = [0.0]
+
+        def progress(rows: int) -> None:
+            _live_progress[key] = rows
+
+            now = time.monotonic()
+            if now - last_write[0] >= PROGRESS_INTERVAL:
+                last_write[0] = now
+                self.job_repo.update_progress(job_id, rows)
+
+        with app.app_context():
+            try:
+                self.job_repo.mark_running(job_id)
+                _live_progress[key] = 0
+
+                result = work(progress)
+
+                if result.get("status") == "success":
+                    self.job_repo.mark_finished(
+                        job_id, "succeeded", result=result,
+                        rows_processed=result.get("records") or _live_progress.get(key, 0),
+                    )
+                else:
+                    self.job_repo.mark_finished(
+                        job_id, "failed", result=result,
+                        error=result.get("error") or result.get("message"),
+                        rows_processed=_live_progress.get(key, 0),
+                    )
+
+            except Exception as e:
+                logger.exception("Ingestion job %s failed", key)
+                self.db.session.rollback()
+                self.job_repo.mark_finished(job_id, "failed", error=str(e))
+
+            finally:
+                _live_progress.pop(key, None)
+                if cleanup_dir:
+                    shutil.rmtree(cleanup_dir, ignore_errors=True)
+                if admission is not None:
+                    admission.release()
+
+    def _spool_files(self, files: List[Tuple[str, BinaryIO]], job_dir: str) -> List[Tuple[str, str]]:
+        """
+        Copy request streams to disk; they are closed once the request ends.
+        """
+        os.makedirs(job_dir, exist_ok=True)
+        spooled = []
+
+        for index, (filename, stream) in enumerate(files):
+            path = os.path.join(job_dir, f"{index:05d}")
+
+            with open(path, "wb") as target:
+                shutil.copyfileobj(stream, target, 1024 * 1024)
+
+            spooled.append((filename, path))
+
+        return spooled
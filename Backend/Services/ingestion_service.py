@@ -1,5 +1,10 @@
-from Ingestion.validators import validate_dataset_schema, DatasetValidationError
+from Ingestion.validators import validate_dataset_schema, DatasetValidationError, ErrorBudgetExceeded, DEFAULT_ERROR_BUDGET
 from Ingestion.api_ingester import APIIngestor
+from Ingestion.user_uploads import UserUploadIngestor
+from Ingestion.archive_ingester import ArchiveIngestor
+from Ingestion.stream_reader import DEFAULT_BATCH_SIZE
+from Ingestion.schema_inference import TypedRowStream
+from Ingestion.deduplication import UploadDeduplicator, hash_bytes
 from repository.raw_repo import RawDatasetRepository
 from Services.normalization_service import NormalizationService
 
@@ -20,6 +25,7 @@ class IngestionService:
         self.db = db
         self.raw_repo = RawDatasetRepository(db)
         self.api_ingestor = APIIngestor(db)
+        self.upload_ingestor = UserUploadIngestor(db)
         self.normalization_service = NormalizationService(db)
 
     # -------------------------------------------------
@@ -28,22 +34,75 @@ class IngestionService:
 
     def ingest_user_upload(self, file_content, file_type, filename, user_id, source_id):
         try:
+            # Same bytes as an earlier upload: answer with that dataset
+            content_hash = hash_bytes(file_content.encode("utf-8"))
+
+            existing = UploadDeduplicator(self.db).find_existing(content_hash, user_id, source_id)
+            if existing:
+                return existing
+
             # Validate dataset structure
             parsed_rows = validate_dataset_schema(file_content, file_type)
 
+            # Coerce values to inferred column types once, at ingest
+            typed_rows = TypedRowStream(parsed_rows)
+            parsed_rows = list(typed_rows)
+
             # Store dataset using repository
             dataset_id = self.raw_repo.insert_raw_dataset(
                 data=parsed_rows,
                 filename=filename,
                 file_type=file_type,
                 user_id=user_id,
-                source_id=source_id
+                source_id=source_id,
+                schema=typed_rows.schema,
+                content_hash=content_hash
             )
 
             return {
                 "status": "success",
                 "dataset_id": dataset_id,
-                "records": len(parsed_rows)
+                "records": len(parsed_rows),
+                "deduplicated": False,
+                "content_hash": content_hash
+            }
+
+        except DatasetValidationError as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    # -------------------------------------------------
+    # USER FILE UPLOAD (STREAMING)
+    # -------------------------------------------------
+
+    def ingest_user_upload_stream(self, stream, filename, user_id, source_id, batch_size=DEFAULT_BATCH_SIZE, progress=None, max_errors=DEFAULT_ERROR_BUDGET):
+        """
+        Ingest an upload straight from its binary stream in fixed-size batches.
+        """
+        try:
+            return self.upload_ingestor.ingest_stream(
+                stream=stream,
+                filename=filename,
+                user_id=user_id,
+                source_id=source_id,
+                batch_size=batch_size,
+                progress=progress,
+                max_errors=max_errors
+            )
+
+        except ErrorBudgetExceeded as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "validation": e.report
             }
 
         except DatasetValidationError as e:
@@ -58,19 +117,108 @@ class IngestionService:
                 "error": str(e)
             }
 
+    # -------------------------------------------------
+    # STREAMING VALIDATION (NO STORAGE)
+    # -------------------------------------------------
+
+    def validate_upload_stream(self, stream, filename, max_errors=DEFAULT_ERROR_BUDGET):
+        try:
+            return self.upload_ingestor.validate_stream(stream, filename, max_errors)
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    # -------------------------------------------------
+    # MULTI-FILE / ARCHIVE UPLOAD
+    # -------------------------------------------------
+
+    def ingest_multi_file_upload(self, files, user_id, source_id, merge=False, max_workers=None):
+        """
+        Ingest several files and/or .zip / .tar.gz archives, parsing members in parallel.
+        """
+        try:
+            ingestor = ArchiveIngestor(self.db, max_workers=max_workers)
+
+            return ingestor.ingest_files(
+                files=files,
+                user_id=user_id,
+                source_id=source_id,
+                merge=merge
+            )
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
     # -------------------------------------------------
     # INGEST FROM EXTERNAL API
     # -------------------------------------------------
 
-    def ingest_from_api(self, source_id, query, user_id):
+    def ingest_from_api(self, source_id, query, user_id, progress=None):
         try:
             result = self.api_ingestor.ingest_from_api(
                 source_id=source_id,
                 query=query,
-                user_id=user_id
+                user_id=user_id,
+                progress=progress
+            )
+            return result
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    def refresh_from_api(self, source_id, query, user_id, progress=None):
+        """
+        Append only items newer than the query's last import. When the
+        dataset already had an up-to-date normalization, the appended
+        chunks are normalized onto it instead of renormalizing everything.
+        """
+        try:
+            watermark = self.api_ingestor.get_watermark(source_id, query, user_id)
+
+            # Checked before the append, which makes every normalization look stale
+            current = (
+                self.normalization_service.find_current_normalization(watermark.raw_dataset_id)
+                if watermark is not None else None
+            )
+
+            result = self.api_ingestor.refresh_from_api(
+                source_id=source_id,
+                query=query,
+                user_id=user_id,
+                progress=progress
             )
+
+            if result.get("refresh") == "incremental" and result.get("records") and current is not None:
+                result["normalization"] = self.normalization_service.normalize_appended(
+                    result["dataset_id"], current, result["first_chunk_no"], user_id
+                )
+
             return result
 
+        except Exception as e:
+            self.db.session.rollback()
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    # -------------------------------------------------
+    # DEDUPLICATION STATS
+    # -------------------------------------------------
+
+    def get_dedup_stats(self):
+        try:
+            return dict(self.raw_repo.get_dedup_stats(), status="success")
+
         except Exception as e:
             return {
                 "status": "error",
@@ -81,13 +229,20 @@ class IngestionService:
     # NORMALIZE DATASET (UPDATED)
     # -------------------------------------------------
 
-    def normalize_dataset(self, dataset_id, user_id=None):
+    def normalize_dataset(self, dataset_id, user_id=None, max_workers=1, chunk_size=None, parallel_min_rows=0):
         """
         Normalize a raw dataset and return the normalized dataset ID and visualization token.
+        max_workers > 1 normalizes in a process pool (see NormalizationService.normalize).
         """
         try:
             # Call normalization service (now returns a dict with token)
-            result = self.normalization_service.normalize(dataset_id, user_id)
+            result = self.normalization_service.normalize(
+                dataset_id,
+                user_id,
+                max_workers=max_workers,
+                chunk_size=chunk_size,
+                parallel_min_rows=parallel_min_rows,
+            )
 
             if result.get("status") != "success":
                 return {
@@ -100,11 +255,21 @@ class IngestionService:
                 "status": "success",
                 "normalized_dataset_id": result["normalized_dataset_id"],
                 "visualization_token": result.get("visualization_token"),
-                "records": result.get("records", 0)
+                "records": result.get("records", 0),
+                "reused": result.get("reused", False),
+                "timing": result.get("timing"),
+                "incremental": result.get("incremental")
             }
 
         except Exception as e:
             return {
                 "status": "error",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    def get_normalization_profile(self, dataset_id):
+        """
+        Stage timings and dropped-row counts recorded when the dataset was
+        normalized (see NormalizationService.get_profile); None if never.
+        """
+        return self.normalization_service.get_profile(dataset_id)
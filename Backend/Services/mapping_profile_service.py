@@ -0,0 +1,89 @@
+import re
+from typing import Any, Dict, Optional
+
+from Ingestion.row_cleaner import clean_column_name
+from Normalization_Engine.schema_mapper import SchemaMapper
+from repository.mapping_profile_repo import MappingProfileRepository
+
+
+# Entries allowed in one profile
+MAX_PROFILE_FIELDS = 500
+
+# Canonical / core field names a raw field may be mapped to
+_TARGET_NAME = re.compile(r"^[a-z_][a-z0-9_]{0,63}$")
+
+
+class MappingProfileService:
+    """
+    Business logic for per-source schema mapping profiles.
+
+    A profile maps raw field names to canonical ones on top of
+    SchemaMapper.FIELD_MAP, so a new source is onboarded by saving a
+    profile instead of changing code. Source-wide profiles are managed by
+    admins; any user may keep a personal profile per source.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.repo = MappingProfileRepository(db)
+
+    def get_profiles(self, source_id: int, user_id: str) -> Dict[str, Any]:
+        profiles = self.repo.list_for_source(source_id, user_id)
+
+        return {
+            "status": "success",
+            "source_id": source_id,
+            "profiles": [profile.to_dict() for profile in profiles],
+            "effective_field_map": SchemaMapper.for_field_map(self.repo.resolve(source_id, user_id)).field_map,
+        }
+
+    def save_profile(self, source_id: int, field_map: Any, user_id: str, scope: str = "user", is_admin: bool = False) -> Dict[str, Any]:
+        owner = self._owner(scope, user_id, is_admin)
+        profile = self.repo.save(source_id, self._validate(field_map), owner)
+
+        return {"status": "success", "profile": profile.to_dict()}
+
+    def delete_profile(self, source_id: int, user_id: str, scope: str = "user", is_admin: bool = False) -> Dict[str, Any]:
+        owner = self._owner(scope, user_id, is_admin)
+
+        if not self.repo.delete(source_id, owner):
+            raise LookupError("Mapping profile not found")
+
+        return {"status": "success", "source_id": source_id, "scope": scope}
+
+    def _owner(self, scope: str, user_id: str, is_admin: bool) -> Optional[str]:
+        if scope == "user":
+            return user_id
+
+        if scope != "source":
+            raise ValueError("scope must be 'user' or 'source'")
+
+        if not is_admin:
+            raise PermissionError("Only admins can change source-wide mapping profiles")
+
+        return None
+
+    def _validate(self, field_map: Any) -> Dict[str, str]:
+        """
+        {raw field: canonical field} with raw names cleaned the way rows are.
+        """
+        if not isinstance(field_map, dict) or not field_map:
+            raise ValueError("field_map must be a non-empty object")
+
+        if len(field_map) > MAX_PROFILE_FIELDS:
+            raise ValueError(f"field_map may have at most {MAX_PROFILE_FIELDS} entries")
+
+        cleaned: Dict[str, str] = {}
+
+        for raw_name, target in field_map.items():
+            if not isinstance(target, str) or not _TARGET_NAME.match(target):
+                raise ValueError(f"Invalid target field for {raw_name!r}: {target!r}")
+
+            raw_name = clean_column_name(raw_name)
+
+            if not raw_name:
+                raise ValueError("Raw field names must not be empty")
+
+            cleaned[raw_name] = target
+
+        return cleaned
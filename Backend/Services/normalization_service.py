@@ -2,7 +2,9 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 
 from Normalization_Engine.normalization_pipeline import NormalizationPipeline
+from Normalization_Engine.schema_mapper import mapping_digest
 from repository.normalized_repo import NormalizedDatasetRepository
+from repository.raw_repo import RawDatasetRepository
 from utils.jwt_helper import create_visualization_token
 
 
@@ -15,19 +17,81 @@ class NormalizationService:
         self.db = db
         self.pipeline = NormalizationPipeline(db)
         self.normalized_repo = NormalizedDatasetRepository(db)
+        self.raw_repo = RawDatasetRepository(db)
 
     # -------------------------------------------------------
     # UPDATED METHOD – returns dict with token
     # -------------------------------------------------------
-    def normalize(self, dataset_id: int, user_id: Optional[str] = None) -> Dict[str, Any]:
+    def normalize(
+        self,
+        dataset_id: int,
+        user_id: Optional[str] = None,
+        max_workers: int = 1,
+        chunk_size: Optional[int] = None,
+        parallel_min_rows: int = 0,
+    ) -> Dict[str, Any]:
         """
         Run normalization and return a dict containing:
         - status: "success" or "error"
         - normalized_dataset_id: UUID of the normalized dataset
         - visualization_token: JWT token for accessing visualization
         - records: number of records processed
+        - reused: True when an up-to-date normalized dataset already existed
+        - timing: serial / parallel wall time, with per-chunk timings
+        - incremental: patch statistics, when an outdated normalized dataset
+          was patched in place instead of normalizing every row again
+
+        Datasets with fewer than parallel_min_rows rows are normalized
+        serially; starting worker processes would cost more than it saves.
         """
-        result = self.pipeline.run(dataset_id)
+        existing = self.find_current_normalization(dataset_id)
+
+        if existing is not None:
+            return {
+                "status": "success",
+                "normalized_dataset_id": str(existing.id),
+                "visualization_token": create_visualization_token(str(existing.id), user_id),
+                "records": existing.row_count or 0,
+                "reused": True
+            }
+
+        # Metadata (normalized_by, timestamp, stage profile) is written in the
+        # same transaction as the normalized rows
+        metadata = {
+            "normalized_by": "system",
+            "normalized_at": datetime.utcnow().isoformat(),
+        }
+
+        outdated = self._find_outdated_normalization(dataset_id)
+
+        if outdated is not None:
+            result = self.pipeline.renormalize(dataset_id, outdated, metadata=metadata)
+
+            # Datasets written before fingerprinting are normalized from scratch
+            if result.get("status") == "success":
+                normalized_id = result["normalized_dataset_id"]
+
+                return {
+                    "status": "success",
+                    "normalized_dataset_id": normalized_id,
+                    "visualization_token": create_visualization_token(normalized_id, user_id),
+                    "records": result["records"],
+                    "reused": False,
+                    "timing": result["timing"],
+                    "incremental": result["incremental"]
+                }
+
+        raw_dataset = self.raw_repo.get_raw_dataset(dataset_id)
+
+        if raw_dataset is not None and (raw_dataset.row_count or 0) < parallel_min_rows:
+            max_workers = 1
+
+        result = self.pipeline.run(
+            dataset_id,
+            metadata=metadata,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+        )
 
         if result.get("status") != "success":
             raise Exception(result.get("error", "Normalization failed"))
@@ -35,24 +99,125 @@ class NormalizationService:
         normalized_id = result["normalized_dataset_id"]
         records = result.get("records", 0)
 
-        # Attach metadata (normalized_by, timestamp) – requires raw_dataset_id
-        self.normalized_repo.add_normalization_metadata(
-            dataset_id=normalized_id,
-            raw_dataset_id=dataset_id,  # Pass the raw dataset ID
+        # Generate visualization token for this dataset
+        viz_token = create_visualization_token(normalized_id, user_id)
+
+        return {
+            "status": "success",
+            "normalized_dataset_id": normalized_id,
+            "visualization_token": viz_token,
+            "records": records,
+            "reused": False,
+            "timing": result.get("timing")
+        }
+
+    def find_current_normalization(self, dataset_id: int):
+        """
+        Latest normalized dataset built by the current pipeline version from
+        the raw dataset's current rows, if any.
+
+        Normalizations are looked up by (content digest of the raw chunks,
+        NORMALIZATION_VERSION, mapping profile digest), so bumping the version
+        or editing the source's mapping profile misses every earlier result.
+        Normalizations without an input hash fall back to comparing
+        timestamps.
+        """
+        raw_dataset = self.raw_repo.get_raw_dataset(dataset_id)
+
+        if raw_dataset is None:
+            return None
+
+        version = self.pipeline.NORMALIZATION_VERSION
+        mapping_hash = mapping_digest(self.pipeline.resolve_mapping(raw_dataset))
+        digest = self.raw_repo.get_content_digest(dataset_id)
+
+        if digest is not None:
+            cached = self.normalized_repo.find_by_input_hash(dataset_id, digest, version, mapping_hash)
+
+            if cached is not None:
+                return cached
+
+        for normalized in self.normalized_repo.get_by_raw_dataset(dataset_id):
+            if normalized.normalization_version != version or normalized.mapping_hash != mapping_hash:
+                continue
+
+            # Built from other content
+            if digest is not None and normalized.input_hash is not None:
+                continue
+
+            if raw_dataset.updated_at and normalized.normalized_at and normalized.normalized_at < raw_dataset.updated_at:
+                continue
+
+            return normalized
+
+        return None
+
+    def _find_outdated_normalization(self, dataset_id: int):
+        """
+        Latest normalized dataset of the current pipeline version and mapping
+        profile, whether or not it is up to date with the raw rows.
+        """
+        mapping_hash = mapping_digest(self.pipeline.resolve_mapping(self.raw_repo.get_raw_dataset(dataset_id)))
+
+        for normalized in self.normalized_repo.get_by_raw_dataset(dataset_id):
+            if normalized.normalization_version == self.pipeline.NORMALIZATION_VERSION and normalized.mapping_hash == mapping_hash:
+                return normalized
+
+        return None
+
+    def normalize_appended(self, dataset_id: int, normalized_dataset, first_chunk_no: int, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extend an up-to-date normalized dataset with raw rows appended from
+        first_chunk_no on, instead of renormalizing the whole raw dataset.
+        """
+        result = self.pipeline.append(
+            dataset_id,
+            normalized_dataset,
+            first_chunk_no,
             metadata={
                 "normalized_by": "system",
                 "normalized_at": datetime.utcnow().isoformat(),
+                "appended_from_chunk": first_chunk_no,
             },
         )
 
-        # Generate visualization token for this dataset
-        viz_token = create_visualization_token(normalized_id, user_id)
+        if result.get("status") != "success":
+            raise Exception(result.get("error", "Normalization failed"))
+
+        normalized_id = result["normalized_dataset_id"]
 
         return {
             "status": "success",
             "normalized_dataset_id": normalized_id,
-            "visualization_token": viz_token,
-            "records": records
+            "visualization_token": create_visualization_token(normalized_id, user_id),
+            "records": normalized_dataset.row_count or 0,
+            "appended_records": result["records"],
+            "reused": True
+        }
+
+    def get_profile(self, dataset_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Stage profiles (per-stage wall time, rows per second, dropped rows
+        by reason) recorded for the raw dataset's current normalization, or
+        its latest one; None when it was never normalized.
+        """
+        current = self.find_current_normalization(dataset_id)
+        normalized = current or next(iter(self.normalized_repo.get_by_raw_dataset(dataset_id)), None)
+
+        if normalized is None:
+            return None
+
+        profiles = [
+            dict(meta.meta_data["profile"], recorded_at=meta.created_at.isoformat() if meta.created_at else None)
+            for meta in self.normalized_repo.get_metadata(normalized.id)
+            if isinstance(meta.meta_data, dict) and "profile" in meta.meta_data
+        ]
+
+        return {
+            "normalized_dataset_id": str(normalized.id),
+            "normalization_version": normalized.normalization_version,
+            "up_to_date": current is not None,
+            "profiles": profiles,
         }
 
     # -------------------------------------------------------
@@ -0,0 +1,104 @@
+from typing import Any, BinaryIO, Dict, Optional
+
+from Ingestion.upload_sessions import MAX_CHUNK_BYTES, MIN_CHUNK_BYTES, UploadSessionStore
+from Ingestion.file_parsers import detect_file_type, is_archive
+from Ingestion.validators import DEFAULT_ERROR_BUDGET
+from Services.ingestion_service import IngestionService
+
+
+class UploadSessionService:
+    """
+    Business logic for resumable (chunked) uploads.
+
+    Flow:
+    1. create()     -> upload_id
+    2. put_chunk()  -> numbered chunk + sha256, any order, retry-safe
+    3. status()     -> received chunks and contiguous offset
+    4. finalize()   -> assemble on disk and stream into ingestion
+    """
+
+    def __init__(
+        self,
+        db,
+        spool_dir: str,
+        session_ttl_seconds: int = 24 * 3600,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        min_chunk_bytes: int = MIN_CHUNK_BYTES,
+    ):
+        self.db = db
+        self.store = UploadSessionStore(spool_dir, max_chunk_bytes=max_chunk_bytes, min_chunk_bytes=min_chunk_bytes)
+        self.session_ttl_seconds = session_ttl_seconds
+
+    def create(self, user_id: str, filename: str, source_id: int, total_size: Optional[int] = None) -> Dict[str, Any]:
+
+        # Reject unsupported files before any bytes are sent
+        detect_file_type(filename)
+
+        self.store.purge_expired(self.session_ttl_seconds)
+
+        manifest = self.store.create(
+            user_id=user_id,
+            filename=filename,
+            source_id=source_id,
+            total_size=total_size,
+        )
+
+        return {
+            "status": "success",
+            "upload_id": manifest["upload_id"],
+            "filename": filename,
+            "total_size": total_size,
+        }
+
+    def put_chunk(self, upload_id: str, user_id: str, chunk_no: int, stream: BinaryIO, checksum: Optional[str]) -> Dict[str, Any]:
+        chunk = self.store.write_chunk(upload_id, user_id, chunk_no, stream, checksum)
+        status = self.store.status(upload_id, user_id)
+
+        return {
+            "status": "success",
+            "chunk": chunk,
+            "offset": status["offset"],
+            "next_chunk": status["next_chunk"],
+        }
+
+    def status(self, upload_id: str, user_id: str) -> Dict[str, Any]:
+        return dict(self.store.status(upload_id, user_id), status="success")
+
+    def abort(self, upload_id: str, user_id: str) -> Dict[str, Any]:
+        self.store.get_manifest(upload_id, user_id)
+        self.store.discard(upload_id)
+        return {"status": "success", "upload_id": upload_id}
+
+    def finalize(self, upload_id: str, user_id: str, batch_size: int, max_errors: Optional[int] = DEFAULT_ERROR_BUDGET) -> Dict[str, Any]:
+        """
+        Assemble the chunks and feed the file to the streaming ingestion path.
+        The session is removed once ingestion succeeds; on failure it is kept
+        so the client can fix chunks and finalize again.
+        """
+        manifest = self.store.get_manifest(upload_id, user_id)
+        assembled_path = self.store.assemble(upload_id, user_id)
+
+        service = IngestionService(self.db)
+        filename = manifest["filename"]
+
+        with open(assembled_path, "rb") as stream:
+            if is_archive(filename):
+                result = service.ingest_multi_file_upload(
+                    files=[(filename, stream)],
+                    user_id=user_id,
+                    source_id=manifest["source_id"],
+                )
+            else:
+                result = service.ingest_user_upload_stream(
+                    stream=stream,
+                    filename=filename,
+                    user_id=user_id,
+                    source_id=manifest["source_id"],
+                    batch_size=batch_size,
+                    max_errors=max_errors,
+                )
+
+        if result.get("status") == "success":
+            self.store.discard(upload_id)
+
+        return dict(result, upload_id=upload_id)
@@ -13,7 +13,7 @@ class VisualizationService:
         if not dataset:
             return {'error': 'Dataset not found'}, 404
 
-        data = dataset.standardized_payload  # list of dicts
+        data = self.normalized_repo.load_rows(dataset)  # list of dicts
         if not data:
             return {'error': 'Empty dataset'}, 400
 
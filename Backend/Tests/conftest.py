@@ -0,0 +1,59 @@
+import pytest
+from flask import Flask
+
+# Imported without the Backend. prefix: the application code imports these
+# top-level, and models must register with that same db instance
+from app.extionsions import db
+from Api_http_level.ingestion_routes import ingestion_bp
+from utils.jwt_helper import create_access_token
+import Models.ingestion_job  # noqa: F401  (registers the tables)
+import Models.ingestion_watermark  # noqa: F401
+import Models.mapping_profile  # noqa: F401
+import Models.metadata  # noqa: F401
+import Models.normalized_dataset  # noqa: F401
+import Models.normalized_dataset_chunk  # noqa: F401
+import Models.raw_dataset  # noqa: F401
+import Models.raw_dataset_chunk  # noqa: F401
+import Models.users  # noqa: F401
+
+
+@pytest.fixture
+def app():
+    """
+    Flask app on an in-memory SQLite database with every table created,
+    inside an app context.
+    """
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///:memory:"
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def sqlite_db(app):
+    """
+    The application's db, bound to the test app's SQLite database.
+    """
+    return db
+
+
+@pytest.fixture
+def client(app):
+    """
+    Test client of the app with the ingestion routes registered.
+    """
+    app.register_blueprint(ingestion_bp)
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers():
+    """
+    Authorization header carrying an access token of user u1.
+    """
+    return {"Authorization": f"Bearer {create_access_token({'user_id': 'u1', 'role': 'user'})}"}
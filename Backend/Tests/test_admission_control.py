@@ -0,0 +1,58 @@
+
+import threading
+import time
+
+import pytest
+from Backend.middleware.admission_control import AdmissionController, AdmissionRejected
+
+
+# --- Limits ---
+
+def test_per_user_limit_does_not_block_other_users():
+    controller = AdmissionController(max_concurrent=4, max_per_user=1, queue_timeout=0)
+
+    controller.acquire("a")
+
+    with pytest.raises(AdmissionRejected) as excinfo:
+        controller.acquire("a")
+
+    assert excinfo.value.retry_after >= 1
+    assert controller.acquire("b").counted is True
+
+
+def test_oversized_request_is_admitted_when_alone():
+    controller = AdmissionController(max_bytes_per_user=10, queue_timeout=0)
+
+    ticket = controller.acquire("a", nbytes=100)
+
+    with pytest.raises(AdmissionRejected):
+        controller.acquire("a", nbytes=1)
+
+    ticket.release()
+    ticket.release()
+    assert controller.snapshot()["bytes_in_flight"] == 0
+
+
+# --- Queueing ---
+
+def test_waiters_are_admitted_in_order_when_capacity_frees():
+    controller = AdmissionController(max_concurrent=1, queue_timeout=5)
+    holder = controller.acquire("a")
+    admitted = []
+
+    def wait(user_id):
+        controller.acquire(user_id).release()
+        admitted.append(user_id)
+
+    threads = [threading.Thread(target=wait, args=(user_id,)) for user_id in ("b", "c")]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+
+    assert controller.snapshot()["queue_depth"] == 2
+
+    holder.release()
+    for thread in threads:
+        thread.join()
+
+    assert admitted == ["b", "c"]
@@ -0,0 +1,104 @@
+import random
+import time
+
+from Backend.Ingestion.api_ingester import APIIngestor
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+def _items(start, stop, year=2020):
+    return [
+        {"data": [{"nasa_id": f"n{i}", "date_created": f"{year}-01-01T00:00:{i % 60:02d}Z"}]}
+        for i in range(start, stop)
+    ]
+
+
+def _serve(ingestor, items, page_size=100, delay=0.0, requests=None):
+    """
+    Answer _fetch_page from a list of NASA-style items, optionally with
+    random latency so pages complete out of order.
+    """
+
+    def fetch_page(url, query, page, extra_params=None):
+        if requests is not None:
+            requests.append(dict(extra_params or {}, page=page))
+        if delay:
+            time.sleep(random.uniform(0, delay))
+
+        return {"collection": {
+            "metadata": {"total_hits": len(items)},
+            "items": items[(page - 1) * page_size:page * page_size],
+        }}
+
+    ingestor._fetch_page = fetch_page
+
+
+def _stored_ids(db, dataset_id):
+    repo = RawDatasetRepository(db)
+    return [row["data"][0]["nasa_id"] for row in repo.load_rows(repo.get_raw_dataset(dataset_id))]
+
+
+def test_api_ingest_reports_progress_per_stored_page(sqlite_db):
+    ingestor = APIIngestor(sqlite_db)
+    _serve(ingestor, _items(0, 250))
+    progress = []
+
+    result = ingestor.ingest_from_api(1, "mars", "u1", progress=progress.append)
+
+    assert progress == [100, 200, 250]
+    assert result["records"] == 250
+
+
+def test_concurrent_pages_are_stored_in_page_order(sqlite_db):
+    random.seed(7)
+    ingestor = APIIngestor(sqlite_db)
+    requests = []
+    _serve(ingestor, _items(0, 950), delay=0.02, requests=requests)
+
+    result = ingestor.ingest_from_api(1, "mars", "u1")
+
+    assert sorted(request["page"] for request in requests) == list(range(1, 11))
+    assert result["pages"] == 10
+    assert _stored_ids(sqlite_db, result["dataset_id"]) == [f"n{i}" for i in range(950)]
+
+
+def test_refresh_pushes_the_watermark_into_the_query_and_appends_only_newer_rows(sqlite_db):
+    ingestor = APIIngestor(sqlite_db)
+
+    # A source that filters by timestamp server-side
+    ingestor.watermark_params[1] = {"created_after": "%Y-%m-%dT%H:%M:%S"}
+
+    items = _items(0, 120)
+    _serve(ingestor, items)
+    first = ingestor.ingest_from_api(1, "mars", "u1")
+
+    newer = [{"data": [{"nasa_id": f"m{i}", "date_created": f"2021-06-01T00:00:{i:02d}Z"}]} for i in range(5)]
+    catalog = items + newer
+    requests = []
+
+    def fetch_page(url, query, page, extra_params=None):
+        requests.append(dict(extra_params or {}, page=page))
+        after = extra_params["created_after"] + "Z"
+        matching = [item for item in catalog if item["data"][0]["date_created"] >= after]
+        return {"collection": {"metadata": {"total_hits": len(matching)}, "items": matching[(page - 1) * 100:page * 100]}}
+
+    ingestor._fetch_page = fetch_page
+    result = ingestor.refresh_from_api(1, "mars", "u1")
+
+    # Only the items at the watermark second came back besides the new ones
+    assert requests == [{"created_after": "2020-01-01T00:00:59", "page": 1}]
+    assert result["items_seen"] == 2 + len(newer)
+    assert result["records"] == len(newer)
+    assert _stored_ids(sqlite_db, first["dataset_id"]) == [f"n{i}" for i in range(120)] + [f"m{i}" for i in range(5)]
+
+
+def test_nasa_refresh_is_narrowed_to_the_watermark_year(sqlite_db):
+    ingestor = APIIngestor(sqlite_db)
+    _serve(ingestor, _items(0, 10, year=2019))
+    ingestor.ingest_from_api(1, "mars", "u1")
+
+    requests = []
+    _serve(ingestor, _items(0, 10, year=2019), requests=requests)
+    result = ingestor.refresh_from_api(1, "mars", "u1")
+
+    assert requests[0]["year_start"] == "2019"
+    assert result["records"] == 0
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from Backend.repository.bulk_loader import BulkLoader, RawDatasetChunk
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+ROWS = [{"id": i, "name": f"star,{i}", "note": "line\nbreak" if i % 2 else None} for i in range(7)]
+
+
+# --- executemany fallback (SQLite) ---
+
+def test_raw_dataset_is_chunked_in_one_transaction(sqlite_db):
+    stats = BulkLoader(sqlite_db, chunk_size=3).load_raw_dataset("u1", 1, iter(ROWS), metadata={"filename": "a.csv"})
+
+    assert (stats["rows"], stats["chunks"], stats["method"]) == (7, 3, "executemany")
+
+    repo = RawDatasetRepository(sqlite_db)
+    assert repo.load_rows(repo.get_raw_dataset(stats["dataset_id"])) == ROWS
+
+
+def test_failed_load_rolls_back_the_dataset(sqlite_db):
+    def rows():
+        yield from ROWS[:4]
+        raise ValueError("parse error")
+
+    with pytest.raises(ValueError):
+        BulkLoader(sqlite_db, chunk_size=3).load_raw_dataset("u1", 1, rows())
+
+    assert RawDatasetRepository(sqlite_db).get_user_datasets("u1") == []
+    assert sqlite_db.session.query(RawDatasetChunk).count() == 0
+
+
+def test_pages_arriving_out_of_order_are_stored_by_page_number(sqlite_db):
+    pages = [(2, [{"p": 2}]), (0, [{"p": 0}]), (1, [])]
+
+    stats = BulkLoader(sqlite_db).load_raw_dataset_pages("u1", 1, iter(pages))
+
+    repo = RawDatasetRepository(sqlite_db)
+    assert stats["chunks"] == 2
+    assert repo.load_rows(repo.get_raw_dataset(stats["dataset_id"])) == [{"p": 0}, {"p": 2}]
+
+
+# --- COPY payload (no PostgreSQL here: the DB-API cursor is faked) ---
+
+class _CopyCursor:
+    def __init__(self):
+        self.sql = None
+        self.payload = ""
+
+    def copy_expert(self, sql, file, size):
+        self.sql = sql
+        while True:
+            data = file.read(size)
+            if not data:
+                return
+            self.payload += data
+
+    def close(self):
+        pass
+
+
+def _copy_db(cursor):
+    # db.session.connection().connection.cursor() -> cursor
+    dbapi_connection = SimpleNamespace(cursor=lambda: cursor)
+    connection = SimpleNamespace(connection=dbapi_connection)
+    return SimpleNamespace(session=SimpleNamespace(connection=lambda: connection))
+
+
+def test_copy_streams_csv_that_round_trips():
+    cursor = _CopyCursor()
+    loader = BulkLoader(_copy_db(cursor), chunk_size=3)
+
+    records = [
+        loader._chunk_record("raw_dataset_id", 5, 0, ROWS[:3], {"rows": 0, "chunks": 0}),
+        {"raw_dataset_id": 5, "chunk_no": 1, "row_count": 0, "rows": [], "checksum": None},
+    ]
+    loader._copy_records(RawDatasetChunk.__table__, iter(records))
+
+    columns = [column.name for column in RawDatasetChunk.__table__.columns]
+    assert cursor.sql.startswith(f"COPY raw_dataset_chunks ({', '.join(columns)}) FROM STDIN")
+
+    parsed = list(csv.reader(io.StringIO(cursor.payload)))
+    first, second = (dict(zip(columns, line)) for line in parsed)
+
+    assert json.loads(first["rows"]) == ROWS[:3]
+    assert first["checksum"] == records[0]["checksum"]
+
+    # None is an unquoted empty field, which COPY reads as NULL
+    assert second["checksum"] == ""
+    assert cursor.payload.rstrip("\n").endswith(",[],")
@@ -0,0 +1,44 @@
+from Backend.Normalization_Engine.columnar_normalizer import ColumnarNormalizer
+from Backend.Normalization_Engine.coordinate_converter import CoordinateConverter
+from Backend.Normalization_Engine.schema_mapper import SchemaMapper
+from Backend.Normalization_Engine.unit_converter import UnitConverter
+
+
+CORE_FIELDS = ["exoplanet_id", "distance_ly", "star_type", "value", "unit", "ra_deg", "dec_deg", "gal_l", "gal_b", "ecl_lon", "ecl_lat", "coordinate_flags"]
+
+
+def _rowwise(records):
+    mapper, units, coordinates = SchemaMapper(), UnitConverter(), CoordinateConverter()
+    rows = []
+
+    for record in records:
+        try:
+            converted = coordinates.convert_coordinates(units.convert_units(mapper.map_schema(record)))
+        except Exception:
+            continue
+        rows.append({key: converted[key] for key in CORE_FIELDS if key in converted})
+
+    return rows
+
+
+RECORDS = [
+    {"Exoplanet ID": "a", "RA": "10.5", "Dec": "-3", "value": "2", "unit": "km"},
+    {"exoplanet_id": "b", "longitude": 370, "latitude": 12, "value": 1, "unit": "pc"},
+    {"exoplanet_id": "c", "distance_ly": "", "value": "x", "unit": "km"},
+    {"star_type": "G", "ra": "bad", "dec": None},
+    {"exoplanet_id": "d", "ra": "bad", "dec": 4, "l": 120.5, "b": "-7.25"},
+    {"exoplanet_id": "e", "elon": 10, "elat": 20},
+    {"exoplanet_id": "f", "RA": "12h34m56.7s", "Dec": "-12:30:00"},
+    {"exoplanet_id": "g", "ra": "12 34 56", "dec": "+95d", "glon": "nan", "glat": 4},
+    "not a record",
+]
+
+
+def test_matches_record_at_a_time_path():
+    assert ColumnarNormalizer(CORE_FIELDS).normalize(RECORDS) == _rowwise(RECORDS)
+
+
+def test_records_without_coordinates_get_no_coordinate_fields():
+    rows = ColumnarNormalizer(CORE_FIELDS).normalize([{"exoplanet_id": "z"}, {"ra": "bad", "dec": 1}])
+
+    assert all("ra_deg" not in row and "gal_l" not in row for row in rows)
@@ -0,0 +1,152 @@
+import datetime
+import io
+import math
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from astropy.io import fits
+
+from Backend.Ingestion.columnar_readers import ColumnarReader, columnar_file_type
+from Backend.Ingestion.file_parsers import detect_file_type, is_columnar
+from Backend.Ingestion.user_uploads import UserUploadIngestor
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+NAN = float("nan")
+
+# Big-endian on purpose: the byte order FITS tables are stored in
+COUNTS = np.array([7, -2, 2 ** 31 - 1], dtype=">i4")
+
+EXPECTED_ROWS = [
+    {"star_name": "Kepler-22", "mass_(kg)": 1.5, "observed_at": "2021-03-04T05:06:07", "flux": [1.0, 2.0], "count": 7},
+    {"star_name": "TOI-700", "observed_at": "2022-12-31T23:59:59", "flux": [3.0, None], "count": -2},
+    {"mass_(kg)": 3.25, "observed_at": "2023-01-01T00:00:00", "flux": [5.0, 6.0], "count": 2 ** 31 - 1},
+]
+
+
+def _arrow_table():
+    # Arrow only holds native byte order, so the big-endian counts are swapped on the way in
+    return pa.table({
+        "Star Name": pa.array(["Kepler-22", "TOI-700", None]),
+        "Mass (kg)": pa.array([1.5, NAN, 3.25]),
+        "Observed At": pa.array(
+            [datetime.datetime(2021, 3, 4, 5, 6, 7), datetime.datetime(2022, 12, 31, 23, 59, 59), datetime.datetime(2023, 1, 1)],
+            pa.timestamp("s"),
+        ),
+        "FLUX": pa.array([[1.0, 2.0], [3.0, NAN], [5.0, 6.0]], pa.list_(pa.float64(), 2)),
+        "count": pa.array(COUNTS.astype(COUNTS.dtype.newbyteorder("=")), pa.int32()),
+    })
+
+
+def _write_parquet(path):
+    pq.write_table(_arrow_table(), path)
+
+
+def _write_arrow_file(path):
+    table = _arrow_table()
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _write_arrow_stream(path):
+    table = _arrow_table()
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _write_fits(path):
+    # FITS has no null string or timestamp type: an empty string and ISO text stand in
+    columns = fits.ColDefs([
+        fits.Column(name="Star Name", format="12A", array=np.array(["Kepler-22", "TOI-700", ""])),
+        fits.Column(name="Mass (kg)", format="D", array=np.array([1.5, NAN, 3.25])),
+        fits.Column(name="Observed At", format="19A", array=np.array(["2021-03-04T05:06:07", "2022-12-31T23:59:59", "2023-01-01T00:00:00"])),
+        fits.Column(name="FLUX", format="2D", array=np.array([[1.0, 2.0], [3.0, NAN], [5.0, 6.0]])),
+        fits.Column(name="count", format="J", array=COUNTS),
+    ])
+    fits.HDUList([fits.PrimaryHDU(), fits.BinTableHDU.from_columns(columns)]).writeto(path)
+
+
+WRITERS = {
+    "stars.parquet": _write_parquet,
+    "stars.arrow": _write_arrow_file,
+    "stars.ipc": _write_arrow_stream,
+    "stars.fits": _write_fits,
+}
+
+
+@pytest.fixture(params=sorted(WRITERS))
+def columnar_file(request, tmp_path):
+    path = tmp_path / request.param
+    WRITERS[request.param](path)
+    return path
+
+
+def test_reader_yields_exact_rows(columnar_file):
+    reader = ColumnarReader(str(columnar_file), columnar_file_type(columnar_file.name))
+
+    assert list(reader) == EXPECTED_ROWS
+    assert reader.columns == ["star_name", "mass_(kg)", "observed_at", "flux", "count"]
+    assert reader.rows_read == 3
+
+
+def test_column_batches_keep_native_types_and_nulls(columnar_file):
+    reader = ColumnarReader(str(columnar_file), columnar_file_type(columnar_file.name), batch_size=2)
+    batches = list(reader.iter_column_batches())
+
+    assert [len(batch["count"]) for batch in batches] == [2, 1]
+    assert batches[0]["mass_(kg)"] == [1.5, None]
+    assert batches[0]["flux"] == [[1.0, 2.0], [3.0, None]]
+    assert [type(value) for value in batches[0]["count"]] == [int, int]
+    assert batches[1]["count"] == [2 ** 31 - 1]
+
+
+def test_fits_big_endian_integers_are_read_as_values(tmp_path):
+    path = tmp_path / "stars.fits"
+    _write_fits(path)
+
+    with fits.open(path) as hdul:
+        assert hdul[1].data.field("count").dtype.byteorder == ">"
+
+    assert [row["count"] for row in ColumnarReader(str(path), "FITS")] == [7, -2, 2 ** 31 - 1]
+
+
+def test_floats_in_rows_are_never_nan(columnar_file):
+    for row in ColumnarReader(str(columnar_file), columnar_file_type(columnar_file.name)):
+        assert not any(isinstance(value, float) and math.isnan(value) for value in row.values())
+
+
+def test_ndjson_is_not_detected_as_columnar():
+    assert columnar_file_type("events.ndjson") is None
+    assert not is_columnar("events.ndjson")
+    assert detect_file_type("events.ndjson") == "JSON"
+    assert detect_file_type("EVENTS.FEATHER") == "ARROW"
+
+
+def _stored_rows(db, dataset_id):
+    repo = RawDatasetRepository(db)
+    return repo.load_rows(repo.get_raw_dataset(dataset_id))
+
+
+def test_columnar_upload_from_a_file_on_disk(sqlite_db, columnar_file):
+    with open(columnar_file, "rb") as stream:
+        result = UserUploadIngestor(sqlite_db).ingest_stream(stream, columnar_file.name, "u1", 1, batch_size=2)
+
+    assert result["records"] == 3
+    assert _stored_rows(sqlite_db, result["dataset_id"]) == EXPECTED_ROWS
+
+
+def test_columnar_upload_from_memory_is_spooled(sqlite_db, columnar_file):
+    stream = io.BytesIO(columnar_file.read_bytes())
+    result = UserUploadIngestor(sqlite_db).ingest_stream(stream, columnar_file.name, "u1", 1)
+
+    assert _stored_rows(sqlite_db, result["dataset_id"]) == EXPECTED_ROWS
+
+
+def test_ndjson_upload_is_parsed_as_json(sqlite_db):
+    stream = io.BytesIO(b'{"star": "Kepler-22", "mass": 1.5}\n{"star": "TOI-700", "mass": null}\n')
+    result = UserUploadIngestor(sqlite_db).ingest_stream(stream, "stars.ndjson", "u1", 1)
+
+    assert result["records"] == 2
+    assert _stored_rows(sqlite_db, result["dataset_id"]) == [{"star": "Kepler-22", "mass": 1.5}, {"star": "TOI-700"}]
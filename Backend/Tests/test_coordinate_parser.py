@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+import pytest
+
+from Backend.Normalization_Engine.coordinate_converter import CoordinateConverter
+from Backend.Normalization_Engine.coordinate_parser import CoordinateParser
+
+
+@pytest.mark.parametrize("text, hours, degrees", [
+    ("12h34m56.7s", False, 188.73625),
+    ("12 34 56", True, 188.73333333333335),
+    ("+12:34:56", False, 12.582222222222223),
+    ("-00:30:00", False, -0.5),
+    ("−12°34′56″", False, -12.582222222222223),
+    ("12.5d", True, 12.5),
+    (" 7.25 ", True, 7.25),
+])
+def test_parses_common_formats(text, hours, degrees):
+    assert CoordinateParser().parse_value(text, hours) == pytest.approx(degrees)
+
+
+def test_column_matches_value_by_value_parsing():
+    values = ["12:00:00", "1.5", None, "bad", "  ", 3, "12h", "10:60:00", "25 00 00"]
+    parser = CoordinateParser()
+
+    numbers, given = parser.parse_column(values, hours=True, column="ra")
+    expected = [parser.parse_value(value, True, "ra") for value in values]
+
+    assert given.tolist() == [value is not None for value in expected]
+    assert np.array_equal(numbers, [np.nan if value is None else value for value in expected], equal_nan=True)
+    assert math.isnan(numbers[3]) and math.isnan(numbers[7]) and math.isnan(numbers[8])
+
+
+def test_bad_values_are_flagged_not_zeroed():
+    record = CoordinateConverter().convert_coordinates({"ra": "12h61m", "dec": "10", "l": "bad", "b": 5})
+
+    assert "ra_deg" not in record
+    assert record["coordinate_flags"] == "ra,l"
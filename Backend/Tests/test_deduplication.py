@@ -0,0 +1,33 @@
+import io
+
+from Backend.Ingestion.user_uploads import UserUploadIngestor
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+CONTENT = b"name,mass\nKepler-22b,36\nTRAPPIST-1e,0.69\n"
+
+
+def _upload(db, user_id, source_id):
+    return UserUploadIngestor(db).ingest_stream(io.BytesIO(CONTENT), "planets.csv", user_id, source_id)
+
+
+def test_repeat_upload_by_the_same_user_is_deduplicated(sqlite_db):
+    first = _upload(sqlite_db, "u1", 1)
+    repeat = _upload(sqlite_db, "u1", 1)
+
+    assert repeat["deduplicated"] is True
+    assert repeat["dataset_id"] == first["dataset_id"]
+
+
+def test_same_bytes_from_another_user_or_source_get_their_own_dataset(sqlite_db):
+    first = _upload(sqlite_db, "u1", 1)
+    other_user = _upload(sqlite_db, "u2", 3)
+    other_source = _upload(sqlite_db, "u1", 3)
+
+    assert other_user["deduplicated"] is False
+    assert other_source["deduplicated"] is False
+    assert len({first["dataset_id"], other_user["dataset_id"], other_source["dataset_id"]}) == 3
+
+    repo = RawDatasetRepository(sqlite_db)
+    assert [dataset.id for dataset in repo.get_user_datasets("u2")] == [other_user["dataset_id"]]
+    assert repo.get_raw_dataset(other_user["dataset_id"]).source_id == 3
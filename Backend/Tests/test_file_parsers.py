@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from Backend.Ingestion.file_parsers import DatasetValidationError, parse_member, read_spool
+
+
+def test_member_rows_round_trip_through_the_spool(tmp_path):
+    path = tmp_path / "stars.csv"
+    path.write_text("name , mass\n" + "".join(f" s{i} ,{i}\n" for i in range(12)))
+    spool = str(tmp_path / "stars.rows")
+
+    result = parse_member(str(path), "CSV", spool, batch_size=5)
+
+    # Only a summary comes back from the worker
+    assert "rows" not in result
+    assert result["records"] == 12
+
+    rows = list(read_spool(result["spool"]))
+
+    assert rows[0] == {"name": "s0", "mass": "0"}
+    assert len(rows) == 12
+    assert not os.path.exists(spool)
+
+
+def test_empty_member_is_an_error(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_text("[]")
+
+    with pytest.raises(DatasetValidationError):
+        parse_member(str(path), "JSON", str(tmp_path / "empty.rows"))
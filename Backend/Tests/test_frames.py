@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from Backend.Normalization_Engine.frames import transform
+
+
+# Reference positions; Vega and Sirius values are from astropy (ICRS / FK5)
+def test_galactic_reference_points():
+    # Galactic centre and north galactic pole by definition
+    l, b = transform([266.40499, 192.85948], [-28.93617, 27.12825], "equatorial", "galactic")
+    assert min(l[0], 360 - l[0]) == pytest.approx(0.0, abs=1e-4)
+    assert b.tolist() == pytest.approx([0.0, 90.0], abs=1e-4)
+
+    l, b = transform(279.23473479, 38.78368896, "equatorial", "galactic")
+    assert (float(l), float(b)) == pytest.approx((67.448208, 19.237252), abs=5e-5)
+
+
+def test_ecliptic_reference_points():
+    lon, lat = transform(279.23473479, 38.78368896, "equatorial", "ecliptic")
+    assert (float(lon), float(lat)) == pytest.approx((285.316395, 61.732854), abs=5e-5)
+
+    # North ecliptic pole
+    _, lat = transform(270.0, 66.560708, "equatorial", "ecliptic")
+    assert float(lat) == pytest.approx(90.0, abs=5e-5)
+
+
+def test_precesses_equinox_to_j2000():
+    ra, dec = transform(101.287155, -16.716116, "equatorial", "equatorial", equinox=1950.0)
+    assert (float(ra), float(dec)) == pytest.approx((101.845585, -16.771937), abs=1e-4)
+
+
+def test_round_trip_over_whole_arrays():
+    rng = np.random.default_rng(7)
+    ra, dec = rng.uniform(0, 360, 1000), rng.uniform(-89, 89, 1000)
+
+    l, b = transform(ra, dec, "equatorial", "galactic")
+    back_ra, back_dec = transform(l, b, "galactic", "equatorial")
+
+    assert np.allclose(back_dec, dec, atol=1e-9)
+    assert np.allclose((back_ra - ra + 180) % 360 - 180, 0, atol=1e-8)
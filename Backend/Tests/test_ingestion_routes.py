@@ -0,0 +1,97 @@
+import hashlib
+import io
+
+import pytest
+
+
+@pytest.mark.parametrize("filename", ["planets.csv", "planets.zip"])
+def test_upload_rejects_a_non_numeric_source_id(client, auth_headers, filename):
+    response = client.post(
+        "/ingestion/upload",
+        data={"source_id": "nasa", "file": (io.BytesIO(b"name\nKepler-22b\n"), filename)},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+    assert response.get_json() == {"status": "error", "message": "source_id must be an integer"}
+
+
+def test_multi_file_upload_rejects_a_non_numeric_source_id(client, auth_headers):
+    response = client.post(
+        "/ingestion/upload",
+        data={
+            "source_id": "nasa",
+            "files": [(io.BytesIO(b"name\nKepler-22b\n"), "a.csv"), (io.BytesIO(b"name\nTOI-700d\n"), "b.csv")],
+        },
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+
+def test_chunk_upload_is_rejected_past_the_chunk_limit(client, auth_headers, tmp_path):
+    client.application.config.update(UPLOAD_SPOOL_DIR=str(tmp_path), UPLOAD_MAX_CHUNK_BYTES=16)
+
+    created = client.post(
+        "/ingestion/uploads", json={"filename": "planets.csv", "source_id": 1}, headers=auth_headers
+    ).get_json()
+
+    payload = b"x" * 4096
+    response = client.put(
+        f"/ingestion/uploads/{created['upload_id']}/chunks/0",
+        data=payload,
+        headers=dict(auth_headers, **{"X-Chunk-SHA256": hashlib.sha256(payload).hexdigest()}),
+    )
+
+    assert response.status_code == 413
+    assert response.get_json() == {"status": "error", "message": "Chunk exceeds 16 bytes"}
+
+
+class _RecordingIngestionService:
+    calls = []
+
+    def __init__(self, db):
+        pass
+
+    def normalize_dataset(self, dataset_id, **options):
+        self.calls.append(options)
+        return {"status": "success"}
+
+
+@pytest.fixture
+def normalize_calls(monkeypatch):
+    _RecordingIngestionService.calls = []
+    monkeypatch.setattr("Api_http_level.ingestion_routes.IngestionService", _RecordingIngestionService)
+    monkeypatch.setattr("Api_http_level.ingestion_routes.os.cpu_count", lambda: 4)
+    return _RecordingIngestionService.calls
+
+
+def test_normalize_runs_serially_unless_workers_are_configured(client, auth_headers, normalize_calls):
+    assert client.post("/ingestion/normalize/1", headers=auth_headers).status_code == 200
+
+    client.application.config["NORMALIZE_WORKERS"] = 3
+    assert client.post("/ingestion/normalize/1", headers=auth_headers).status_code == 200
+
+    assert [call["max_workers"] for call in normalize_calls] == [1, 3]
+
+
+@pytest.mark.parametrize("configured, requested, allowed", [
+    (None, 4, True),
+    (None, 5, False),
+    (None, 500, False),
+    (2, 2, True),
+    (2, 3, False),
+])
+def test_normalize_workers_are_capped(client, auth_headers, normalize_calls, configured, requested, allowed):
+    client.application.config["NORMALIZE_WORKERS"] = configured
+
+    response = client.post("/ingestion/normalize/1", json={"workers": requested}, headers=auth_headers)
+
+    if allowed:
+        assert response.status_code == 200
+        assert normalize_calls[0]["max_workers"] == requested
+    else:
+        assert response.status_code == 400
+        assert response.get_json() == {"status": "error", "message": f"workers may not exceed {configured or 4}"}
+        assert normalize_calls == []
@@ -0,0 +1,64 @@
+from Backend.Services.normalization_service import NormalizationService
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+def _rows(count):
+    return [{"Exoplanet ID": f"p{i}", "ra": i * 1.5, "dec": i * 0.5} for i in range(count)]
+
+
+def test_normalize_records_a_stage_profile(sqlite_db):
+    rows = _rows(50) + ["junk", 3]
+    dataset_id = RawDatasetRepository(sqlite_db).save_raw_dataset(user_id="u1", source_id=1, data=rows)
+    service = NormalizationService(sqlite_db)
+
+    result = service.normalize(dataset_id)
+    profile = service.get_profile(dataset_id)
+
+    assert profile["normalized_dataset_id"] == result["normalized_dataset_id"]
+    assert profile["normalization_version"] == service.pipeline.NORMALIZATION_VERSION
+    assert profile["up_to_date"] is True
+    assert len(profile["profiles"]) == 1
+
+    recorded = profile["profiles"][0]
+    assert recorded["recorded_at"] is not None
+    assert recorded["dropped"] == {"not_a_record": 2}
+    assert recorded["rows_dropped"] == 2
+    assert recorded["wall_seconds"] >= 0
+
+    stages = {stage["stage"]: stage for stage in recorded["stages"]}
+    assert recorded["stages"][0]["stage"] == "read"
+    assert recorded["stages"][-1]["stage"] == "write"
+    assert stages["read"]["rows_in"] == 52
+    assert stages["write"]["rows_in"] == 50
+    for stage in recorded["stages"]:
+        assert set(stage) == {"stage", "batches", "rows_in", "rows_out", "seconds", "rows_per_second"}
+
+
+def test_renormalize_adds_an_incremental_profile(sqlite_db):
+    raw_repo = RawDatasetRepository(sqlite_db)
+    rows = _rows(50)
+    dataset_id = raw_repo.save_raw_dataset(user_id="u1", source_id=1, data=rows)
+    service = NormalizationService(sqlite_db)
+    service.normalize(dataset_id)
+
+    raw_repo.update_raw_dataset(dataset_id, rows[:49] + ["junk"])
+    assert service.get_profile(dataset_id)["up_to_date"] is False
+
+    service.normalize(dataset_id)
+    profile = service.get_profile(dataset_id)
+
+    assert profile["up_to_date"] is True
+    assert len(profile["profiles"]) == 2
+
+    incremental = next(recorded for recorded in profile["profiles"] if recorded.get("mode") == "incremental")
+    assert incremental["dropped"] == {"not_a_record": 1}
+    assert incremental["rows_reused"] == 49
+    assert incremental["rows_normalized"] == 1
+
+
+def test_profile_of_a_dataset_never_normalized_is_none(sqlite_db):
+    dataset_id = RawDatasetRepository(sqlite_db).save_raw_dataset(user_id="u1", source_id=1, data=_rows(5))
+    service = NormalizationService(sqlite_db)
+
+    assert service.get_profile(dataset_id) is None
+    assert service.get_profile(999) is None
@@ -0,0 +1,67 @@
+from Backend.Services.normalization_service import NormalizationService
+from Backend.repository.mapping_profile_repo import MappingProfileRepository
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+ROWS = [{"Exoplanet ID": f"p{i}", "ra": i * 1.5, "dec": i * 0.5} for i in range(50)]
+
+
+def _dataset(db):
+    return RawDatasetRepository(db).save_raw_dataset(user_id="u1", source_id=1, data=ROWS)
+
+
+def test_unchanged_input_reuses_the_normalization(sqlite_db):
+    dataset_id = _dataset(sqlite_db)
+    service = NormalizationService(sqlite_db)
+
+    first = service.normalize(dataset_id)
+    # Rewriting the same rows bumps updated_at but not the content digest
+    RawDatasetRepository(sqlite_db).update_raw_dataset(dataset_id, ROWS)
+    repeat = service.normalize(dataset_id)
+
+    assert first["reused"] is False
+    assert repeat["reused"] is True
+    assert repeat["normalized_dataset_id"] == first["normalized_dataset_id"]
+    assert repeat["records"] == 50
+
+
+def test_version_bump_misses_earlier_normalizations(sqlite_db, monkeypatch):
+    dataset_id = _dataset(sqlite_db)
+    service = NormalizationService(sqlite_db)
+    first = service.normalize(dataset_id)
+
+    monkeypatch.setattr(service.pipeline, "NORMALIZATION_VERSION", "99.0")
+    bumped = service.normalize(dataset_id)
+
+    assert bumped["reused"] is False
+    assert "incremental" not in bumped
+    assert bumped["normalized_dataset_id"] != first["normalized_dataset_id"]
+    assert service.find_current_normalization(dataset_id).normalization_version == "99.0"
+
+    monkeypatch.undo()
+    assert service.normalize(dataset_id)["normalized_dataset_id"] == first["normalized_dataset_id"]
+
+
+def test_mapping_profile_change_misses_earlier_normalizations(sqlite_db):
+    dataset_id = _dataset(sqlite_db)
+    service = NormalizationService(sqlite_db)
+    first = service.normalize(dataset_id)
+
+    profiles = MappingProfileRepository(sqlite_db)
+    profiles.save(1, {"Exoplanet ID": "planet"})
+    mapped = service.normalize(dataset_id)
+
+    assert mapped["reused"] is False
+    assert mapped["normalized_dataset_id"] != first["normalized_dataset_id"]
+    assert service.normalize(dataset_id)["reused"] is True
+
+    profiles.save(1, {"Exoplanet ID": "planet_name"})
+    remapped = service.normalize(dataset_id)
+    assert remapped["reused"] is False
+    assert remapped["normalized_dataset_id"] not in (first["normalized_dataset_id"], mapped["normalized_dataset_id"])
+
+    # Without a profile the built-in mapping's result is current again
+    profiles.delete(1)
+    restored = service.normalize(dataset_id)
+    assert restored["reused"] is True
+    assert restored["normalized_dataset_id"] == first["normalized_dataset_id"]
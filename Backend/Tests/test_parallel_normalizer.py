@@ -0,0 +1,53 @@
+from Backend.Normalization_Engine.normalization_pipeline import NormalizationPipeline
+from Backend.Normalization_Engine.parallel_normalizer import ParallelNormalizer
+from Backend.repository.chunking import row_fingerprints
+
+
+BATCHES = [
+    [{"Exoplanet ID": f"p{i}", "distance_ly": str(i), "star_type": "" if i % 3 else "G"} for i in range(start, start + 50)]
+    for start in range(0, 300, 50)
+]
+
+
+def test_parallel_output_matches_serial_in_order():
+    serial = NormalizationPipeline(db=None)
+    expected = [serial._normalize_with_fingerprints(batch) for batch in BATCHES]
+
+    normalizer = ParallelNormalizer(max_workers=2, rows_per_task=120)
+    parallel = list(normalizer.normalize(iter(BATCHES)))
+
+    assert parallel == expected
+    assert [timing["task"] for timing in normalizer.timings] == [0, 1]
+    assert sum(timing["rows_out"] for timing in normalizer.timings) == 300
+
+
+def test_fingerprints_follow_kept_rows():
+    rows = [{"exoplanet_id": "a"}, "not a record", {"exoplanet_id": "b"}]
+
+    normalized, fingerprints = NormalizationPipeline(db=None)._normalize_with_fingerprints(rows)
+
+    assert [row["exoplanet_id"] for row in normalized] == ["a", "b"]
+    assert fingerprints == row_fingerprints([rows[0], rows[2]])
+
+
+def test_dropped_rows_are_counted_by_reason():
+    pipeline = NormalizationPipeline(db=None)
+    rows = [{"exoplanet_id": "a"}, "not a record", 3, {"exoplanet_id": "b"}]
+
+    def fail(batch):
+        raise RuntimeError("columnar path unavailable")
+
+    def reject_b(record):
+        if record.get("exoplanet_id") == "b":
+            raise KeyError("exoplanet_id")
+        return record
+
+    pipeline.columnar_normalizer.convert_units = fail
+    pipeline.unit_converter.convert_units = reject_b
+
+    dropped = {}
+    normalized, fingerprints = pipeline._normalize_with_fingerprints(rows, dropped=dropped)
+
+    assert [row["exoplanet_id"] for row in normalized] == ["a"]
+    assert fingerprints == row_fingerprints([rows[0]])
+    assert dropped == {"not_a_record": 2, "KeyError": 1}
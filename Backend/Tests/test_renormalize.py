@@ -0,0 +1,67 @@
+import uuid
+
+from Backend.Normalization_Engine.normalization_pipeline import NormalizationPipeline
+from Backend.Services.normalization_service import NormalizationService
+from Backend.repository.normalized_repo import NormalizedDatasetRepository
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+def _rows(count):
+    return [{"Exoplanet ID": f"p{i}", "ra": (i * 7.3) % 360, "dec": (i * 3.1) % 80} for i in range(count)]
+
+
+def _normalized_rows(db, normalized_id):
+    repo = NormalizedDatasetRepository(db)
+    return repo.load_rows(repo.get_normalized_dataset(uuid.UUID(normalized_id)))
+
+
+def test_renormalize_only_normalizes_changed_rows(sqlite_db):
+    raw_repo = RawDatasetRepository(sqlite_db)
+    rows = _rows(500)
+    dataset_id = raw_repo.save_raw_dataset(user_id="u1", source_id=1, data=rows, chunk_size=100)
+
+    service = NormalizationService(sqlite_db)
+    first = service.normalize(dataset_id)
+
+    rows[150] = {"Exoplanet ID": "edited", "ra": 12.5, "dec": -4.0}
+    rows[420] = dict(rows[420], dec=45.0)
+    raw_repo.update_raw_dataset(dataset_id, rows)
+
+    patched = service.normalize(dataset_id)
+
+    assert patched["reused"] is False
+    assert patched["normalized_dataset_id"] == first["normalized_dataset_id"]
+    assert patched["incremental"] == {
+        "rows_reused": 198,
+        "rows_normalized": 2,
+        "chunks_checked": 5,
+        "chunks_rewritten": 2,
+        "chunks_removed": 0,
+    }
+
+    patched_rows = _normalized_rows(sqlite_db, patched["normalized_dataset_id"])
+    assert len(patched_rows) == 500
+    assert patched_rows[150]["exoplanet_id"] == "edited"
+    assert patched_rows[420]["dec_deg"] == 45.0
+
+    # Patched output matches normalizing the edited rows from scratch
+    fresh = NormalizationPipeline(sqlite_db).run(dataset_id, metadata={"normalized_by": "test"})
+    assert patched_rows == _normalized_rows(sqlite_db, fresh["normalized_dataset_id"])
+
+
+def test_renormalize_drops_chunks_removed_from_the_raw_dataset(sqlite_db):
+    raw_repo = RawDatasetRepository(sqlite_db)
+    rows = _rows(300)
+    dataset_id = raw_repo.save_raw_dataset(user_id="u1", source_id=1, data=rows, chunk_size=100)
+
+    service = NormalizationService(sqlite_db)
+    service.normalize(dataset_id)
+
+    raw_repo.update_raw_dataset(dataset_id, rows[:200])
+    patched = service.normalize(dataset_id)
+
+    assert patched["incremental"]["chunks_removed"] == 1
+    assert patched["incremental"]["rows_normalized"] == 0
+    assert patched["records"] == 200
+    fresh = NormalizationPipeline(sqlite_db).run(dataset_id)
+    assert _normalized_rows(sqlite_db, patched["normalized_dataset_id"]) == _normalized_rows(sqlite_db, fresh["normalized_dataset_id"])
@@ -0,0 +1,94 @@
+import time
+
+from Backend.Ingestion.row_cleaner import MAX_PLANS, RowCleaner
+
+
+def _legacy_clean_csv_row(row):
+    # The per-cell loop RowCleaner replaced
+    cleaned_row = {}
+
+    for key, value in row.items():
+        if key is None:
+            continue
+        clean_key = key.strip().lower().replace(" ", "_")
+
+        if value is None or value == "":
+            continue
+
+        cleaned_row[clean_key] = value.strip()
+    return cleaned_row
+
+
+# --- Behaviour ---
+
+def test_keys_are_cleaned_and_empty_values_dropped():
+    row = {" Star Name ": "Vega", "Mass": "", "Radius": None, "Dist": 7.68}
+
+    assert RowCleaner().clean(row) == {"star_name": "Vega", "dist": 7.68}
+
+
+def test_surplus_csv_cells_under_none_are_dropped():
+    row = {"a": "1", "b": "2", None: ["3", "4"]}
+
+    assert RowCleaner().clean(row) == {"a": "1", "b": "2"}
+
+
+def test_strip_values_only_strips_strings():
+    cleaner = RowCleaner(strip_values=True)
+
+    assert cleaner.clean({"a": " x ", "b": 3, "c": "  "}) == {"a": "x", "b": 3, "c": ""}
+    assert RowCleaner().clean({"a": " x "}) == {"a": " x "}
+
+
+def test_rename_and_keep():
+    cleaner = RowCleaner(rename={"pl_name": "planet"}, keep={"planet", "mass"})
+
+    assert cleaner.clean({"PL Name": "b", "Mass": 1, "Other": 2}) == {"planet": "b", "mass": 1}
+
+
+def test_plan_is_compiled_once_per_header_set():
+    cleaner = RowCleaner()
+    compiled = []
+    compile_plan = cleaner._compile
+    cleaner._compile = lambda keys: compiled.append(keys) or compile_plan(keys)
+
+    for i in range(100):
+        cleaner.clean({"A": i, "B": i})
+    cleaner.clean({"B": 1, "A": 2})
+
+    assert compiled == [("A", "B"), ("B", "A")]
+    assert cleaner.plan(["A", "B"]) == (("A", "a"), ("B", "b"))
+
+
+def test_plan_cache_is_bounded():
+    cleaner = RowCleaner()
+
+    for i in range(MAX_PLANS + 10):
+        cleaner.clean({f"c{i}": 1})
+
+    assert len(cleaner._plans) <= MAX_PLANS
+
+
+# --- Wide catalogs ---
+
+def test_wide_catalog_matches_and_beats_the_per_cell_loop():
+    columns = [f" Column {i} " for i in range(240)]
+    rows = [
+        {name: "" if (r + c) % 7 == 0 else f" {r * c} " for c, name in enumerate(columns)}
+        for r in range(2000)
+    ]
+    cleaner = RowCleaner(strip_values=True)
+
+    def best_of(clean, repeats=3):
+        best, output = float("inf"), None
+        for _ in range(repeats):
+            started = time.perf_counter()
+            output = [clean(row) for row in rows]
+            best = min(best, time.perf_counter() - started)
+        return best, output
+
+    legacy_seconds, expected = best_of(_legacy_clean_csv_row)
+    seconds, cleaned = best_of(cleaner.clean)
+
+    assert cleaned == expected
+    assert seconds < legacy_seconds
@@ -0,0 +1,68 @@
+
+import pytest
+from Backend.Ingestion.schema_inference import SchemaInferrer, TypedRowStream, column_types
+
+
+# --- Type Inference ---
+
+def test_infers_basic_column_types():
+    rows = [
+        {"id": "7", "mass": "1.5", "confirmed": "true", "observed": "2021-03-04T05:06:07Z", "name": "Kepler-22b"},
+        {"id": "8", "mass": "2", "confirmed": "False", "observed": "2021-03-05", "name": "TOI-700 d"},
+    ]
+
+    schema = SchemaInferrer().infer(rows)
+
+    assert column_types(schema) == {
+        "id": "int",
+        "mass": "float",
+        "confirmed": "bool",
+        "observed": "timestamp",
+        "name": "string",
+    }
+
+
+def test_leading_zero_ids_stay_strings():
+    schema = SchemaInferrer().infer([{"code": "007"}, {"code": "12"}])
+    assert column_types(schema)["code"] == "string"
+
+
+def test_missing_cells_mark_column_nullable():
+    schema = SchemaInferrer().infer([{"a": "1", "b": "x"}, {"a": "2"}])
+    assert schema["columns"]["a"]["nullable"] is False
+    assert schema["columns"]["b"]["nullable"] is True
+
+
+# --- Coercion ---
+
+def test_rows_are_coerced_once():
+    rows = TypedRowStream([{"id": "1", "mass": "1.25", "flag": "true"}, {"id": "2", "mass": "3"}])
+
+    assert list(rows) == [
+        {"id": 1, "mass": 1.25, "flag": True},
+        {"id": 2, "mass": 3.0},
+    ]
+
+
+def test_values_after_sample_that_do_not_fit_are_kept_and_counted():
+    rows = [{"mass": "1.0"}, {"mass": "2.0"}, {"mass": "unknown"}]
+    typed = TypedRowStream(rows, sample_size=2)
+
+    assert list(typed)[-1] == {"mass": "unknown"}
+    assert typed.schema["columns"]["mass"]["coercion_failures"] == 1
+
+
+def test_nan_is_dropped_from_float_columns():
+    typed = TypedRowStream([{"mass": "1.0"}, {"mass": "NaN", "id": "x"}])
+    assert list(typed)[1] == {"id": "x"}
+
+
+def test_timestamps_are_canonical_iso_strings():
+    typed = TypedRowStream([{"t": "2020-01-02 03:04:05Z"}])
+    assert list(typed) == [{"t": "2020-01-02T03:04:05+00:00"}]
+
+
+@pytest.mark.parametrize("value", [1, 2.5])
+def test_already_typed_values_pass_through(value):
+    typed = TypedRowStream([{"v": value}])
+    assert list(typed) == [{"v": value}]
@@ -0,0 +1,21 @@
+from Backend.Normalization_Engine.schema_mapper import SchemaMapper, mapping_digest
+
+
+def test_profile_entries_extend_builtin_map():
+    mapper = SchemaMapper({"Dist LY": "distance_ly", "lat": "dec"})
+
+    mapped = mapper.map_schema({"Dist LY": 4.2, "LAT": 10, "Temp C": "", "lon": 5})
+
+    assert mapped["distance_ly"] == 4.2
+    assert mapped["dec"] == 10
+    assert mapped["longitude"] == 5
+    assert mapped["latitude"] is None and mapped["value"] is None
+    assert set(SchemaMapper.CANONICAL_SCHEMA) <= set(mapped)
+
+
+def test_compiled_mappers_are_shared_per_profile():
+    profile = {"planet": "exoplanet_id"}
+
+    assert SchemaMapper.for_field_map(profile) is SchemaMapper.for_field_map(dict(profile))
+    assert SchemaMapper.for_field_map(profile) is not SchemaMapper.for_field_map(None)
+    assert mapping_digest(None) is None
@@ -0,0 +1,29 @@
+from sqlalchemy import inspect, text
+
+from Backend.app.schema_upgrade import upgrade_schema
+from Backend.repository.raw_repo import RawDatasetRepository
+
+
+def test_missing_columns_are_added_to_existing_tables(sqlite_db):
+    db = sqlite_db
+
+    # raw_datasets as created before chunked storage
+    db.session.execute(text("DROP TABLE raw_datasets"))
+    db.session.execute(text(
+        "CREATE TABLE raw_datasets (id INTEGER PRIMARY KEY, user_id VARCHAR(100) NOT NULL, "
+        "source_id INTEGER NOT NULL, data JSON NOT NULL, created_at DATETIME, updated_at DATETIME)"
+    ))
+    db.session.execute(text("INSERT INTO raw_datasets (id, user_id, source_id, data) VALUES (1, 'u1', 1, '[]')"))
+    db.session.commit()
+
+    added = upgrade_schema()
+
+    assert "raw_datasets.storage_layout" in added
+    assert "raw_datasets.dedup_hits" in added
+
+    dataset = RawDatasetRepository(db).get_raw_dataset(1)
+    assert (dataset.storage_layout, dataset.dedup_hits) == ("inline", 0)
+    assert "ix_raw_datasets_content_hash" in {index["name"] for index in inspect(db.engine).get_indexes("raw_datasets")}
+
+    # Nothing left to do on a current schema
+    assert upgrade_schema() == []
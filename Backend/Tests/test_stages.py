@@ -0,0 +1,23 @@
+from Backend.Normalization_Engine.stages import StageCounter, sink, source, stage
+
+
+def test_stages_pull_one_batch_at_a_time_and_count_rows():
+    pulled = []
+
+    def batches():
+        for n in (3, 2, 4):
+            pulled.append(n)
+            yield list(range(n))
+
+    read, evens, write = StageCounter("read"), StageCounter("evens"), StageCounter("write")
+    stream = sink(write, stage(evens, source(read, batches()), lambda batch: [x for x in batch if x % 2 == 0]))
+
+    first = next(stream)
+
+    # Nothing past the first batch has been read yet
+    assert first == [0, 2] and pulled == [3]
+
+    assert list(stream) == [[0], [0, 2]]
+    assert read.to_dict()["rows_in"] == 9
+    assert (evens.batches, evens.rows_in, evens.rows_out) == (3, 9, 5)
+    assert write.rows_out == 5
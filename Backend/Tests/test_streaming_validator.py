@@ -0,0 +1,83 @@
+
+import io
+
+import pytest
+from Backend.Ingestion.stream_reader import DatasetValidationError, StreamingRowReader
+from Backend.Ingestion.validators import ErrorBudgetExceeded, StreamingValidator
+
+
+def _validate(content: bytes, file_type: str, max_errors=10):
+    validator = StreamingValidator(StreamingRowReader(io.BytesIO(content), file_type), max_errors)
+    return list(validator), validator.report
+
+
+# --- Bad rows ---
+
+def test_ragged_csv_rows_are_skipped_with_offsets():
+    rows, report = _validate(b"a,b\n1,2\n3\n4,5,6\n7,8\n", "CSV")
+
+    assert rows == [{"a": "1", "b": "2"}, {"a": "7", "b": "8"}]
+    assert report["invalid_rows"] == 2
+    assert [(e["line"], e["byte_offset"]) for e in report["errors"]] == [(3, 8), (4, 10)]
+
+
+def test_non_object_json_elements_are_reported():
+    rows, report = _validate(b'[{"a": 1},\n 2]', "JSON")
+
+    assert rows == [{"a": 1}]
+    assert report["errors"][0]["line"] == 2
+    assert report["rows_read"] == 2
+
+
+def test_error_budget_aborts_early():
+    content = b"a,b\n" + b"1\n" * 100000
+
+    with pytest.raises(ErrorBudgetExceeded) as excinfo:
+        _validate(content, "CSV", max_errors=3)
+
+    assert excinfo.value.report["aborted"] is True
+    assert excinfo.value.report["rows_read"] == 4
+
+
+# --- Column report ---
+
+def test_column_consistency_report():
+    _, report = _validate(b'{"a": 1}\n{"a": 2, "b": 3}\n', "JSON")
+
+    assert report["columns"] == ["a", "b"]
+    assert report["column_consistency"]["consistent"] is False
+    assert report["column_consistency"]["partial_columns"] == {"b": 1}
+
+
+# --- JSON envelopes and oversized values ---
+
+def test_envelope_data_array_is_streamed():
+    content = b'{"meta": {"rows": 3}, "data": [{"a": 1}, {"a": 2, "data": [1]}, {"a": 3}]}'
+    reader = StreamingRowReader(io.BytesIO(content), "JSON", block_size=8)
+
+    rows = iter(reader)
+
+    # The first row comes out before the rest of the array is read
+    assert next(rows) == {"a": 1}
+    assert reader.stream.tell() < len(content)
+    assert list(rows) == [{"a": 2, "data": [1]}, {"a": 3}]
+
+
+def test_oversized_value_stops_reading():
+    content = b'[{"a": 1},\n {"s": "' + b"x" * 100000 + b'"}]'
+    stream = io.BytesIO(content)
+
+    with pytest.raises(DatasetValidationError, match=r"line 2, byte 12"):
+        list(StreamingRowReader(stream, "JSON", block_size=1024, max_value_size=4096))
+
+    assert stream.tell() < 8192
+
+
+def test_malformed_value_fails_without_reading_to_the_end():
+    content = b'[{"a": tru}, ' + b'{"a": 2}, ' * 10000 + b'{"a": 3}]'
+    stream = io.BytesIO(content)
+
+    with pytest.raises(DatasetValidationError, match="Invalid JSON"):
+        list(StreamingRowReader(stream, "JSON", block_size=1024))
+
+    assert stream.tell() == 1024
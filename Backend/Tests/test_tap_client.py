@@ -0,0 +1,112 @@
+
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+import pytest
+from Backend.Ingestion.tap_client import TapClient, TapQueryError, build_adql
+
+
+VOTABLE = b"""<?xml version="1.0"?>
+<VOTABLE xmlns="http://www.ivoa.net/xml/VOTable/v1.3"><RESOURCE><TABLE>
+<FIELD name="source_id"/><FIELD name="ra"/>
+<DATA><TABLEDATA>
+<TR><TD>1</TD><TD>10.5</TD></TR>
+<TR><TD>2</TD><TD></TD></TR>
+</TABLEDATA></DATA></TABLE></RESOURCE></VOTABLE>"""
+
+
+class _FakeTap(BaseHTTPRequestHandler):
+    """
+    Minimal UWS server: every job is EXECUTING on the first poll, then
+    finishes (or fails when the query mentions "broken").
+    """
+
+    jobs = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, code, body=b"", headers=None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"])).decode())
+        job_id = str(len(self.jobs) + 1)
+        self.jobs[job_id] = {"query": form["QUERY"][0], "format": form["FORMAT"][0], "polls": 0}
+        self._reply(303, headers={"Location": f"/tap/async/{job_id}"})
+
+    def do_GET(self):
+        job = self.jobs[self.path.split("/")[3]]
+
+        if self.path.endswith("/phase"):
+            job["polls"] += 1
+            if job["polls"] == 1:
+                phase = "EXECUTING"
+            else:
+                phase = "ERROR" if "broken" in job["query"] else "COMPLETED"
+            self._reply(200, phase.encode())
+
+        elif self.path.endswith("/error"):
+            self._reply(200, b"Unknown table 'broken'")
+
+        elif job["format"] == "votable":
+            self._reply(200, VOTABLE)
+
+        else:
+            rows = "".join(f"{i},{i * 0.5}\n" for i in range(10000))
+            self._reply(200, ("source_id,ra\n" + rows).encode())
+
+    def do_DELETE(self):
+        self.jobs.pop(self.path.split("/")[3], None)
+        self._reply(204)
+
+
+@pytest.fixture
+def tap_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeTap)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/tap"
+    server.shutdown()
+
+
+# --- ADQL ---
+
+def test_columns_and_cone_are_pushed_into_adql():
+    adql = build_adql("gaiadr3.gaia_source", ["source_id", "ra"], cone={"ra": 10, "dec": -5, "radius": 0.5}, limit=10)
+
+    assert adql == (
+        "SELECT TOP 10 source_id, ra FROM gaiadr3.gaia_source WHERE "
+        "1 = CONTAINS(POINT('ICRS', ra, dec), CIRCLE('ICRS', 10.0, -5.0, 0.5))"
+    )
+
+
+def test_invalid_identifiers_are_rejected():
+    with pytest.raises(ValueError):
+        build_adql("gaia_source; DROP TABLE x", ["ra"])
+
+
+# --- Async jobs ---
+
+def test_csv_results_are_streamed_and_job_deleted(tap_url):
+    rows = TapClient(tap_url, poll_interval=0.01).query("SELECT source_id, ra FROM t")
+
+    first = next(rows)
+    assert first == {"source_id": "0", "ra": "0.0"}
+    assert sum(1 for _ in rows) == 9999
+    assert _FakeTap.jobs == {}
+
+
+def test_votable_results(tap_url):
+    rows = list(TapClient(tap_url, poll_interval=0.01).query("SELECT * FROM t", "votable"))
+    assert rows == [{"source_id": "1", "ra": "10.5"}, {"source_id": "2", "ra": None}]
+
+
+def test_failed_job_raises_with_server_message(tap_url):
+    with pytest.raises(TapQueryError, match="Unknown table"):
+        list(TapClient(tap_url, poll_interval=0.01).query("SELECT * FROM broken"))
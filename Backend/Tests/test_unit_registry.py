@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from Backend.Normalization_Engine.unit_converter import UnitConverter
+from Backend.Normalization_Engine.unit_registry import DEFAULT_REGISTRY, UnitRegistry
+
+
+def test_composes_conversions_along_the_graph():
+    # yr -> d -> s and pc -> m -> AU are never declared directly
+    assert DEFAULT_REGISTRY.convert(1.0, "yr", "s") == pytest.approx(31557600.0)
+    assert DEFAULT_REGISTRY.convert(1.0, "pc", "AU") == pytest.approx(206264.80625)
+    assert DEFAULT_REGISTRY.convert(212.0, "F", "K") == pytest.approx(373.15)
+
+    assert DEFAULT_REGISTRY.conversion("ly", "pc") is DEFAULT_REGISTRY.conversion("lyr", "parsec")
+    assert DEFAULT_REGISTRY.conversion("Jy", "kg") is None
+
+
+def test_applies_to_whole_columns():
+    column = np.array([0.0, 100.0, -40.0])
+    assert DEFAULT_REGISTRY.convert(column, "C", "F").tolist() == pytest.approx([32.0, 212.0, -40.0])
+
+
+def test_relating_different_dimensions_is_rejected():
+    registry = UnitRegistry()
+    registry.define("m", "length", standard=True)
+    registry.define("s", "time", standard=True)
+
+    with pytest.raises(ValueError):
+        registry.relate("m", "s", 1.0)
+
+
+def test_converter_uses_standard_unit_of_dimension():
+    record = UnitConverter().convert_units({"value": "2", "unit": "M_jup"})
+    assert record["unit"] == "kg" and record["value"] == pytest.approx(3.79626e27)
+
+    unknown = UnitConverter().convert_units({"value": "2", "unit": "furlong"})
+    assert unknown == {"value": "2", "unit": "furlong"}
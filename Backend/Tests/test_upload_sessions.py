@@ -0,0 +1,87 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+
+from Backend.Ingestion.upload_sessions import UploadSessionError, UploadSessionStore
+
+
+def _age(store, upload_id, seconds):
+    past = time.time() - seconds
+    os.utime(os.path.join(store.root, upload_id), (past, past))
+
+
+def test_purge_keeps_sessions_with_recent_chunk_writes(tmp_path):
+    store = UploadSessionStore(str(tmp_path))
+    active = store.create("u1", "stars.csv", 1)["upload_id"]
+    idle = store.create("u1", "stars.csv", 1)["upload_id"]
+
+    # Both started two hours ago; only one is still receiving chunks
+    _age(store, active, 7200)
+    _age(store, idle, 7200)
+
+    payload = b"a,b\n1,2\n"
+    store.write_chunk(active, "u1", 0, io.BytesIO(payload), hashlib.sha256(payload).hexdigest())
+
+    assert store.purge_expired(3600) == 1
+    assert os.path.isdir(os.path.join(store.root, active))
+    assert not os.path.exists(os.path.join(store.root, idle))
+
+
+def _write(store, upload_id, chunk_no, payload):
+    return store.write_chunk(upload_id, "u1", chunk_no, io.BytesIO(payload), hashlib.sha256(payload).hexdigest())
+
+
+def _spooled_parts(store, upload_id):
+    return sorted(os.listdir(os.path.join(store.root, upload_id, "chunks")))
+
+
+def test_oversized_chunk_is_cut_off(tmp_path, monkeypatch):
+    monkeypatch.setattr("Backend.Ingestion.upload_sessions.READ_BLOCK_SIZE", 4)
+    store = UploadSessionStore(str(tmp_path), max_chunk_bytes=10)
+    upload_id = store.create("u1", "stars.csv", 1)["upload_id"]
+
+    with pytest.raises(UploadSessionError) as excinfo:
+        _write(store, upload_id, 0, b"x" * 1000)
+
+    assert excinfo.value.status_code == 413
+    assert "exceeds 10 bytes" in str(excinfo.value)
+    assert _spooled_parts(store, upload_id) == []
+    assert _write(store, upload_id, 0, b"x" * 10)["size"] == 10
+
+
+def test_chunks_may_not_exceed_the_declared_total_size(tmp_path):
+    store = UploadSessionStore(str(tmp_path), max_chunk_bytes=100, min_chunk_bytes=10)
+    upload_id = store.create("u1", "stars.csv", 1, total_size=25)["upload_id"]
+
+    _write(store, upload_id, 0, b"a" * 10)
+    _write(store, upload_id, 1, b"b" * 10)
+
+    with pytest.raises(UploadSessionError) as excinfo:
+        _write(store, upload_id, 2, b"c" * 6)
+
+    assert excinfo.value.status_code == 413
+    assert "total_size" in str(excinfo.value)
+    assert _spooled_parts(store, upload_id) == ["0.part", "1.part"]
+
+    # Retrying a chunk replaces it rather than adding to the total
+    _write(store, upload_id, 1, b"B" * 10)
+    _write(store, upload_id, 2, b"c" * 5)
+    assert store.status(upload_id, "u1")["bytes_received"] == 25
+
+
+def test_chunk_numbers_are_bounded_by_the_declared_total_size(tmp_path):
+    store = UploadSessionStore(str(tmp_path), max_chunk_bytes=100, min_chunk_bytes=10)
+    upload_id = store.create("u1", "stars.csv", 1, total_size=25)["upload_id"]
+
+    # ceil(25 / 10) = 3 chunks: 0, 1 and 2
+    with pytest.raises(UploadSessionError, match="out of range"):
+        _write(store, upload_id, 3, b"c")
+
+    with pytest.raises(UploadSessionError, match="out of range"):
+        _write(store, upload_id, 10 ** 6, b"c")
+
+    assert _write(store, upload_id, 2, b"c")["chunk_no"] == 2
+    assert _spooled_parts(store, upload_id) == ["2.part"]
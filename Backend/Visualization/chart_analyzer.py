@@ -17,7 +17,11 @@ class ChartAnalyzer:
         for col in df.columns:
             # Try to convert to numeric, if successful and not all NaN, treat as numeric
             try:
-                numeric_series = pd.to_numeric(df[col], errors='coerce')
+                # Columns typed at ingest arrive with a numeric dtype: no re-parsing
+                if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+                    numeric_series = df[col]
+                else:
+                    numeric_series = pd.to_numeric(df[col], errors='coerce')
                 if numeric_series.notna().any():
                     # If the column has at least one non-null numeric value, consider it numeric
                     # Also, if the column is all zeros (sum of absolute values == 0), skip it
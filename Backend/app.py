@@ -4,6 +4,7 @@ from dotenv import load_dotenv
 
 from app.extionsions import db
 from app.config import Config
+from app.schema_upgrade import upgrade_schema
 
 # Blueprints
 from Api_http_level.auth_routes import auth_bp
@@ -32,9 +33,11 @@ def create_app():
     app.register_blueprint(visualization_bp)
 
 
-    # Auto-create tables (development only)
+    # Auto-create tables (development only), then add columns / indexes
+    # that existing tables are missing
     with app.app_context():
         db.create_all()
+        upgrade_schema()
 
     return app
 
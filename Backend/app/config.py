@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 
 class Config:
@@ -22,3 +23,34 @@ class Config:
     )
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # -------------------------------------------------
+    # Ingestion
+    # -------------------------------------------------
+    INGEST_BATCH_SIZE = 5000   # rows persisted per chunk in streaming mode
+    INGEST_PARSE_WORKERS = None   # process pool size for archive uploads (None = all cores)
+    INGEST_JOB_WORKERS = 4   # background threads running async ingestion jobs
+    INGEST_ERROR_BUDGET = 1000   # bad rows skipped before a streamed upload is aborted
+
+    # Admission control for ingestion routes (beyond these limits: queue, then 429)
+    INGEST_MAX_CONCURRENT = 8   # ingests running at once, all users
+    INGEST_MAX_CONCURRENT_PER_USER = 2
+    INGEST_MAX_BYTES_IN_FLIGHT = 2 * 1024 ** 3   # request bytes being ingested, all users
+    INGEST_MAX_BYTES_PER_USER = 512 * 1024 ** 2
+    INGEST_QUEUE_TIMEOUT = 15   # seconds a request may wait for a slot
+    INGEST_MAX_QUEUE = 32   # waiting requests before new ones get 429 right away
+
+    # Resumable uploads: chunks are spooled here until finalize
+    UPLOAD_SPOOL_DIR = os.getenv(
+        "UPLOAD_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "nexus_uploads")
+    )
+    UPLOAD_SESSION_TTL_HOURS = 24
+    UPLOAD_MAX_CHUNK_BYTES = 64 * 1024 ** 2   # larger chunks are cut off with 413
+    UPLOAD_MIN_CHUNK_BYTES = 1024 ** 2   # every chunk but the last; bounds chunk numbers by total_size
+
+    # -------------------------------------------------
+    # Normalization
+    # -------------------------------------------------
+    NORMALIZE_WORKERS = None   # default and cap of the normalization pool (None = serial by default, capped at the CPU count)
+    NORMALIZE_CHUNK_SIZE = 20000   # raw rows per process-pool task
+    NORMALIZE_PARALLEL_MIN_ROWS = 100000   # smaller datasets are normalized serially
@@ -0,0 +1,56 @@
+from typing import List
+
+from sqlalchemy import inspect, literal
+
+from app.extionsions import db
+
+
+def upgrade_schema() -> List[str]:
+    """
+    Bring tables that already exist up to the models.
+
+    db.create_all() only creates missing tables, so columns and indexes
+    added to an existing model never reach a deployed database. This adds
+    them (ALTER TABLE ... ADD COLUMN, then CREATE INDEX), and does nothing
+    when the schema is current, so it is safe to run at every startup.
+    Columns are never dropped or altered.
+
+    Returns the columns added, as "table.column".
+    """
+    engine = db.engine
+    dialect = engine.dialect
+    quote = dialect.identifier_preparer.quote
+    added = []
+
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        existing_tables = set(inspector.get_table_names())
+
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                ddl = f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column.type.compile(dialect=dialect)}"
+
+                default = column.default
+                if default is not None and default.is_scalar:
+                    value = literal(default.arg, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+                    ddl += f" DEFAULT {value}"
+
+                    # Existing rows get the default, so the constraint holds
+                    if not column.nullable:
+                        ddl += " NOT NULL"
+
+                conn.exec_driver_sql(ddl)
+                added.append(f"{table.name}.{column.name}")
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+    return added
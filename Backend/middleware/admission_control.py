@@ -0,0 +1,355 @@
+import math
+import threading
+import time
+from functools import wraps
+from typing import Any, Dict, Optional
+
+from flask import current_app, g, jsonify, request
+
+
+# Defaults, overridden by INGEST_* settings in app config
+DEFAULTS = {
+    "INGEST_MAX_CONCURRENT": 8,
+    "INGEST_MAX_CONCURRENT_PER_USER": 2,
+    "INGEST_MAX_BYTES_IN_FLIGHT": 2 * 1024 ** 3,
+    "INGEST_MAX_BYTES_PER_USER": 512 * 1024 ** 2,
+    "INGEST_QUEUE_TIMEOUT": 15,
+    "INGEST_MAX_QUEUE": 32,
+}
+
+# Bounds of the Retry-After hint, in seconds
+MIN_RETRY_AFTER = 1
+MAX_RETRY_AFTER = 300
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when an ingest cannot be admitted; carries a Retry-After hint.
+    """
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionTicket:
+    """
+    Slot (and bytes) held by one admitted ingest until released.
+    Releasing is idempotent, so the request and a background job can both
+    try it.
+    """
+
+    def __init__(self, controller: "AdmissionController", user_id: str, nbytes: int, counted: bool):
+        self.controller = controller
+        self.user_id = user_id
+        self.nbytes = nbytes
+        self.counted = counted
+        self.admitted_at = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        self.controller.release(self)
+
+
+class AdmissionController:
+    """
+    Limits concurrent ingests and request bytes in flight, per user and
+    globally.
+
+    Work beyond the limits waits in a FIFO queue for up to queue_timeout
+    seconds; when the queue is full, or the wait runs out, the ingest is
+    rejected with a Retry-After estimate. One user can therefore hold at
+    most max_per_user slots, and other users' ingests are admitted as soon
+    as global capacity frees up.
+
+    A single request larger than a byte limit is still admitted when
+    nothing else is in flight for that limit, so it can never deadlock.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULTS["INGEST_MAX_CONCURRENT"],
+        max_per_user: int = DEFAULTS["INGEST_MAX_CONCURRENT_PER_USER"],
+        max_bytes: int = DEFAULTS["INGEST_MAX_BYTES_IN_FLIGHT"],
+        max_bytes_per_user: int = DEFAULTS["INGEST_MAX_BYTES_PER_USER"],
+        queue_timeout: float = DEFAULTS["INGEST_QUEUE_TIMEOUT"],
+        max_queue: int = DEFAULTS["INGEST_MAX_QUEUE"],
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_bytes = max_bytes
+        self.max_bytes_per_user = max_bytes_per_user
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+
+        self._condition = threading.Condition()
+
+        self._active = 0
+        self._bytes = 0
+        self._user_active: Dict[str, int] = {}
+        self._user_bytes: Dict[str, int] = {}
+
+        # FIFO of waiting (sequence, user_id, nbytes, counted)
+        self._queue: list = []
+        self._sequence = 0
+
+        # Exponentially weighted mean ingest duration, for Retry-After
+        self._mean_seconds = 5.0
+
+        self._counters = {"admitted": 0, "queued": 0, "rejected": 0}
+        self._wait_seconds_total = 0.0
+
+    # -------------------------------------------------------
+    # ACQUIRE / RELEASE
+    # -------------------------------------------------------
+
+    def acquire(self, user_id: str, nbytes: int = 0, counted: bool = True, timeout: Optional[float] = None) -> AdmissionTicket:
+        """
+        Admit an ingest, waiting in the queue if needed.
+        counted=False only reserves bytes (e.g. resumable chunk PUTs).
+        """
+
+        timeout = self.queue_timeout if timeout is None else timeout
+        nbytes = max(int(nbytes or 0), 0)
+
+        with self._condition:
+            # Waiters that fit now go first; ones blocked by their own user's limit do not hold others back
+            if self._first_admissible() is None and self._fits(user_id, nbytes, counted):
+                return self._admit(user_id, nbytes, counted, waited=0.0)
+
+            if len(self._queue) >= self.max_queue or timeout <= 0:
+                self._counters["rejected"] += 1
+                raise AdmissionRejected("Ingestion capacity exhausted", self._retry_after())
+
+            self._sequence += 1
+            entry = (self._sequence, user_id, nbytes, counted)
+            self._queue.append(entry)
+            self._counters["queued"] += 1
+
+            started = time.monotonic()
+            deadline = started + timeout
+
+            try:
+                while True:
+                    if self._first_admissible() is entry:
+                        self._queue.remove(entry)
+                        # Later waiters may fit as well
+                        self._condition.notify_all()
+                        return self._admit(user_id, nbytes, counted, waited=time.monotonic() - started)
+
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        self._queue.remove(entry)
+                        self._counters["rejected"] += 1
+                        self._condition.notify_all()
+                        raise AdmissionRejected("Timed out waiting for ingestion capacity", self._retry_after())
+
+                    self._condition.wait(remaining)
+
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                raise
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        with self._condition:
+            if ticket.released:
+                return
+            ticket.released = True
+
+            user_id = ticket.user_id
+
+            if ticket.counted:
+                self._active -= 1
+                self._user_active[user_id] -= 1
+                if not self._user_active[user_id]:
+                    del self._user_active[user_id]
+
+                duration = time.monotonic() - ticket.admitted_at
+                self._mean_seconds = 0.8 * self._mean_seconds + 0.2 * duration
+
+            if ticket.nbytes:
+                self._bytes -= ticket.nbytes
+                self._user_bytes[user_id] -= ticket.nbytes
+                if not self._user_bytes[user_id]:
+                    del self._user_bytes[user_id]
+
+            self._condition.notify_all()
+
+    # -------------------------------------------------------
+    # METRICS
+    # -------------------------------------------------------
+
+    def snapshot(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Current load and counters; per-user figures for one user, or for
+        every user when user_id is None.
+        """
+
+        with self._condition:
+            users = [user_id] if user_id is not None else sorted(
+                set(self._user_active) | set(self._user_bytes) | {entry[1] for entry in self._queue}
+            )
+
+            admitted = self._counters["admitted"]
+
+            return {
+                "active_ingests": self._active,
+                "bytes_in_flight": self._bytes,
+                "queue_depth": len(self._queue),
+                "limits": {
+                    "max_concurrent": self.max_concurrent,
+                    "max_concurrent_per_user": self.max_per_user,
+                    "max_bytes_in_flight": self.max_bytes,
+                    "max_bytes_per_user": self.max_bytes_per_user,
+                    "queue_timeout": self.queue_timeout,
+                    "max_queue": self.max_queue,
+                },
+                "totals": dict(self._counters),
+                "mean_wait_ms": round(1000 * self._wait_seconds_total / admitted, 1) if admitted else 0.0,
+                "mean_ingest_seconds": round(self._mean_seconds, 3),
+                "users": {
+                    user: {
+                        "active_ingests": self._user_active.get(user, 0),
+                        "bytes_in_flight": self._user_bytes.get(user, 0),
+                        "queued": sum(1 for entry in self._queue if entry[1] == user),
+                    }
+                    for user in users
+                },
+            }
+
+    # -------------------------------------------------------
+    # INTERNALS (called with the condition held)
+    # -------------------------------------------------------
+
+    def _fits(self, user_id: str, nbytes: int, counted: bool) -> bool:
+        if counted:
+            if self._active >= self.max_concurrent:
+                return False
+            if self._user_active.get(user_id, 0) >= self.max_per_user:
+                return False
+
+        if self._bytes and self._bytes + nbytes > self.max_bytes:
+            return False
+
+        user_bytes = self._user_bytes.get(user_id, 0)
+        if user_bytes and user_bytes + nbytes > self.max_bytes_per_user:
+            return False
+
+        return True
+
+    def _first_admissible(self):
+        """
+        Oldest waiter that fits now. A user at their own limit does not
+        block the queue for other users.
+        """
+        for entry in self._queue:
+            if self._fits(entry[1], entry[2], entry[3]):
+                return entry
+        return None
+
+    def _admit(self, user_id: str, nbytes: int, counted: bool, waited: float) -> AdmissionTicket:
+        if counted:
+            self._active += 1
+            self._user_active[user_id] = self._user_active.get(user_id, 0) + 1
+
+        if nbytes:
+            self._bytes += nbytes
+            self._user_bytes[user_id] = self._user_bytes.get(user_id, 0) + nbytes
+
+        self._counters["admitted"] += 1
+        self._wait_seconds_total += waited
+
+        return AdmissionTicket(self, user_id, nbytes, counted)
+
+    def _retry_after(self) -> int:
+        # Slots free up at roughly max_concurrent per mean ingest duration
+        waves = (len(self._queue) + 1) / max(self.max_concurrent, 1)
+        estimate = math.ceil(self._mean_seconds * max(waves, 1))
+        return min(max(estimate, MIN_RETRY_AFTER), MAX_RETRY_AFTER)
+
+
+# -------------------------------------------------------
+# FLASK INTEGRATION
+# -------------------------------------------------------
+
+def get_admission_controller(app=None) -> AdmissionController:
+    """
+    The app's controller, created from its INGEST_* config on first use.
+    """
+
+    app = app or current_app._get_current_object()
+    controller = app.extensions.get("admission_control")
+
+    if controller is None:
+        config = {key: app.config.get(key, default) for key, default in DEFAULTS.items()}
+
+        controller = app.extensions.setdefault("admission_control", AdmissionController(
+            max_concurrent=config["INGEST_MAX_CONCURRENT"],
+            max_per_user=config["INGEST_MAX_CONCURRENT_PER_USER"],
+            max_bytes=config["INGEST_MAX_BYTES_IN_FLIGHT"],
+            max_bytes_per_user=config["INGEST_MAX_BYTES_PER_USER"],
+            queue_timeout=config["INGEST_QUEUE_TIMEOUT"],
+            max_queue=config["INGEST_MAX_QUEUE"],
+        ))
+
+    return controller
+
+
+def admission_controlled(counted: bool = True):
+    """
+    Route decorator (inside jwt_required) admitting the request through the
+    app's AdmissionController; over capacity it answers 429 + Retry-After.
+
+    The ticket is released when the view returns, unless the view handed it
+    to background work with detach_admission_ticket().
+    """
+
+    def decorator(f):
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+
+            controller = get_admission_controller()
+            user_id = g.get("user_id") or request.remote_addr or "anonymous"
+
+            try:
+                ticket = controller.acquire(user_id, request.content_length or 0, counted=counted)
+
+            except AdmissionRejected as e:
+                response = jsonify({
+                    "status": "error",
+                    "message": str(e),
+                    "retry_after": e.retry_after
+                })
+                response.headers["Retry-After"] = str(e.retry_after)
+                return response, 429
+
+            g.admission_ticket = ticket
+
+            try:
+                return f(*args, **kwargs)
+
+            finally:
+                if g.get("admission_ticket") is ticket:
+                    ticket.release()
+
+        return decorated
+
+    return decorator
+
+
+def current_admission_ticket() -> Optional[AdmissionTicket]:
+    return g.get("admission_ticket")
+
+
+def detach_admission_ticket() -> Optional[AdmissionTicket]:
+    """
+    Keep the current request's ticket held after the view returns; whoever
+    took it over (e.g. a background job) must release it.
+    """
+
+    ticket = g.get("admission_ticket")
+    g.admission_ticket = None
+    return ticket
@@ -0,0 +1,424 @@
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import JSON
+
+from Models.raw_dataset import RawDataset
+from Models.raw_dataset_chunk import RawDatasetChunk
+from Models.normalized_dataset import NormalizedDataset
+from Models.normalized_dataset_chunk import NormalizedDatasetChunk
+from Models.metadata import Metadata
+from repository.chunking import DEFAULT_CHUNK_SIZE, chunks_digest, rows_checksum
+
+logger = logging.getLogger(__name__)
+
+
+# Chunks sent per executemany round trip on the non-PostgreSQL path
+EXECUTEMANY_BATCH = 20
+
+# Characters handed to psycopg2 per COPY read
+COPY_READ_SIZE = 1024 * 1024
+
+
+class BulkLoader:
+    """
+    Bulk loading of row-level records into chunk tables.
+
+    - PostgreSQL (psycopg2): COPY ... FROM STDIN, streamed from a generator
+    - Other dialects (SQLite for local runs): batched executemany inserts
+
+    A dataset, all of its chunks and its metadata are written in a single
+    transaction. Rows may be any iterable, so a streaming source is loaded
+    with memory bounded by one chunk.
+    """
+
+    def __init__(
+        self,
+        db,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ):
+        self.db = db
+        self.chunk_size = chunk_size
+
+        # Called with the running row count after each chunk is produced
+        self.progress = progress
+
+    # -------------------------------------------------------
+    # RAW DATASETS
+    # -------------------------------------------------------
+
+    def load_raw_dataset(
+        self,
+        user_id: str,
+        source_id: int,
+        rows: Iterable[Dict[str, Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a chunked raw dataset from rows. Returns load statistics.
+        """
+        return self._load_raw(
+            user_id, source_id, metadata, content_hash,
+            lambda dataset_id: self.load_chunks(
+                RawDatasetChunk.__table__, "raw_dataset_id", dataset_id, rows
+            ),
+        )
+
+    def load_raw_dataset_pages(
+        self,
+        user_id: str,
+        source_id: int,
+        pages: Iterable[Tuple[int, List[Dict[str, Any]]]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a chunked raw dataset from (page_no, rows) pairs arriving in
+        any order; page N is stored as chunk N, so order is kept on read.
+        """
+        return self._load_raw(
+            user_id, source_id, metadata, None,
+            lambda dataset_id: self.load_pages(
+                RawDatasetChunk.__table__, "raw_dataset_id", dataset_id, pages
+            ),
+        )
+
+    def _load_raw(self, user_id, source_id, metadata, content_hash, write_chunks) -> Dict[str, Any]:
+        started = time.perf_counter()
+        session = self.db.session
+
+        try:
+            dataset = RawDataset(
+                user_id=user_id,
+                source_id=source_id,
+                data=[],
+                storage_layout="chunked",
+                row_count=0,
+                content_hash=content_hash,
+                dedup_hits=0,
+                created_at=datetime.utcnow(),
+            )
+            session.add(dataset)
+            session.flush()
+
+            row_count, chunk_count = write_chunks(dataset.id)
+            dataset.row_count = row_count
+
+            if metadata:
+                session.add(Metadata(
+                    raw_dataset_id=dataset.id,
+                    meta_data=metadata,
+                    created_at=datetime.utcnow(),
+                ))
+
+            session.commit()
+
+        except Exception:
+            session.rollback()
+            raise
+
+        return self._stats("dataset_id", dataset.id, row_count, chunk_count, started)
+
+    # -------------------------------------------------------
+    # NORMALIZED DATASETS
+    # -------------------------------------------------------
+
+    def load_normalized_dataset(
+        self,
+        raw_dataset_id: int,
+        rows: Iterable[Dict[str, Any]],
+        normalization_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a chunked normalized dataset from rows. Returns load statistics.
+        """
+        return self._load_normalized(
+            raw_dataset_id, normalization_version, metadata,
+            lambda dataset_id: self.load_chunks(
+                NormalizedDatasetChunk.__table__, "normalized_dataset_id", dataset_id, rows
+            ),
+        )
+
+    def load_normalized_dataset_sources(
+        self,
+        raw_dataset_id: int,
+        chunks: Iterable[Tuple[int, List[Dict[str, Any]], List[str], str]],
+        normalization_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        mapping_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a normalized dataset chunked along its raw dataset, from
+        (chunk_no, rows, fingerprints, source_checksum) tuples.
+        """
+        source_checksums: List[str] = []
+
+        def tracked_chunks():
+            for chunk in chunks:
+                source_checksums.append(chunk[3])
+                yield chunk
+
+        return self._load_normalized(
+            raw_dataset_id, normalization_version, metadata,
+            lambda dataset_id: self.load_source_chunks(dataset_id, tracked_chunks()),
+            input_hash=lambda: chunks_digest(source_checksums),
+            mapping_hash=mapping_hash,
+        )
+
+    def _load_normalized(
+        self,
+        raw_dataset_id,
+        normalization_version,
+        metadata,
+        write_chunks,
+        input_hash=None,
+        mapping_hash=None,
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
+        session = self.db.session
+
+        try:
+            dataset = NormalizedDataset(
+                raw_dataset_id=raw_dataset_id,
+                standardized_payload=[],
+                storage_layout="chunked",
+                row_count=0,
+                normalization_version=normalization_version,
+                mapping_hash=mapping_hash,
+                normalized_at=datetime.utcnow(),
+            )
+            session.add(dataset)
+            session.flush()
+
+            row_count, chunk_count = write_chunks(dataset.id)
+            dataset.row_count = row_count
+
+            if input_hash is not None:
+                dataset.input_hash = input_hash()
+
+            if metadata:
+                session.add(Metadata(
+                    normalized_dataset_id=dataset.id,
+                    meta_data=metadata,
+                    created_at=datetime.utcnow(),
+                ))
+
+            session.commit()
+
+        except Exception:
+            session.rollback()
+            raise
+
+        return self._stats("normalized_dataset_id", str(dataset.id), row_count, chunk_count, started)
+
+    # -------------------------------------------------------
+    # CHUNK LOADING (inside the caller's transaction)
+    # -------------------------------------------------------
+
+    def load_chunks(
+        self,
+        table,
+        key_column: str,
+        key_value: Any,
+        rows: Iterable[Dict[str, Any]],
+        first_chunk_no: int = 0,
+    ) -> tuple:
+        """
+        Write rows as chunk records of `table` without committing.
+        Returns (row_count, chunk_count).
+        """
+        counts = {"rows": 0, "chunks": 0}
+
+        def records() -> Iterator[Dict[str, Any]]:
+            iterator = iter(rows)
+            chunk_no = first_chunk_no
+
+            while True:
+                chunk_rows = list(islice(iterator, self.chunk_size))
+                if not chunk_rows:
+                    return
+
+                yield self._chunk_record(key_column, key_value, chunk_no, chunk_rows, counts)
+                chunk_no += 1
+
+        self._write_records(table, records())
+
+        return counts["rows"], counts["chunks"]
+
+    def load_pages(
+        self,
+        table,
+        key_column: str,
+        key_value: Any,
+        pages: Iterable[Tuple[int, List[Dict[str, Any]]]],
+    ) -> tuple:
+        """
+        Write each (page_no, rows) pair as chunk page_no without committing.
+        Empty pages are skipped. Returns (row_count, chunk_count).
+        """
+        counts = {"rows": 0, "chunks": 0}
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for page_no, page_rows in pages:
+                if page_rows:
+                    yield self._chunk_record(key_column, key_value, page_no, page_rows, counts)
+
+        self._write_records(table, records())
+
+        return counts["rows"], counts["chunks"]
+
+    def load_source_chunks(
+        self,
+        normalized_dataset_id: Any,
+        chunks: Iterable[Tuple[int, List[Dict[str, Any]], List[str], str]],
+    ) -> tuple:
+        """
+        Write (chunk_no, rows, fingerprints, source_checksum) tuples as
+        normalized chunks without committing. Empty chunks are kept, so
+        every raw chunk has a counterpart. Returns (row_count, chunk_count).
+        """
+        counts = {"rows": 0, "chunks": 0}
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for chunk_no, chunk_rows, fingerprints, source_checksum in chunks:
+                record = self._chunk_record("normalized_dataset_id", normalized_dataset_id, chunk_no, chunk_rows, counts)
+                record["fingerprints"] = fingerprints
+                record["source_checksum"] = source_checksum
+                yield record
+
+        self._write_records(NormalizedDatasetChunk.__table__, records())
+
+        return counts["rows"], counts["chunks"]
+
+    def _chunk_record(self, key_column, key_value, chunk_no, chunk_rows, counts) -> Dict[str, Any]:
+        counts["rows"] += len(chunk_rows)
+        counts["chunks"] += 1
+
+        if self.progress is not None:
+            self.progress(counts["rows"])
+
+        return {
+            key_column: key_value,
+            "chunk_no": chunk_no,
+            "row_count": len(chunk_rows),
+            "rows": chunk_rows,
+            "checksum": rows_checksum(chunk_rows),
+        }
+
+    def _write_records(self, table, records: Iterator[Dict[str, Any]]) -> None:
+        if self.uses_copy():
+            self._copy_records(table, records)
+        else:
+            self._executemany_records(table, records)
+
+    def uses_copy(self) -> bool:
+        dialect = self.db.session.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    def _copy_records(self, table, records: Iterator[Dict[str, Any]]) -> None:
+        columns = [column.name for column in table.columns]
+        json_columns = {
+            column.name for column in table.columns
+            if isinstance(column.type, JSON)
+        }
+
+        sql = (
+            f"COPY {table.name} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv)"
+        )
+
+        def lines() -> Iterator[str]:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+
+            for record in records:
+                writer.writerow([
+                    _copy_value(record.get(name), name in json_columns)
+                    for name in columns
+                ])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+        # Reuse the session's connection so COPY joins its transaction
+        dbapi_connection = self.db.session.connection().connection
+        cursor = dbapi_connection.cursor()
+
+        try:
+            cursor.copy_expert(sql, _LineStream(lines()), size=COPY_READ_SIZE)
+        finally:
+            cursor.close()
+
+    def _executemany_records(self, table, records: Iterator[Dict[str, Any]]) -> None:
+        while True:
+            batch = list(islice(records, EXECUTEMANY_BATCH))
+            if not batch:
+                return
+            self.db.session.execute(table.insert(), batch)
+
+    def _stats(self, id_key: str, dataset_id: Any, row_count: int, chunk_count: int, started: float) -> Dict[str, Any]:
+        seconds = time.perf_counter() - started
+        rows_per_sec = row_count / seconds if seconds > 0 else float(row_count)
+        method = "copy" if self.uses_copy() else "executemany"
+
+        logger.info(
+            "Bulk loaded %d rows (%d chunks) in %.2fs, %.0f rows/s via %s",
+            row_count, chunk_count, seconds, rows_per_sec, method,
+        )
+
+        return {
+            id_key: dataset_id,
+            "rows": row_count,
+            "chunks": chunk_count,
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(rows_per_sec, 1),
+            "method": method,
+        }
+
+
+def _copy_value(value: Any, is_json: bool) -> str:
+    # An unquoted empty field is NULL in COPY's CSV format
+    if value is None:
+        return ""
+
+    if is_json:
+        return json.dumps(value, default=str)
+
+    return str(value)
+
+
+class _LineStream:
+    """
+    Minimal read()-able file object over an iterator of text lines,
+    used to feed COPY FROM STDIN without building the payload in memory.
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._line = ""
+        self._pos = 0
+
+    def read(self, size: int = -1) -> str:
+        if size < 0:
+            rest = self._line[self._pos:] + "".join(self._lines)
+            self._line, self._pos = "", 0
+            return rest
+
+        if self._pos >= len(self._line):
+            self._line = next(self._lines, "")
+            self._pos = 0
+
+        data = self._line[self._pos:self._pos + size]
+        self._pos += len(data)
+        return data
+
+    def readline(self, size: int = -1) -> str:
+        return self.read(size)
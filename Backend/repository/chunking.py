@@ -0,0 +1,38 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+# Rows stored per chunk row (raw_dataset_chunks / normalized_dataset_chunks)
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def rows_checksum(rows: List[Dict[str, Any]]) -> str:
+    """
+    Stable content hash of a list of rows (key order independent).
+    """
+    payload = json.dumps(rows, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chunks_digest(checksums: Iterable[str]) -> str:
+    """
+    Content hash of a whole chunked dataset from its ordered chunk checksums.
+    """
+    return hashlib.sha256("\n".join(checksums).encode("utf-8")).hexdigest()
+
+
+def row_fingerprints(rows: List[Any]) -> List[str]:
+    """
+    Short content hash of each row. Rows are hashed as decoded from storage,
+    so they are compared key order and all; a row whose keys were only
+    reordered counts as changed.
+    """
+    blake2b = hashlib.blake2b
+
+    return [blake2b(repr(row).encode("utf-8"), digest_size=12).hexdigest() for row in rows]
+
+
+def split_rows(rows: List[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
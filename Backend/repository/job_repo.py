@@ -0,0 +1,101 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from Models.ingestion_job import IngestionJob
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionJobRepository:
+    """
+    Data access layer for background ingestion jobs.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    # -------------------------------------------------------
+    # CREATE
+    # -------------------------------------------------------
+
+    def create_job(self, user_id: str, kind: str, params: Optional[Dict[str, Any]] = None) -> IngestionJob:
+        job = IngestionJob(
+            user_id=user_id,
+            kind=kind,
+            status="queued",
+            params=params,
+            rows_processed=0,
+            created_at=datetime.utcnow(),
+        )
+        self.db.session.add(job)
+        self.db.session.commit()
+        return job
+
+    # -------------------------------------------------------
+    # READ
+    # -------------------------------------------------------
+
+    def get_job(self, job_id) -> Optional[IngestionJob]:
+        return (
+            self.db.session.query(IngestionJob)
+            .filter(IngestionJob.id == job_id)
+            .first()
+        )
+
+    def get_user_jobs(self, user_id: str, limit: int = 50) -> List[IngestionJob]:
+        return (
+            self.db.session.query(IngestionJob)
+            .filter(IngestionJob.user_id == user_id)
+            .order_by(IngestionJob.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+    # -------------------------------------------------------
+    # STATE TRANSITIONS
+    # -------------------------------------------------------
+
+    def mark_running(self, job_id) -> None:
+        self._update(job_id, status="running", started_at=datetime.utcnow())
+        self.db.session.commit()
+
+    def mark_finished(self, job_id, status: str, result: Optional[Dict[str, Any]] = None,
+                      error: Optional[str] = None, rows_processed: Optional[int] = None) -> None:
+        values = {
+            "status": status,
+            "result": result,
+            "error": error,
+            "finished_at": datetime.utcnow(),
+        }
+        if rows_processed is not None:
+            values["rows_processed"] = rows_processed
+
+        self._update(job_id, **values)
+        self.db.session.commit()
+
+    def update_progress(self, job_id, rows_processed: int) -> None:
+        """
+        Record progress on a separate connection, so it is visible while the
+        job's own load transaction is still open.
+        """
+        engine = self.db.engine
+
+        # SQLite allows one writer at a time; progress stays in-process there
+        if engine.dialect.name == "sqlite":
+            return
+
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    IngestionJob.__table__.update()
+                    .where(IngestionJob.__table__.c.id == job_id)
+                    .values(rows_processed=rows_processed)
+                )
+        except Exception:
+            logger.exception("Could not record progress for ingestion job %s", job_id)
+
+    def _update(self, job_id, **values) -> None:
+        self.db.session.query(IngestionJob).filter(
+            IngestionJob.id == job_id
+        ).update(values, synchronize_session=False)
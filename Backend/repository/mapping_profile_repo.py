@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from Models.mapping_profile import MappingProfile
+
+
+class MappingProfileRepository:
+    """
+    Data access layer for per-source schema mapping profiles.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, source_id: int, user_id: Optional[str] = None) -> Optional[MappingProfile]:
+        """
+        The profile of exactly this scope (source-wide when user_id is None).
+        """
+        return (
+            self.db.session.query(MappingProfile)
+            .filter(
+                MappingProfile.source_id == source_id,
+                MappingProfile.user_id == user_id,
+            )
+            .first()
+        )
+
+    def list_for_source(self, source_id: int, user_id: Optional[str] = None) -> List[MappingProfile]:
+        """
+        Source-wide profile plus user_id's own, if any.
+        """
+        return (
+            self.db.session.query(MappingProfile)
+            .filter(
+                MappingProfile.source_id == source_id,
+                (MappingProfile.user_id.is_(None)) | (MappingProfile.user_id == user_id),
+            )
+            .order_by(MappingProfile.user_id.isnot(None))
+            .all()
+        )
+
+    def resolve(self, source_id: int, user_id: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Effective field map for a user's datasets of a source: the user's
+        profile over the source-wide one. None when neither exists.
+        """
+        profiles = self.list_for_source(source_id, user_id)
+
+        if not profiles:
+            return None
+
+        field_map: Dict[str, str] = {}
+        for profile in profiles:
+            field_map.update(profile.field_map or {})
+
+        return field_map
+
+    def save(self, source_id: int, field_map: Dict[str, str], user_id: Optional[str] = None) -> MappingProfile:
+        """
+        Insert or replace the profile of (source, user).
+        """
+        profile = self.get(source_id, user_id)
+
+        if profile is None:
+            profile = MappingProfile(
+                source_id=source_id,
+                user_id=user_id,
+                revision=0,
+                created_at=datetime.utcnow(),
+            )
+            self.db.session.add(profile)
+
+        profile.field_map = field_map
+        profile.revision = (profile.revision or 0) + 1
+        profile.updated_at = datetime.utcnow()
+
+        self.db.session.commit()
+        return profile
+
+    def delete(self, source_id: int, user_id: Optional[str] = None) -> bool:
+        profile = self.get(source_id, user_id)
+
+        if profile is None:
+            return False
+
+        self.db.session.delete(profile)
+        self.db.session.commit()
+        return True
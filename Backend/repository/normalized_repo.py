@@ -1,9 +1,15 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import defer
 
 from app.extionsions import db
 from Models.normalized_dataset import NormalizedDataset
+from Models.normalized_dataset_chunk import NormalizedDatasetChunk
 from Models.metadata import Metadata
+from repository.bulk_loader import BulkLoader
+from repository.chunking import DEFAULT_CHUNK_SIZE, chunks_digest
 
 
 class NormalizedDatasetRepository:
@@ -23,20 +29,41 @@ class NormalizedDatasetRepository:
         raw_dataset_id: int,
         data: List[Dict[str, Any]],
         normalization_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
-        Insert normalized dataset into database.
+        Insert normalized dataset (rows + optional metadata) into database
+        in one transaction.
         """
-        dataset = NormalizedDataset(
+        stats = BulkLoader(self.db).load_normalized_dataset(
             raw_dataset_id=raw_dataset_id,
-            standardized_payload=data,
+            rows=data,
             normalization_version=normalization_version,
-            normalized_at=datetime.utcnow(),
+            metadata=metadata,
         )
 
-        self.db.session.add(dataset)
-        self.db.session.commit()
-        return str(dataset.id)
+        return stats["normalized_dataset_id"]
+
+    def save_normalized_chunks(
+        self,
+        raw_dataset_id: int,
+        chunks: Iterable[Tuple[int, List[Dict[str, Any]], List[str], str]],
+        normalization_version: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        mapping_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Insert a normalized dataset chunked along its raw dataset: chunk N
+        holds the normalized rows of raw chunk N, their raw-row fingerprints
+        and the raw chunk's checksum. Returns load statistics.
+        """
+        return BulkLoader(self.db).load_normalized_dataset_sources(
+            raw_dataset_id=raw_dataset_id,
+            chunks=chunks,
+            normalization_version=normalization_version,
+            metadata=metadata,
+            mapping_hash=mapping_hash,
+        )
 
     # -------------------------------------------------------
     # READ (Single Dataset)
@@ -49,18 +76,233 @@ class NormalizedDatasetRepository:
             .first()
         )
 
+    # -------------------------------------------------------
+    # READ (Rows)
+    # -------------------------------------------------------
+
+    def iter_rows(
+        self,
+        dataset: NormalizedDataset,
+        batch_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the dataset's rows in lists of at most batch_size rows.
+        """
+        if dataset.storage_layout != "chunked":
+            payload = dataset.standardized_payload or []
+            for start in range(0, len(payload), batch_size):
+                yield payload[start:start + batch_size]
+            return
+
+        chunk_nos = [
+            chunk_no for (chunk_no,) in
+            self.db.session.query(NormalizedDatasetChunk.chunk_no)
+            .filter(NormalizedDatasetChunk.normalized_dataset_id == dataset.id)
+            .order_by(NormalizedDatasetChunk.chunk_no)
+            .all()
+        ]
+
+        pending: List[Dict[str, Any]] = []
+
+        for chunk_no in chunk_nos:
+            pending.extend(
+                self.db.session.query(NormalizedDatasetChunk.rows)
+                .filter(
+                    NormalizedDatasetChunk.normalized_dataset_id == dataset.id,
+                    NormalizedDatasetChunk.chunk_no == chunk_no,
+                )
+                .scalar()
+            )
+
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+
+        if pending:
+            yield pending
+
+    def load_rows(self, dataset: NormalizedDataset) -> List[Dict[str, Any]]:
+        """
+        Return all normalized rows regardless of storage layout.
+        """
+        rows: List[Dict[str, Any]] = []
+
+        for batch in self.iter_rows(dataset):
+            rows.extend(batch)
+
+        return rows
+
+    def get_source_checksums(self, dataset: NormalizedDataset) -> Optional[Dict[int, str]]:
+        """
+        {chunk_no: raw chunk checksum}, or None when the dataset is not
+        chunked along its raw dataset (older datasets).
+        """
+        if dataset.storage_layout != "chunked":
+            return None
+
+        sources = dict(
+            self.db.session.query(NormalizedDatasetChunk.chunk_no, NormalizedDatasetChunk.source_checksum)
+            .filter(NormalizedDatasetChunk.normalized_dataset_id == dataset.id)
+            .all()
+        )
+
+        if not sources or None in sources.values():
+            return None
+
+        return sources
+
+    def get_source_chunks(self, dataset: NormalizedDataset, chunk_nos: Iterable[int]) -> Iterator[Tuple[List[Dict[str, Any]], List[str]]]:
+        """
+        Yield (rows, fingerprints) of the given chunks, one chunk at a time.
+        """
+        for chunk_no in chunk_nos:
+            chunk = (
+                self.db.session.query(NormalizedDatasetChunk.rows, NormalizedDatasetChunk.fingerprints)
+                .filter(
+                    NormalizedDatasetChunk.normalized_dataset_id == dataset.id,
+                    NormalizedDatasetChunk.chunk_no == chunk_no,
+                )
+                .first()
+            )
+
+            if chunk is not None:
+                yield chunk.rows or [], chunk.fingerprints or []
+
     # -------------------------------------------------------
     # READ (Datasets by Raw Dataset)
     # -------------------------------------------------------
 
+    def find_by_input_hash(
+        self,
+        raw_dataset_id: int,
+        input_hash: str,
+        normalization_version: str,
+        mapping_hash: Optional[str] = None,
+    ) -> Optional[NormalizedDataset]:
+        """
+        Latest normalization of the raw dataset built from exactly this
+        content by this pipeline version and mapping profile.
+        """
+        return (
+            self.db.session.query(NormalizedDataset)
+            .options(defer(NormalizedDataset.standardized_payload))
+            .filter(
+                NormalizedDataset.input_hash == input_hash,
+                NormalizedDataset.raw_dataset_id == raw_dataset_id,
+                NormalizedDataset.normalization_version == normalization_version,
+                NormalizedDataset.mapping_hash == mapping_hash,
+            )
+            .order_by(NormalizedDataset.normalized_at.desc())
+            .first()
+        )
+
     def get_by_raw_dataset(self, raw_dataset_id: int) -> List[NormalizedDataset]:
         return (
             self.db.session.query(NormalizedDataset)
+            .options(defer(NormalizedDataset.standardized_payload))
             .filter(NormalizedDataset.raw_dataset_id == raw_dataset_id)
             .order_by(NormalizedDataset.normalized_at.desc())
             .all()
         )
 
+    def get_metadata(self, dataset_id) -> List[Metadata]:
+        """
+        Metadata recorded for a normalized dataset, latest first.
+        """
+        return (
+            self.db.session.query(Metadata)
+            .filter(Metadata.normalized_dataset_id == dataset_id)
+            .order_by(Metadata.created_at.desc())
+            .all()
+        )
+
+    # -------------------------------------------------------
+    # APPEND
+    # -------------------------------------------------------
+
+    def append_rows(self, dataset: NormalizedDataset, rows: List[Dict[str, Any]]) -> int:
+        """
+        Append rows after the dataset's last chunk and mark it as normalized
+        now. Returns the number of rows appended.
+        """
+        try:
+            if dataset.storage_layout != "chunked":
+                payload = dataset.standardized_payload or []
+                BulkLoader(self.db).load_chunks(
+                    NormalizedDatasetChunk.__table__, "normalized_dataset_id", dataset.id, payload
+                )
+                dataset.standardized_payload = []
+                dataset.storage_layout = "chunked"
+                dataset.row_count = len(payload)
+
+            next_chunk_no = (
+                self.db.session.query(func.coalesce(func.max(NormalizedDatasetChunk.chunk_no), -1))
+                .filter(NormalizedDatasetChunk.normalized_dataset_id == dataset.id)
+                .scalar()
+            ) + 1
+
+            row_count, _ = BulkLoader(self.db).load_chunks(
+                NormalizedDatasetChunk.__table__, "normalized_dataset_id", dataset.id, rows,
+                first_chunk_no=next_chunk_no,
+            )
+
+            dataset.row_count = (dataset.row_count or 0) + row_count
+            dataset.normalized_at = datetime.utcnow()
+            self.db.session.commit()
+
+        except Exception:
+            self.db.session.rollback()
+            raise
+
+        return row_count
+
+    def replace_source_chunks(
+        self,
+        dataset: NormalizedDataset,
+        chunks: Iterable[Tuple[int, List[Dict[str, Any]], List[str], str]],
+        stale_chunk_nos: Iterable[int] = (),
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Delete stale_chunk_nos, then write (chunk_no, rows, fingerprints,
+        source_checksum) chunks of a dataset chunked along its raw dataset,
+        and mark it as normalized now. Other chunks are left untouched.
+        One transaction, which also records metadata when given.
+        """
+        stale = list(stale_chunk_nos)
+
+        try:
+            if stale:
+                self.db.session.query(NormalizedDatasetChunk).filter(
+                    NormalizedDatasetChunk.normalized_dataset_id == dataset.id,
+                    NormalizedDatasetChunk.chunk_no.in_(stale),
+                ).delete(synchronize_session=False)
+
+            BulkLoader(self.db).load_source_chunks(dataset.id, chunks)
+
+            dataset.row_count = (
+                self.db.session.query(func.coalesce(func.sum(NormalizedDatasetChunk.row_count), 0))
+                .filter(NormalizedDatasetChunk.normalized_dataset_id == dataset.id)
+                .scalar()
+            )
+            dataset.input_hash = chunks_digest(
+                checksum for (checksum,) in
+                self.db.session.query(NormalizedDatasetChunk.source_checksum)
+                .filter(NormalizedDatasetChunk.normalized_dataset_id == dataset.id)
+                .order_by(NormalizedDatasetChunk.chunk_no)
+            )
+            dataset.normalized_at = datetime.utcnow()
+
+            if metadata is not None:
+                # Read after the chunks are written, so it can carry their timing
+                self.db.session.add(Metadata(normalized_dataset_id=dataset.id, meta_data=metadata))
+
+            self.db.session.commit()
+
+        except Exception:
+            self.db.session.rollback()
+            raise
+
     # -------------------------------------------------------
     # UPDATE
     # -------------------------------------------------------
@@ -79,8 +321,22 @@ class NormalizedDatasetRepository:
         if not dataset:
             return False
 
-        dataset.standardized_payload = updated_data
-        self.db.session.commit()
+        try:
+            self._delete_chunks(dataset.id)
+
+            row_count, _ = BulkLoader(self.db).load_chunks(
+                NormalizedDatasetChunk.__table__, "normalized_dataset_id", dataset.id, updated_data
+            )
+
+            dataset.standardized_payload = []
+            dataset.storage_layout = "chunked"
+            dataset.row_count = row_count
+            self.db.session.commit()
+
+        except Exception:
+            self.db.session.rollback()
+            raise
+
         return True
 
     # -------------------------------------------------------
@@ -97,6 +353,12 @@ class NormalizedDatasetRepository:
         if not dataset:
             return False
 
+        self._delete_chunks(dataset.id)
+
+        self.db.session.query(Metadata).filter(
+            Metadata.normalized_dataset_id == dataset.id
+        ).delete(synchronize_session=False)
+
         self.db.session.delete(dataset)
         self.db.session.commit()
         return True
@@ -122,4 +384,13 @@ class NormalizedDatasetRepository:
             created_at=datetime.utcnow(),
         )
         self.db.session.add(meta)
-        self.db.session.commit()
\ No newline at end of file
+        self.db.session.commit()
+
+    # -------------------------------------------------------
+    # CHUNK HELPERS
+    # -------------------------------------------------------
+
+    def _delete_chunks(self, dataset_id) -> None:
+        self.db.session.query(NormalizedDatasetChunk).filter(
+            NormalizedDatasetChunk.normalized_dataset_id == dataset_id
+        ).delete(synchronize_session=False)
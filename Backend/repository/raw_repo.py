@@ -1,13 +1,24 @@
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import defer
 
 from Models.raw_dataset import RawDataset
+from Models.raw_dataset_chunk import RawDatasetChunk
 from Models.metadata import Metadata
+from Models.ingestion_watermark import IngestionWatermark
+from repository.chunking import DEFAULT_CHUNK_SIZE, chunks_digest, rows_checksum, split_rows
+from repository.bulk_loader import BulkLoader
 
 
 class RawDatasetRepository:
     """
     Data access layer for Raw Datasets.
+
+    Rows are stored in raw_dataset_chunks, keyed by (raw_dataset_id, chunk_no).
+    Datasets created before chunking keep their rows in RawDataset.data
+    ("inline" layout) and are still readable through the same APIs.
     """
 
     def __init__(self, db):
@@ -23,33 +34,21 @@ class RawDatasetRepository:
         source_id: int,
         data: List[Dict[str, Any]],
         metadata: Optional[Dict[str, Any]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        content_hash: Optional[str] = None,
     ) -> int:
         """
-        Insert raw dataset into database.
+        Insert raw dataset (rows + metadata) into database in one transaction.
         """
-        raw_dataset = RawDataset(
+        stats = BulkLoader(self.db, chunk_size).load_raw_dataset(
             user_id=user_id,
             source_id=source_id,
-            data=data,
-            created_at=datetime.utcnow(),
+            rows=data,
+            metadata=metadata,
+            content_hash=content_hash,
         )
 
-        self.db.session.add(raw_dataset)
-        self.db.session.commit()
-
-        dataset_id = raw_dataset.id
-
-        # Save metadata if provided
-        if metadata:
-            meta = Metadata(
-                raw_dataset_id=dataset_id,          # ✅ changed from dataset_id
-                meta_data=metadata,
-                created_at=datetime.utcnow(),
-            )
-            self.db.session.add(meta)
-            self.db.session.commit()
-
-        return dataset_id
+        return stats["dataset_id"]
 
     def insert_raw_dataset(
         self,
@@ -58,18 +57,68 @@ class RawDatasetRepository:
         file_type: str,
         user_id: str,
         source_id: int,
+        schema: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None,
     ) -> int:
         """
-        Insert a raw dataset, storing filename and file type as metadata.
+        Insert a raw dataset, storing filename, file type and the inferred
+        schema (when given) as metadata.
         """
         metadata = {"filename": filename, "file_type": file_type}
+        if schema is not None:
+            metadata["schema"] = schema
         return self.save_raw_dataset(
             user_id=user_id,
             source_id=source_id,
             data=data,
             metadata=metadata,
+            content_hash=content_hash,
         )
 
+    # -------------------------------------------------------
+    # APPEND
+    # -------------------------------------------------------
+
+    def append_rows(
+        self,
+        dataset_id: int,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Append rows after the last chunk of a dataset.
+        Returns the (first, last) chunk numbers written; progress, if given,
+        is called with the rows appended so far after each chunk.
+        """
+        dataset = self.get_raw_dataset(dataset_id)
+
+        if not dataset:
+            raise ValueError("Raw dataset not found")
+
+        if dataset.storage_layout != "chunked":
+            self._convert_to_chunked(dataset, chunk_size)
+
+        next_chunk_no = self._next_chunk_no(dataset_id)
+
+        try:
+            row_count, chunk_count = BulkLoader(self.db, chunk_size, progress).load_chunks(
+                RawDatasetChunk.__table__, "raw_dataset_id", dataset_id, rows,
+                first_chunk_no=next_chunk_no,
+            )
+
+            if row_count:
+                dataset.row_count = (dataset.row_count or 0) + row_count
+                dataset.content_hash = None
+                dataset.updated_at = datetime.utcnow()
+            self.db.session.commit()
+
+        except Exception:
+            self.db.session.rollback()
+            raise
+
+        return next_chunk_no, next_chunk_no + chunk_count - 1
+
     # -------------------------------------------------------
     # READ (Single Dataset)
     # -------------------------------------------------------
@@ -77,10 +126,166 @@ class RawDatasetRepository:
     def get_raw_dataset(self, dataset_id: int) -> Optional[RawDataset]:
         return (
             self.db.session.query(RawDataset)
+            .options(defer(RawDataset.data))
             .filter(RawDataset.id == dataset_id)
             .first()
         )
 
+    # -------------------------------------------------------
+    # READ (Rows)
+    # -------------------------------------------------------
+
+    def iter_chunks(self, dataset_id: int, first_chunk_no: int = 0) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Yield (chunk_no, rows) in chunk order, fetching one chunk at a time.
+        """
+        dataset = self.get_raw_dataset(dataset_id)
+
+        if not dataset:
+            raise ValueError("Raw dataset not found")
+
+        if dataset.storage_layout != "chunked":
+            for chunk_no, rows in enumerate(split_rows(dataset.data or [])):
+                if chunk_no >= first_chunk_no:
+                    yield chunk_no, rows
+            return
+
+        # Chunks are fetched one by one (not through a server-side cursor)
+        # so callers may commit between chunks.
+        chunk_nos = [
+            chunk_no for (chunk_no,) in
+            self.db.session.query(RawDatasetChunk.chunk_no)
+            .filter(
+                RawDatasetChunk.raw_dataset_id == dataset_id,
+                RawDatasetChunk.chunk_no >= first_chunk_no,
+            )
+            .order_by(RawDatasetChunk.chunk_no)
+            .all()
+        ]
+
+        for chunk_no in chunk_nos:
+            yield chunk_no, self.get_chunk_rows(dataset_id, chunk_no)
+
+    def get_chunk_rows(self, dataset_id: int, chunk_no: int) -> List[Dict[str, Any]]:
+        return (
+            self.db.session.query(RawDatasetChunk.rows)
+            .filter(
+                RawDatasetChunk.raw_dataset_id == dataset_id,
+                RawDatasetChunk.chunk_no == chunk_no,
+            )
+            .scalar()
+        ) or []
+
+    def iter_rows(
+        self,
+        dataset_id: int,
+        batch_size: int = DEFAULT_CHUNK_SIZE,
+        first_chunk_no: int = 0,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the dataset's rows in lists of at most batch_size rows,
+        holding no more than one stored chunk plus one batch in memory.
+        first_chunk_no skips earlier chunks (e.g. to read only appended rows).
+        """
+        pending: List[Dict[str, Any]] = []
+
+        for _, rows in self.iter_chunks(dataset_id, first_chunk_no):
+            pending.extend(rows)
+
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+
+        if pending:
+            yield pending
+
+    def load_rows(self, dataset: RawDataset) -> List[Dict[str, Any]]:
+        """
+        Return all rows of a dataset regardless of its storage layout.
+        """
+        rows: List[Dict[str, Any]] = []
+
+        for batch in self.iter_rows(dataset.id):
+            rows.extend(batch)
+
+        return rows
+
+    def get_chunk_checksums(self, dataset_id: int) -> Dict[int, str]:
+        return dict(
+            self.db.session.query(RawDatasetChunk.chunk_no, RawDatasetChunk.checksum)
+            .filter(RawDatasetChunk.raw_dataset_id == dataset_id)
+            .all()
+        )
+
+    def get_content_digest(self, dataset_id: int) -> Optional[str]:
+        """
+        chunks_digest of the dataset's chunk checksums (cheap: no rows are
+        read), or None for datasets not stored in chunks.
+        """
+        checksums = [
+            checksum for (checksum,) in
+            self.db.session.query(RawDatasetChunk.checksum)
+            .filter(RawDatasetChunk.raw_dataset_id == dataset_id)
+            .order_by(RawDatasetChunk.chunk_no)
+            .all()
+        ]
+
+        if not checksums or None in checksums:
+            return None
+
+        return chunks_digest(checksums)
+
+    # -------------------------------------------------------
+    # CONTENT-HASH DEDUPLICATION
+    # -------------------------------------------------------
+
+    def find_by_content_hash(self, content_hash: str, user_id: str, source_id: int) -> Optional[RawDataset]:
+        """
+        Oldest dataset of the user and source whose stored rows came from
+        exactly these bytes.
+        """
+        return (
+            self.db.session.query(RawDataset)
+            .options(defer(RawDataset.data))
+            .filter(
+                RawDataset.content_hash == content_hash,
+                RawDataset.user_id == user_id,
+                RawDataset.source_id == source_id,
+            )
+            .order_by(RawDataset.id)
+            .first()
+        )
+
+    def set_content_hash(self, dataset_id: int, content_hash: str) -> None:
+        self.db.session.query(RawDataset).filter(
+            RawDataset.id == dataset_id
+        ).update({RawDataset.content_hash: content_hash}, synchronize_session=False)
+        self.db.session.commit()
+
+    def record_dedup_hit(self, dataset_id: int) -> None:
+        # Increment in SQL so concurrent repeat uploads are all counted
+        self.db.session.query(RawDataset).filter(
+            RawDataset.id == dataset_id
+        ).update({RawDataset.dedup_hits: RawDataset.dedup_hits + 1}, synchronize_session=False)
+        self.db.session.commit()
+
+    def get_dedup_stats(self) -> Dict[str, int]:
+        datasets, hits, rows = (
+            self.db.session.query(
+                func.count(RawDataset.id),
+                func.coalesce(func.sum(RawDataset.dedup_hits), 0),
+                func.coalesce(func.sum(RawDataset.dedup_hits * RawDataset.row_count), 0),
+            )
+            .filter(RawDataset.dedup_hits > 0)
+            .one()
+        )
+
+        return {
+            "deduplicated_datasets": datasets,
+            "dedup_hits": int(hits),
+            "rows_not_stored": int(rows),
+        }
+
     # -------------------------------------------------------
     # READ (Datasets by User)
     # -------------------------------------------------------
@@ -88,6 +293,7 @@ class RawDatasetRepository:
     def get_user_datasets(self, user_id: str) -> List[RawDataset]:
         return (
             self.db.session.query(RawDataset)
+            .options(defer(RawDataset.data))
             .filter(RawDataset.user_id == user_id)
             .order_by(RawDataset.created_at.desc())
             .all()
@@ -102,16 +308,59 @@ class RawDatasetRepository:
         dataset_id: int,
         updated_data: List[Dict[str, Any]],
     ) -> bool:
-        dataset = (
-            self.db.session.query(RawDataset)
-            .filter(RawDataset.id == dataset_id)
-            .first()
-        )
+        """
+        Replace a dataset's rows, rewriting only the chunks whose content changed.
+
+        The new rows are cut at the existing chunk boundaries so that edits
+        that do not shift rows leave every other chunk untouched.
+        """
+        dataset = self.get_raw_dataset(dataset_id)
 
         if not dataset:
             return False
 
-        dataset.data = updated_data
+        if dataset.storage_layout != "chunked":
+            self._convert_to_chunked(dataset, DEFAULT_CHUNK_SIZE)
+
+        existing = (
+            self.db.session.query(
+                RawDatasetChunk.chunk_no,
+                RawDatasetChunk.row_count,
+                RawDatasetChunk.checksum,
+            )
+            .filter(RawDatasetChunk.raw_dataset_id == dataset_id)
+            .order_by(RawDatasetChunk.chunk_no)
+            .all()
+        )
+
+        chunk_no = 0
+        start = 0
+
+        for existing_no, existing_count, existing_checksum in existing:
+            if start >= len(updated_data):
+                break
+
+            chunk_rows = updated_data[start:start + existing_count]
+            checksum = rows_checksum(chunk_rows)
+
+            if existing_no != chunk_no or checksum != existing_checksum:
+                self._write_chunk(dataset_id, chunk_no, chunk_rows, checksum)
+
+            start += existing_count
+            chunk_no += 1
+
+        for chunk_rows in split_rows(updated_data[start:]):
+            self._write_chunk(dataset_id, chunk_no, chunk_rows)
+            chunk_no += 1
+
+        # Drop chunks past the new end of the dataset
+        self.db.session.query(RawDatasetChunk).filter(
+            RawDatasetChunk.raw_dataset_id == dataset_id,
+            RawDatasetChunk.chunk_no >= chunk_no,
+        ).delete(synchronize_session=False)
+
+        dataset.row_count = len(updated_data)
+        dataset.content_hash = None
         dataset.updated_at = datetime.utcnow()
         self.db.session.commit()
         return True
@@ -130,6 +379,83 @@ class RawDatasetRepository:
         if not dataset:
             return False
 
+        self.db.session.query(RawDatasetChunk).filter(
+            RawDatasetChunk.raw_dataset_id == dataset_id
+        ).delete(synchronize_session=False)
+
+        self.db.session.query(IngestionWatermark).filter(
+            IngestionWatermark.raw_dataset_id == dataset_id
+        ).delete(synchronize_session=False)
+
+        self.db.session.query(Metadata).filter(
+            Metadata.raw_dataset_id == dataset_id
+        ).delete(synchronize_session=False)
+
         self.db.session.delete(dataset)
         self.db.session.commit()
-        return True
\ No newline at end of file
+        return True
+
+    # -------------------------------------------------------
+    # CHUNK HELPERS
+    # -------------------------------------------------------
+
+    def _build_chunk(
+        self,
+        dataset_id: int,
+        chunk_no: int,
+        rows: List[Dict[str, Any]],
+        checksum: Optional[str] = None,
+    ) -> RawDatasetChunk:
+        return RawDatasetChunk(
+            raw_dataset_id=dataset_id,
+            chunk_no=chunk_no,
+            row_count=len(rows),
+            rows=rows,
+            checksum=checksum or rows_checksum(rows),
+        )
+
+    def _write_chunk(
+        self,
+        dataset_id: int,
+        chunk_no: int,
+        rows: List[Dict[str, Any]],
+        checksum: Optional[str] = None,
+    ) -> None:
+        checksum = checksum or rows_checksum(rows)
+
+        updated = (
+            self.db.session.query(RawDatasetChunk)
+            .filter(
+                RawDatasetChunk.raw_dataset_id == dataset_id,
+                RawDatasetChunk.chunk_no == chunk_no,
+            )
+            .update(
+                {"rows": rows, "row_count": len(rows), "checksum": checksum},
+                synchronize_session=False,
+            )
+        )
+
+        if not updated:
+            self.db.session.add(self._build_chunk(dataset_id, chunk_no, rows, checksum))
+
+    def _next_chunk_no(self, dataset_id: int) -> int:
+        last = (
+            self.db.session.query(func.max(RawDatasetChunk.chunk_no))
+            .filter(RawDatasetChunk.raw_dataset_id == dataset_id)
+            .scalar()
+        )
+        return 0 if last is None else last + 1
+
+    def _convert_to_chunked(self, dataset: RawDataset, chunk_size: int) -> None:
+        """
+        Move the rows of an inline dataset into raw_dataset_chunks.
+        """
+        rows = dataset.data or []
+
+        for chunk_no, chunk_rows in enumerate(split_rows(rows, chunk_size)):
+            self.db.session.add(self._build_chunk(dataset.id, chunk_no, chunk_rows))
+
+        dataset.data = []
+        dataset.storage_layout = "chunked"
+        dataset.row_count = len(rows)
+        self.db.session.flush()
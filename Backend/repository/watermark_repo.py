@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import List, Optional
+
+from Models.ingestion_watermark import IngestionWatermark
+
+
+class WatermarkRepository:
+    """
+    Data access layer for per-query ingestion high-water marks.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def get(self, user_id: str, source_id: int, query: str) -> Optional[IngestionWatermark]:
+        return (
+            self.db.session.query(IngestionWatermark)
+            .filter(
+                IngestionWatermark.user_id == user_id,
+                IngestionWatermark.source_id == source_id,
+                IngestionWatermark.query == query,
+            )
+            .first()
+        )
+
+    def save(
+        self,
+        user_id: str,
+        source_id: int,
+        query: str,
+        raw_dataset_id: int,
+        high_water: Optional[str],
+        boundary_ids: List[str],
+        refreshed: bool = False,
+    ) -> IngestionWatermark:
+        """
+        Insert or move the watermark of (user, source, query).
+        """
+        watermark = self.get(user_id, source_id, query)
+
+        if watermark is None:
+            watermark = IngestionWatermark(
+                user_id=user_id,
+                source_id=source_id,
+                query=query,
+                refresh_count=0,
+                created_at=datetime.utcnow(),
+            )
+            self.db.session.add(watermark)
+
+        watermark.raw_dataset_id = raw_dataset_id
+        watermark.high_water = high_water
+        watermark.boundary_ids = boundary_ids
+        watermark.updated_at = datetime.utcnow()
+
+        if refreshed:
+            watermark.refresh_count = (watermark.refresh_count or 0) + 1
+
+        self.db.session.commit()
+        return watermark